@@ -0,0 +1,47 @@
+"""Add catalog filter indexes
+
+Revision ID: 5c2e9a7d4b13
+Revises: 79828d73df07
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e9a7d4b13'
+down_revision: Union[str, Sequence[str], None] = '79828d73df07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_building_residential_complex_id_status', 'building', ['residential_complex_id', 'status'], unique=False)
+    op.create_index('ix_apartment_building_id_status_total_price', 'apartment', ['building_id', 'status', 'total_price'], unique=False)
+    # Enum columns store member names, so the free status is 'free'
+    op.create_index('ix_apartment_free_building_id_total_price', 'apartment', ['building_id', 'total_price'], unique=False, postgresql_where=sa.text("status = 'free'"))
+    op.create_index('ix_commercial_unit_building_id_status_total_price', 'commercial_unit', ['building_id', 'status', 'total_price'], unique=False)
+    op.create_index('ix_review_residential_complex_id_created_at', 'review', ['residential_complex_id', 'created_at'], unique=False)
+    op.create_index('ix_image_object_type_object_id', 'image', ['object_type', 'object_id'], unique=False)
+    op.create_index('ix_order_user_id_status', 'order', ['user_id', 'status'], unique=False)
+    op.create_index('ix_order_booking_expiration_date', 'order', ['booking_expiration_date'], unique=False)
+    op.create_index('ix_favorites_user_id_created_at', 'favorites', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_promotions_complex_id_apartment_type_is_active', 'promotions', ['residential_complex_id', 'apartment_type', 'is_active'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_promotions_complex_id_apartment_type_is_active', table_name='promotions')
+    op.drop_index('ix_favorites_user_id_created_at', table_name='favorites')
+    op.drop_index('ix_order_booking_expiration_date', table_name='order')
+    op.drop_index('ix_order_user_id_status', table_name='order')
+    op.drop_index('ix_image_object_type_object_id', table_name='image')
+    op.drop_index('ix_review_residential_complex_id_created_at', table_name='review')
+    op.drop_index('ix_commercial_unit_building_id_status_total_price', table_name='commercial_unit')
+    op.drop_index('ix_apartment_free_building_id_total_price', table_name='apartment', postgresql_where=sa.text("status = 'free'"))
+    op.drop_index('ix_apartment_building_id_status_total_price', table_name='apartment')
+    op.drop_index('ix_building_residential_complex_id_status', table_name='building')
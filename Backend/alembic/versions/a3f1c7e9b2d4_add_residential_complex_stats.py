@@ -0,0 +1,48 @@
+"""Add residential complex stats
+
+Revision ID: a3f1c7e9b2d4
+Revises: 5c2e9a7d4b13
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c7e9b2d4'
+down_revision: Union[str, Sequence[str], None] = '5c2e9a7d4b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('residential_complex_stats',
+    sa.Column('residential_complex_id', sa.Integer(), nullable=False),
+    sa.Column('min_price', sa.DECIMAL(), nullable=True),
+    sa.Column('max_price', sa.DECIMAL(), nullable=True),
+    sa.Column('min_area', sa.DECIMAL(), nullable=True),
+    sa.Column('max_area', sa.DECIMAL(), nullable=True),
+    sa.Column('free_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('booked_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('sold_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('studio_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('one_bedroom_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('two_bedroom_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('three_bedroom_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('penthouse_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('avg_rating', sa.DECIMAL(precision=3, scale=2), nullable=True),
+    sa.Column('review_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['residential_complex_id'], ['residential_complex.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('residential_complex_id')
+    )
+    # Existing complexes are filled by scripts/rebuild_complex_stats.py
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('residential_complex_stats')
@@ -0,0 +1,37 @@
+"""Add residential complex full-text search index
+
+Revision ID: b7d2e4f6a8c1
+Revises: a3f1c7e9b2d4
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e4f6a8c1'
+down_revision: Union[str, Sequence[str], None] = 'a3f1c7e9b2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must stay identical to models.residential_complex_search_document,
+# otherwise the planner does not match queries to the index
+SEARCH_DOCUMENT = (
+    "(setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A')"
+    " || setweight(to_tsvector('russian'::regconfig, coalesce(ru_description, '')), 'B')"
+    " || setweight(to_tsvector('english'::regconfig, coalesce(en_description, '')), 'B')"
+    " || setweight(to_tsvector('simple'::regconfig, coalesce(kz_description, '')), 'B'))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_residential_complex_search', 'residential_complex', [sa.text(SEARCH_DOCUMENT)], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_residential_complex_search', table_name='residential_complex')
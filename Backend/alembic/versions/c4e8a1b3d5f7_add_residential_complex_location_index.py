@@ -0,0 +1,31 @@
+"""Add residential complex location index
+
+Revision ID: c4e8a1b3d5f7
+Revises: b7d2e4f6a8c1
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1b3d5f7'
+down_revision: Union[str, Sequence[str], None] = 'b7d2e4f6a8c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must stay identical to models.residential_complex_location
+LOCATION = "point(CAST(longitude AS FLOAT), CAST(latitude AS FLOAT))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_residential_complex_location', 'residential_complex', [sa.text(LOCATION)], unique=False, postgresql_using='gist')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_residential_complex_location', table_name='residential_complex')
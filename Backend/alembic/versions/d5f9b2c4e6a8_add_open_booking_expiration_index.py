@@ -0,0 +1,28 @@
+"""Add open booking expiration index
+
+Revision ID: d5f9b2c4e6a8
+Revises: c4e8a1b3d5f7
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f9b2c4e6a8'
+down_revision: Union[str, Sequence[str], None] = 'c4e8a1b3d5f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_order_open_booking_expiration_date', 'order', ['booking_expiration_date', 'id'], unique=False, postgresql_where=sa.text("status IN ('pending', 'offering')"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_order_open_booking_expiration_date', table_name='order', postgresql_where=sa.text("status IN ('pending', 'offering')"))
@@ -0,0 +1,28 @@
+"""Add idempotency key claim token
+
+Revision ID: f7b1d4e6a8c0
+Revises: e6a0c3d5f7b9
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7b1d4e6a8c0'
+down_revision: Union[str, Sequence[str], None] = 'e6a0c3d5f7b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('idempotency_key', sa.Column('token', sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('idempotency_key', 'token')
@@ -0,0 +1,295 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple, Union
+
+from .config import (
+    CACHE_BACKEND,
+    CACHE_MAX_ENTRIES,
+    CACHE_REDIS_URL,
+    CACHE_TTL_SECONDS,
+    TILE_CACHE_MAX_ENTRIES,
+    TILE_CACHE_TTL_SECONDS,
+)
+
+# Fixed tags, or a callable deriving them from the loaded value
+Tags = Union[Iterable[str], Callable[[object], Iterable[str]]]
+
+MISS = object()
+
+
+class MemoryBackend:
+    """In-process backend: one LRU per namespace, entries expire after their TTL."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, OrderedDict] = defaultdict(OrderedDict)
+        self._max_entries: Dict[str, int] = {}
+        self._tags: Dict[str, set] = defaultdict(set)
+
+    def configure(self, namespace: str, max_entries: int, ttl_seconds: int):
+        with self._lock:
+            self._max_entries[namespace] = max_entries
+
+    def _drop(self, namespace: str, key: str):
+        _, _, tags = self._entries[namespace].pop(key)
+        for tag in tags:
+            self._tags[tag].discard((namespace, key))
+            if not self._tags[tag]:
+                del self._tags[tag]
+
+    def get(self, namespace: str, key: str):
+        with self._lock:
+            entries = self._entries[namespace]
+            entry = entries.get(key)
+            if entry is None:
+                return MISS
+            if entry[0] <= time.monotonic():
+                self._drop(namespace, key)
+                return MISS
+            entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, namespace: str, key: str, value, ttl: int, tags: Iterable[str]):
+        tags = tuple(tags)
+        with self._lock:
+            entries = self._entries[namespace]
+            if key in entries:
+                self._drop(namespace, key)
+
+            entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags[tag].add((namespace, key))
+
+            max_entries = self._max_entries.get(namespace, CACHE_MAX_ENTRIES)
+            while len(entries) > max_entries:
+                self._drop(namespace, next(iter(entries)))
+
+    def invalidate_tags(self, tags: Iterable[str]):
+        with self._lock:
+            for tag in tags:
+                for namespace, key in list(self._tags.get(tag, ())):
+                    self._drop(namespace, key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+
+class RedisBackend:
+    """Backend for a client speaking the Redis protocol (redis.Redis or a stand-in).
+
+    Values are stored as JSON, so cached values must be JSON-compatible.
+    Eviction is left to the server's maxmemory policy; TTLs are set per key.
+    A tag set is shared by namespaces with different TTLs, so it expires
+    after the longest of them, never before one of its keys.
+    """
+
+    def __init__(self, client, prefix: str = "baspana:cache"):
+        self._client = client
+        self._prefix = prefix
+        self._tag_ttl = 0
+
+    def configure(self, namespace: str, max_entries: int, ttl_seconds: int):
+        self._tag_ttl = max(self._tag_ttl, ttl_seconds)
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self._prefix}:{namespace}:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self._prefix}:tag:{tag}"
+
+    def get(self, namespace: str, key: str):
+        raw = self._client.get(self._key(namespace, key))
+        return MISS if raw is None else json.loads(raw)
+
+    def set(self, namespace: str, key: str, value, ttl: int, tags: Iterable[str]):
+        redis_key = self._key(namespace, key)
+        pipe = self._client.pipeline()
+        pipe.set(redis_key, json.dumps(value), ex=ttl)
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), redis_key)
+            pipe.expire(self._tag_key(tag), max(ttl, self._tag_ttl))
+        pipe.execute()
+
+    def invalidate_tags(self, tags: Iterable[str]):
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            keys = self._client.smembers(tag_key)
+            if keys:
+                self._client.delete(*keys)
+            self._client.delete(tag_key)
+
+    def clear(self):
+        keys = list(self._client.scan_iter(f"{self._prefix}:*"))
+        if keys:
+            self._client.delete(*keys)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class _LeaderCancelled(Exception):
+    """Set on an async flight whose leader was cancelled; followers load themselves."""
+
+
+class CacheNamespace:
+    """One kind of cached value, e.g. complex details keyed by id.
+
+    get_or_load* run the loader at most once per key at a time (single
+    flight): concurrent misses wait for the first loader instead of all
+    querying the database. None results are not cached.
+    """
+
+    def __init__(self, cache: "Cache", name: str, ttl_seconds: int):
+        self._cache = cache
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._async_flights: Dict[Tuple[int, str], asyncio.Future] = {}
+
+    def get(self, key):
+        return self._cache.backend.get(self.name, str(key))
+
+    def set(self, key, value, tags: Iterable[str] = ()):
+        self._cache.backend.set(self.name, str(key), value, self.ttl_seconds, tags)
+
+    def _store(self, key: str, value, tags: Tags, generation: int):
+        # Skip the store if an invalidation ran while loading: the value
+        # may have been read before the change it was meant to drop.
+        if value is not None and self._cache.generation == generation:
+            self.set(key, value, tags(value) if callable(tags) else tags)
+
+    def get_or_load(self, key, loader: Callable[[], object], tags: Tags = ()):
+        key = str(key)
+        value = self.get(key)
+        if value is not MISS:
+            return value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        generation = self._cache.generation
+        try:
+            flight.value = loader()
+            self._store(key, flight.value, tags, generation)
+            return flight.value
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def get_or_load_async(
+        self, key, loader: Callable[[], Awaitable[object]], tags: Tags = ()
+    ):
+        key = str(key)
+        value = self.get(key)
+        if value is not MISS:
+            return value
+
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        while True:
+            with self._lock:
+                future = self._async_flights.get(flight_key)
+                leader = future is None
+                if leader:
+                    future = self._async_flights[flight_key] = loop.create_future()
+
+            if leader:
+                break
+            try:
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                # Not our cancellation; take over the load (or join a new one)
+                value = self.get(key)
+                if value is not MISS:
+                    return value
+
+        generation = self._cache.generation
+        try:
+            value = await loader()
+            self._store(key, value, tags, generation)
+            future.set_result(value)
+            return value
+        except BaseException as error:
+            if isinstance(error, asyncio.CancelledError):
+                # Cancelling the shared future would cancel every follower
+                error = _LeaderCancelled()
+            future.set_exception(error)
+            # Mark it retrieved so an unawaited failure is not logged
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                del self._async_flights[flight_key]
+
+
+class Cache:
+    def __init__(self, backend):
+        self.backend = backend
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._namespaces: Dict[str, CacheNamespace] = {}
+
+    def namespace(
+        self,
+        name: str,
+        ttl_seconds: int = CACHE_TTL_SECONDS,
+        max_entries: int = CACHE_MAX_ENTRIES,
+    ) -> CacheNamespace:
+        if name not in self._namespaces:
+            self.backend.configure(name, max_entries, ttl_seconds)
+            self._namespaces[name] = CacheNamespace(self, name, ttl_seconds)
+        return self._namespaces[name]
+
+    def invalidate_tags(self, *tags: str):
+        with self._lock:
+            self.generation += 1
+        self.backend.invalidate_tags(tags)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+        self.backend.clear()
+
+
+def _build_backend():
+    if CACHE_BACKEND == "redis":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the redis package")
+        return RedisBackend(redis.Redis.from_url(CACHE_REDIS_URL))
+    return MemoryBackend()
+
+
+app_cache = Cache(_build_backend())
+
+complex_cache = app_cache.namespace("complex")
+building_cache = app_cache.namespace("building")
+infrastructure_cache = app_cache.namespace("infrastructure")
+image_cache = app_cache.namespace("image")
+tile_cache = app_cache.namespace(
+    "tile", ttl_seconds=TILE_CACHE_TTL_SECONDS, max_entries=TILE_CACHE_MAX_ENTRIES
+)
@@ -16,6 +16,42 @@ DATABASE_URL = (
     f"{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 )
 
+ASYNC_DATABASE_URL = (
+    f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@"
+    f"{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+)
+
+# Read replica for catalog GET endpoints; without POSTGRES_REPLICA_HOST the
+# reads go to the primary
+POSTGRES_REPLICA_HOST = os.getenv("POSTGRES_REPLICA_HOST", POSTGRES_HOST)
+POSTGRES_REPLICA_PORT = os.getenv("POSTGRES_REPLICA_PORT", POSTGRES_PORT)
+
+REPLICA_DATABASE_URL = (
+    f"postgresql+psycopg2://{POSTGRES_USER}:{POSTGRES_PASSWORD}@"
+    f"{POSTGRES_REPLICA_HOST}:{POSTGRES_REPLICA_PORT}/{POSTGRES_DB}"
+)
+
+ASYNC_REPLICA_DATABASE_URL = (
+    f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@"
+    f"{POSTGRES_REPLICA_HOST}:{POSTGRES_REPLICA_PORT}/{POSTGRES_DB}"
+)
+
+# After a write the client reads from the primary for this long, which must
+# cover the replica lag
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+# Recent writers remembered per worker with the memory cache backend
+READ_YOUR_WRITES_MAX_USERS = int(os.getenv("READ_YOUR_WRITES_MAX_USERS", "10000"))
+
+# Connection pool, per engine and per uvicorn worker: a worker may hold up to
+# DB_POOL_SIZE + DB_MAX_OVERFLOW connections on each of its engines
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# 0 leaves the server default (no timeout)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
 cloudinary.config(
     cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
     api_key=os.getenv("CLOUDINARY_API_KEY"),
@@ -23,3 +59,43 @@ cloudinary.config(
     secure=True,
 )
 print(f"Cloudinary configured: {os.getenv('CLOUDINARY_CLOUD_NAME')}")
+
+# How long a worker trusts its in-process promotion index before re-reading
+# the promotions table (covers changes made through other workers)
+PROMOTION_INDEX_TTL_SECONDS = int(os.getenv("PROMOTION_INDEX_TTL_SECONDS", "60"))
+
+# Same for the complex autocomplete index; its own worker refreshes it from
+# change events right away
+AUTOCOMPLETE_INDEX_TTL_SECONDS = int(os.getenv("AUTOCOMPLETE_INDEX_TTL_SECONDS", "60"))
+
+# Exact totals of *_filtered list queries are reused for this long
+COUNT_CACHE_TTL_SECONDS = int(os.getenv("COUNT_CACHE_TTL_SECONDS", "10"))
+COUNT_CACHE_MAX_ENTRIES = int(os.getenv("COUNT_CACHE_MAX_ENTRIES", "1000"))
+
+# Application cache (app/cache.py): "memory" is per worker process, so other
+# workers may serve a changed entry until its TTL ends; "redis" is shared
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1000"))
+
+# Clustered map tiles (/api/complexes/tiles/{z}/{x}/{y}); dropped early when
+# a complex in the tile changes
+TILE_CACHE_TTL_SECONDS = int(os.getenv("TILE_CACHE_TTL_SECONDS", "600"))
+TILE_CACHE_MAX_ENTRIES = int(os.getenv("TILE_CACHE_MAX_ENTRIES", "5000"))
+
+# Bookings are expired on time by the in-process scheduler
+# (app/services/booking_scheduler.py); the background sweep in every worker
+# (one at a time, see app/services/booking_sweeper.py) catches what no
+# worker had scheduled. 0 turns the sweep off
+BOOKING_SWEEP_INTERVAL_SECONDS = int(os.getenv("BOOKING_SWEEP_INTERVAL_SECONDS", "900"))
+BOOKING_SWEEP_BATCH_SIZE = int(os.getenv("BOOKING_SWEEP_BATCH_SIZE", "500"))
+
+# Idempotency-Key (app/services/idempotency.py): a completed request is
+# replayed for this long; a request still running holds its key and extends
+# the hold every third of IDEMPOTENCY_LOCK_SECONDS, so the key of a request
+# whose process died frees up after IDEMPOTENCY_LOCK_SECONDS. Duplicates wait
+# up to IDEMPOTENCY_WAIT_SECONDS for the first request before getting 409
+IDEMPOTENCY_KEY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_KEY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
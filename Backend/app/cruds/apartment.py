@@ -1,6 +1,9 @@
 from decimal import Decimal
+from typing import List, Optional
 
 from fastapi import HTTPException, status
+from sqlalchemy import case, func, literal, or_, select, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Query, Session, joinedload
 
 from app.models import (
@@ -11,8 +14,17 @@ from app.models import (
     FinishingType,
     PropertyStatus,
 )
-from app.schemas import ApartmentCreate, ApartmentUpdate
+from app.events import UPDATED, EntityChange, record_change
+from app.schemas import (
+    ApartmentCreate,
+    ApartmentRepriceFilter,
+    ApartmentRepriceRule,
+    ApartmentUpdate,
+)
+from app.cruds.pagination import CountMode, apply_keyset_sorting, count_total, paginate
+from app.cruds.pricing import resolve_total_price
 from app.cruds.promotion import get_active_promotions_for_apartment
+from app.services.promotion_index import ActivePromotion
 
 
 def _apply_apartment_filters(
@@ -87,25 +99,10 @@ def _apply_apartment_sorting(
     order_by: str = "asc",
     sort_by: str = "floor",
 ) -> Query:
-    if hasattr(Apartment, sort_by):
-        sort_column = getattr(Apartment, sort_by)
-        query = query.order_by(
-            sort_column.desc() if order_by == "desc" else sort_column.asc()
-        )
-    return query
+    return apply_keyset_sorting(query, Apartment, sort_by=sort_by, order=order_by)
 
 
-def _enrich_apartment_with_promotion(db: Session, apartment: Apartment):
-    building = db.query(Building).filter(Building.id == apartment.building_id).first()
-    if not building:
-        return apartment
-
-    promotion = get_active_promotions_for_apartment(
-        db,
-        residential_complex_id=building.residential_complex_id,
-        apartment_type=apartment.apartment_type
-    )
-
+def _apply_promotion_price(apartment: Apartment, promotion: Optional[ActivePromotion]):
     if promotion:
         discount_multiplier = (100 - promotion.discount_percentage) / 100
         discounted_price = apartment.total_price * discount_multiplier
@@ -123,6 +120,37 @@ def _enrich_apartment_with_promotion(db: Session, apartment: Apartment):
     return apartment
 
 
+def _enrich_apartments_with_promotions(db: Session, apartments: List[Apartment]):
+    """Price a page of apartments with one building query instead of two per row."""
+    if not apartments:
+        return apartments
+
+    building_ids = {apartment.building_id for apartment in apartments}
+    complex_by_building = dict(
+        db.query(Building.id, Building.residential_complex_id)
+        .filter(Building.id.in_(building_ids))
+        .all()
+    )
+
+    for apartment in apartments:
+        complex_id = complex_by_building.get(apartment.building_id)
+        if complex_id is None:
+            continue
+
+        promotion = get_active_promotions_for_apartment(
+            db,
+            residential_complex_id=complex_id,
+            apartment_type=apartment.apartment_type,
+        )
+        _apply_promotion_price(apartment, promotion)
+
+    return apartments
+
+
+def _enrich_apartment_with_promotion(db: Session, apartment: Apartment):
+    return _enrich_apartments_with_promotions(db, [apartment])[0]
+
+
 # GET Apartment
 def get_apartments_filtered(
     db: Session,
@@ -150,11 +178,12 @@ def get_apartments_filtered(
     sort_by: str = "floor",
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.exact,
 ):
     query = db.query(Apartment)
 
-    query = _apply_apartment_filters(
-        query,
+    filters = dict(
         building_id=building_id,
         min_floor=min_floor,
         max_floor=max_floor,
@@ -176,15 +205,24 @@ def get_apartments_filtered(
         orientation=orientation,
         isCorner=isCorner,
     )
+    query = _apply_apartment_filters(query, **filters)
 
     query = _apply_apartment_sorting(query, order_by=order_by, sort_by=sort_by)
 
-    total = query.count()
-    results = query.offset(offset).limit(limit).all()
+    total = count_total(query, count_mode, namespace="apartment", filters=filters)
+    results, next_cursor = paginate(
+        query, Apartment, sort_by, order_by, limit, offset=offset, cursor=cursor
+    )
 
-    enriched_results = [_enrich_apartment_with_promotion(db, apt) for apt in results]
+    enriched_results = _enrich_apartments_with_promotions(db, results)
 
-    return {"total": total, "results": enriched_results, "limit": limit, "offset": offset}
+    return {
+        "total": total,
+        "results": enriched_results,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+    }
 
 
 def get_apartment_by_id(db: Session, apartment_id: int):
@@ -203,22 +241,124 @@ def get_apartment_by_number(db: Session, number: int, building_id: int):
     )
 
 
+# Facets
+FACET_COLUMNS = ("apartment_type", "finishing_type", "orientation", "status", "floor")
+
+
+def _bucket(value, low, high, buckets: int):
+    """1-based histogram bucket; the maximum falls into the last bucket."""
+    return case(
+        (low == high, 1),
+        else_=func.least(func.width_bucket(value, low, high, buckets), buckets),
+    )
+
+
+def _histogram(counts: dict, low, high, buckets: int) -> List[dict]:
+    if low is None:
+        return []
+    if low == high:
+        return [{"min": low, "max": high, "count": counts.get(1, 0)}]
+
+    width = (high - low) / buckets
+    return [
+        {
+            "min": low + width * (bucket - 1),
+            "max": high if bucket == buckets else low + width * bucket,
+            "count": counts.get(bucket, 0),
+        }
+        for bucket in range(1, buckets + 1)
+    ]
+
+
+def get_apartment_facets(db: Session, buckets: int = 10, **filters):
+    """Facet counts of the apartments matching filters, in one statement.
+
+    Takes the filters of get_apartments_filtered. Each GROUPING SETS branch
+    counts one facet over the same filtered rows; the empty set is the
+    total. Price and area histograms split [min, max] of the filtered rows
+    into equal buckets.
+    """
+    filtered = _apply_apartment_filters(
+        db.query(
+            Apartment.apartment_type,
+            Apartment.finishing_type,
+            Apartment.orientation,
+            Apartment.status,
+            Apartment.floor,
+            Apartment.total_price,
+            Apartment.apartment_area,
+        ),
+        **filters,
+    ).subquery("filtered")
+
+    bounds = select(
+        func.min(filtered.c.total_price).label("min_price"),
+        func.max(filtered.c.total_price).label("max_price"),
+        func.min(filtered.c.apartment_area).label("min_area"),
+        func.max(filtered.c.apartment_area).label("max_area"),
+    ).subquery("bounds")
+
+    price_bucket = _bucket(
+        filtered.c.total_price, bounds.c.min_price, bounds.c.max_price, buckets
+    )
+    area_bucket = _bucket(
+        filtered.c.apartment_area, bounds.c.min_area, bounds.c.max_area, buckets
+    )
+    keys = [filtered.c[name] for name in FACET_COLUMNS] + [price_bucket, area_bucket]
+    names = list(FACET_COLUMNS) + ["price", "area"]
+
+    statement = (
+        select(
+            *keys,
+            func.count().label("count"),
+            *[func.grouping(key) for key in keys],
+            func.min(bounds.c.min_price),
+            func.max(bounds.c.max_price),
+            func.min(bounds.c.min_area),
+            func.max(bounds.c.max_area),
+        )
+        .select_from(filtered.join(bounds, true()))
+        .group_by(func.grouping_sets(*keys, tuple_()))
+    )
+
+    facets = {name: {} for name in names}
+    total = 0
+    min_price = max_price = min_area = max_area = None
+
+    for row in db.execute(statement):
+        values = row[: len(keys)]
+        count = row[len(keys)]
+        grouped_away = row[len(keys) + 1 : 2 * len(keys) + 1]
+
+        if all(grouped_away):
+            total = count
+            min_price, max_price, min_area, max_area = row[2 * len(keys) + 1 :]
+            continue
+
+        index = grouped_away.index(0)
+        if values[index] is not None:
+            facets[names[index]][values[index]] = count
+
+    return {
+        "total": total,
+        "apartment_type": facets["apartment_type"],
+        "finishing_type": facets["finishing_type"],
+        "orientation": facets["orientation"],
+        "status": facets["status"],
+        "floor": dict(sorted(facets["floor"].items())),
+        "price": _histogram(facets["price"], min_price, max_price, buckets),
+        "area": _histogram(facets["area"], min_area, max_area, buckets),
+    }
+
+
 # POST Apartment
 def create_apartment(db: Session, apartment: ApartmentCreate):
-    if apartment.total_price is None:
-        total_price = apartment.price_per_sqr * apartment.apartment_area
-    else:
-        calculated_price = apartment.price_per_sqr * apartment.apartment_area
-        min_price = calculated_price * Decimal(0.6)
-        max_price = calculated_price * Decimal(2)
-
-        if apartment.total_price <= min_price or apartment.total_price >= max_price:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Apartment price must in range {min_price} to {max_price}",
-            )
-
-        total_price = apartment.total_price
+    total_price = resolve_total_price(
+        "Apartment",
+        apartment.price_per_sqr,
+        apartment.apartment_area,
+        apartment.total_price,
+    )
 
     new_apartment = Apartment(
         building_id=apartment.building_id,
@@ -266,3 +406,150 @@ def delete_apartment(db: Session, apartment_id: int):
     db.delete(db_apartment)
     db.commit()
     return True
+
+
+
+# Repricing
+def _reprice_query(db: Session, target: ApartmentRepriceFilter, rule: ApartmentRepriceRule) -> Query:
+    if target.building_id is None and target.residential_complex_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Choose a building or a residential complex to reprice",
+        )
+
+    query = _apply_apartment_filters(
+        db.query(Apartment), **target.model_dump(exclude={"residential_complex_id"})
+    )
+    if target.residential_complex_id is not None:
+        query = query.filter(
+            Apartment.building_id.in_(
+                select(Building.id).where(
+                    Building.residential_complex_id == target.residential_complex_id
+                )
+            )
+        )
+    if target.status is None:
+        query = query.filter(
+            or_(Apartment.status.is_(None), Apartment.status != PropertyStatus.sold)
+        )
+    if rule.price_per_sqr is None:
+        query = query.filter(Apartment.price_per_sqr.isnot(None))
+    return query.filter(Apartment.apartment_area.isnot(None))
+
+
+def _repriced_per_sqr(rule: ApartmentRepriceRule):
+    if rule.price_per_sqr is None and not rule.percent and not rule.floor_premium:
+        detail = "Reprice rule changes nothing"
+    elif rule.price_per_sqr is not None and rule.price_per_sqr <= 0:
+        detail = "Price per square meter must be positive"
+    elif rule.percent is not None and rule.percent <= -100:
+        detail = "Percent change must be greater than -100"
+    elif rule.floor_premium is not None and rule.floor_premium < 0:
+        detail = "Floor premium must not be negative"
+    else:
+        detail = None
+    if detail:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+    price = Apartment.price_per_sqr if rule.price_per_sqr is None else literal(rule.price_per_sqr)
+    if rule.percent:
+        price = price * (1 + rule.percent / 100)
+    if rule.floor_premium:
+        floors_above = case(
+            (Apartment.floor > rule.base_floor, Apartment.floor - rule.base_floor),
+            else_=0,
+        )
+        price = price * (1 + floors_above * (rule.floor_premium / 100))
+    return func.round(price, 2)
+
+
+def reprice_apartments(
+    db: Session,
+    target: ApartmentRepriceFilter,
+    rule: ApartmentRepriceRule,
+    dry_run: bool = False,
+):
+    """Set new prices per m² and totals of the matched apartments in one UPDATE.
+
+    A dry run returns the per-apartment diff the same expressions produce
+    without writing anything.
+    """
+    query = _reprice_query(db, target, rule)
+    new_per_sqr = _repriced_per_sqr(rule)
+    new_total = func.round(new_per_sqr * Apartment.apartment_area, 2)
+
+    if dry_run:
+        changes = [
+            row._asdict()
+            for row in query.with_entities(
+                Apartment.id,
+                Apartment.building_id,
+                Apartment.number,
+                Apartment.floor,
+                Apartment.price_per_sqr.label("old_price_per_sqr"),
+                new_per_sqr.label("new_price_per_sqr"),
+                Apartment.total_price.label("old_total_price"),
+                new_total.label("new_total_price"),
+            ).order_by(Apartment.building_id, Apartment.floor, Apartment.number)
+        ]
+        return {
+            "dry_run": True,
+            "count": len(changes),
+            "old_total": sum(change["old_total_price"] or 0 for change in changes),
+            "new_total": sum(change["new_total_price"] for change in changes),
+            "changes": changes,
+        }
+
+    per_building = (
+        query.with_entities(
+            Apartment.building_id,
+            func.sum(Apartment.total_price),
+            func.sum(new_total),
+        )
+        .group_by(Apartment.building_id)
+        .all()
+    )
+    count = query.update(
+        {Apartment.price_per_sqr: new_per_sqr, Apartment.total_price: new_total},
+        synchronize_session=False,
+    )
+
+    # The UPDATE bypasses the flush; one change per building reaches subscribers
+    # in a single publish after commit
+    for building_id, _, _ in per_building:
+        record_change(
+            db,
+            EntityChange(
+                entity=Apartment.__tablename__,
+                id=None,
+                action=UPDATED,
+                building_id=building_id,
+            ),
+        )
+    db.commit()
+
+    return {
+        "dry_run": False,
+        "count": count,
+        "old_total": sum(old or 0 for _, old, _ in per_building),
+        "new_total": sum(new or 0 for _, _, new in per_building),
+    }
+
+
+# Async reads
+async def get_apartments_filtered_async(db: AsyncSession, **kwargs):
+    """get_apartments_filtered on the async session, same arguments."""
+    return await db.run_sync(get_apartments_filtered, **kwargs)
+
+
+async def get_apartment_facets_async(db: AsyncSession, **kwargs):
+    """get_apartment_facets on the async session, same arguments."""
+    return await db.run_sync(get_apartment_facets, **kwargs)
+
+
+async def get_apartment_by_id_async(db: AsyncSession, apartment_id: int):
+    result = await db.execute(select(Apartment).where(Apartment.id == apartment_id))
+    apartment = result.scalars().first()
+    if apartment:
+        return await db.run_sync(_enrich_apartment_with_promotion, apartment)
+    return None
@@ -1,10 +1,15 @@
 from datetime import date
+from typing import Optional
 
-from sqlalchemy import asc, desc
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Query, Session
 
+from app.cache import building_cache
+from app.cruds.pagination import CountMode, apply_keyset_sorting, count_total, paginate
+from app.database import primary_async_session
 from app.models import Building, BuildingStatus
-from app.schemas import BuildingCreate, BuildingUpdate
+from app.schemas import BuildingCreate, BuildingResponse, BuildingUpdate
 
 
 def _apply_building_filters(
@@ -70,13 +75,7 @@ def _apply_building_sorting(
     order_by: str = "asc",
     sort_by: str = "construction_end",
 ) -> Query:
-    if hasattr(Building, sort_by):
-        if order_by == "desc":
-            query = query.order_by(desc(getattr(Building, sort_by)))
-        else:
-            query = query.order_by(asc(getattr(Building, sort_by)))
-
-    return query
+    return apply_keyset_sorting(query, Building, sort_by=sort_by, order=order_by)
 
 
 # GET Buildings
@@ -103,12 +102,13 @@ def get_buildings_filtered(
     sort_by: str = "construction_end",
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.exact,
 ):
 
     query = db.query(Building)
 
-    query = _apply_building_filters(
-        query=query,
+    filters = dict(
         complex_id=complex_id,
         min_floor=min_floor,
         max_floor=max_floor,
@@ -127,13 +127,22 @@ def get_buildings_filtered(
         construction_start=construction_start,
         construction_end=construction_end,
     )
+    query = _apply_building_filters(query, **filters)
 
-    query = _apply_building_sorting(query, sort_by, order_by)
+    query = _apply_building_sorting(query, order_by=order_by, sort_by=sort_by)
 
-    total = query.count()
-    results = query.offset(offset).limit(limit).all()
+    total = count_total(query, count_mode, namespace="building", filters=filters)
+    results, next_cursor = paginate(
+        query, Building, sort_by, order_by, limit, offset=offset, cursor=cursor
+    )
 
-    return {"total": total, "results": results, "limit": limit, "offset": offset}
+    return {
+        "total": total,
+        "results": results,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+    }
 
 
 def get_building_by_id(db: Session, building_id: int):
@@ -189,3 +198,27 @@ def delete_building(db: Session, building_id: int):
     db.delete(db_building)
     db.commit()
     return True
+
+
+# Async reads
+async def get_buildings_filtered_async(db: AsyncSession, **kwargs):
+    """get_buildings_filtered on the async session, same arguments."""
+    return await db.run_sync(get_buildings_filtered, **kwargs)
+
+
+async def get_building_by_id_async(db: AsyncSession, building_id: int):
+    """Building details as a response dict, served from building_cache."""
+
+    async def load():
+        async with primary_async_session(db) as primary:
+            result = await primary.execute(select(Building).where(Building.id == building_id))
+            building = result.scalars().first()
+            if building is None:
+                return None
+            return BuildingResponse.model_validate(
+                building, from_attributes=True
+            ).model_dump(mode="json")
+
+    return await building_cache.get_or_load_async(
+        building_id, load, tags=[f"building:{building_id}"]
+    )
@@ -1,9 +1,11 @@
 from decimal import Decimal
 from http import HTTPStatus
+from typing import Optional
 
-from fastapi import HTTPException, status
 from sqlalchemy.orm import Query, Session
 
+from app.cruds.pagination import CountMode, apply_keyset_sorting, count_total, paginate
+from app.cruds.pricing import resolve_total_price
 from app.models import CommercialUnit, Direction, FinishingType, PropertyStatus
 from app.schemas import CommercialUnitCreate, CommercialUnitUpdate
 
@@ -65,13 +67,7 @@ def _apply_commercial_sorting(
     order_by: str = "asc",
     sort_by: str = "floor",
 ) -> Query:
-    if hasattr(CommercialUnit, sort_by):
-        sort_column = getattr(CommercialUnit, sort_by)
-        query = query.order_by(
-            sort_column.desc() if order_by == "desc" else sort_column.asc()
-        )
-
-    return query
+    return apply_keyset_sorting(query, CommercialUnit, sort_by=sort_by, order=order_by)
 
 
 # GET Commercials
@@ -96,11 +92,12 @@ def get_commercials_filtered(
     sort_by: str = "floor",
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.exact,
 ):
     query = db.query(CommercialUnit)
 
-    query = _apply_commercial_filters(
-        query,
+    filters = dict(
         building_id=building_id,
         min_floor=min_floor,
         max_floor=max_floor,
@@ -117,13 +114,22 @@ def get_commercials_filtered(
         orientation=orientation,
         isCorner=isCorner,
     )
+    query = _apply_commercial_filters(query, **filters)
 
     query = _apply_commercial_sorting(query, order_by=order_by, sort_by=sort_by)
 
-    total = query.count()
-    results = query.offset(offset).limit(limit).all()
+    total = count_total(query, count_mode, namespace="commercial_unit", filters=filters)
+    results, next_cursor = paginate(
+        query, CommercialUnit, sort_by, order_by, limit, offset=offset, cursor=cursor
+    )
 
-    return {"total": total, "results": results, "limit": limit, "offset": offset}
+    return {
+        "total": total,
+        "results": results,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+    }
 
 
 def get_commercial_by_id(db: Session, commercial_id: int):
@@ -141,23 +147,12 @@ def get_commercial_by_number(db: Session, number: int, building_id: int):
 
 # POST CommercialUnit
 def create_commercial(db: Session, commercialUnit: CommercialUnitCreate):
-    if commercialUnit.total_price is None:
-        total_price = commercialUnit.price_per_sqr * commercialUnit.space_area
-    else:
-        calculated_price = commercialUnit.price_per_sqr * commercialUnit.space_area
-        min_price = calculated_price * Decimal(0.6)
-        max_price = calculated_price * Decimal(2)
-
-        if (
-            commercialUnit.total_price <= min_price
-            or commercialUnit.total_price >= max_price
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"CommercialUnit price must in range {min_price} to {max_price}",
-            )
-
-        total_price = commercialUnit.total_price
+    total_price = resolve_total_price(
+        "CommercialUnit",
+        commercialUnit.price_per_sqr,
+        commercialUnit.space_area,
+        commercialUnit.total_price,
+    )
 
     new_commercial = CommercialUnit(
         building_id=commercialUnit.building_id,
@@ -2,6 +2,7 @@ from datetime import date
 from decimal import Decimal
 from typing import Optional
 
+from sqlalchemy import and_, or_, true
 from sqlalchemy.orm import Session
 
 from app.cruds.apartment import _apply_apartment_filters
@@ -48,93 +49,104 @@ def get_favorites_filtered(
     limit: int = 100,
     offset: int = 0,
 ):
-    query = db.query(Favorites).filter(Favorites.user_id == user_id)
+    apartment_criteria = _apply_apartment_filters(
+        db.query(Apartment.id),
+        min_floor=min_floor,
+        max_floor=max_floor,
+        min_apartment_area=min_apartment_area,
+        max_apartment_area=max_apartment_area,
+        apartment_type=apartment_type,
+        has_balcony=has_balcony,
+        bathroom_count=bathroom_count,
+        min_kitchen_area=min_kitchen_area,
+        max_kitchen_area=max_kitchen_area,
+        min_ceiling_height=min_ceiling_height,
+        max_ceiling_height=max_ceiling_height,
+        finishing_type=finishing_type,
+        min_per_sqr=min_per_sqr,
+        max_per_sqr=max_per_sqr,
+        min_total_price=min_total_price,
+        max_total_price=max_total_price,
+        status=status,
+        orientation=orientation,
+        isCorner=isCorner,
+    ).whereclause
+
+    commercial_criteria = _apply_commercial_filters(
+        db.query(CommercialUnit.id),
+        min_floor=min_floor,
+        max_floor=max_floor,
+        min_space_area=min_space_area,
+        max_space_area=max_space_area,
+        min_ceiling_height=min_ceiling_height,
+        max_ceiling_height=max_ceiling_height,
+        finishing_type=finishing_type,
+        min_per_sqr=min_per_sqr,
+        max_per_sqr=max_per_sqr,
+        min_total_price=min_total_price,
+        max_total_price=max_total_price,
+        status=status,
+        orientation=orientation,
+        isCorner=isCorner,
+    ).whereclause
+
+    # Both property tables are joined onto the favorite rows, so filtering,
+    # counting and paging all happen in SQL in one statement each.
+    query = (
+        db.query(Favorites, Apartment, CommercialUnit)
+        .outerjoin(
+            Apartment,
+            and_(
+                Favorites.object_type == ObjectType.apartment,
+                Apartment.id == Favorites.object_id,
+            ),
+        )
+        .outerjoin(
+            CommercialUnit,
+            and_(
+                Favorites.object_type == ObjectType.commercial,
+                CommercialUnit.id == Favorites.object_id,
+            ),
+        )
+        .filter(Favorites.user_id == user_id)
+        .filter(
+            or_(
+                and_(
+                    Apartment.id.isnot(None),
+                    apartment_criteria if apartment_criteria is not None else true(),
+                ),
+                and_(
+                    CommercialUnit.id.isnot(None),
+                    commercial_criteria if commercial_criteria is not None else true(),
+                ),
+            )
+        )
+    )
 
     if object_type:
         query = query.filter(Favorites.object_type == object_type)
 
+    total = query.count()
+
     if sorting_by_date == "desc":
-        query = query.order_by(Favorites.created_at.desc())
+        query = query.order_by(Favorites.created_at.desc(), Favorites.id.desc())
     else:
-        query = query.order_by(Favorites.created_at.asc())
-
-    favorites = query.offset(offset).limit(limit).all()
-
-    results = []
-    for fav in favorites:
-        if fav.object_type == ObjectType.apartment:
-            apt_query = db.query(Apartment).filter(Apartment.id == fav.object_id)
-
-            apt_query = _apply_apartment_filters(
-                apt_query,
-                min_floor=min_floor,
-                max_floor=max_floor,
-                min_apartment_area=min_apartment_area,
-                max_apartment_area=max_apartment_area,
-                apartment_type=apartment_type,
-                has_balcony=has_balcony,
-                bathroom_count=bathroom_count,
-                min_kitchen_area=min_kitchen_area,
-                max_kitchen_area=max_kitchen_area,
-                min_ceiling_height=min_ceiling_height,
-                max_ceiling_height=max_ceiling_height,
-                finishing_type=finishing_type,
-                min_per_sqr=min_per_sqr,
-                max_per_sqr=max_per_sqr,
-                min_total_price=min_total_price,
-                max_total_price=max_total_price,
-                status=status,
-                orientation=orientation,
-                isCorner=isCorner,
-            )
+        query = query.order_by(Favorites.created_at.asc(), Favorites.id.asc())
 
-            apartment = apt_query.first()
-            if apartment:
-                results.append(
-                    {
-                        "favorite_id": fav.id,
-                        "object_type": fav.object_type,
-                        "created_at": fav.created_at,
-                        "object_data": apartment,
-                    }
-                )
-
-        elif fav.object_type == ObjectType.commercial:
-            com_query = db.query(CommercialUnit).filter(
-                CommercialUnit.id == fav.object_id
-            )
-
-            com_query = _apply_commercial_filters(
-                com_query,
-                min_floor=min_floor,
-                max_floor=max_floor,
-                min_space_area=min_space_area,
-                max_space_area=max_space_area,
-                min_ceiling_height=min_ceiling_height,
-                max_ceiling_height=max_ceiling_height,
-                finishing_type=finishing_type,
-                min_per_sqr=min_per_sqr,
-                max_per_sqr=max_per_sqr,
-                min_total_price=min_total_price,
-                max_total_price=max_total_price,
-                status=status,
-                orientation=orientation,
-                isCorner=isCorner,
-            )
+    rows = query.offset(offset).limit(limit).all()
 
-            commercial = com_query.first()
-            if commercial:
-                results.append(
-                    {
-                        "favorite_id": fav.id,
-                        "object_type": fav.object_type,
-                        "created_at": fav.created_at,
-                        "object_data": commercial,
-                    }
-                )
+    results = [
+        {
+            "favorite_id": fav.id,
+            "object_type": fav.object_type,
+            "created_at": fav.created_at,
+            "object_data": apartment if apartment is not None else commercial,
+        }
+        for fav, apartment, commercial in rows
+    ]
 
     return {
-        "total": len(results),
+        "total": total,
         "results": results,
         "limit": limit,
         "offset": offset,
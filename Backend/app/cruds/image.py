@@ -2,10 +2,18 @@ from datetime import date
 import re
 
 from cloudinary import uploader
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.cache import image_cache
+from app.database import primary_async_session
 from app.models import Image, ObjectType
-from app.schemas import ImageCreate, ImageUpdate
+from app.schemas import ImageCreate, ImageResponse, ImageUpdate
+
+
+def image_tag(object_type: ObjectType, object_id: int) -> str:
+    return f"image:{object_type.name}:{object_id}"
 
 
 def get_images_by_object(db: Session, object_id: int, object_type: ObjectType):
@@ -68,3 +76,32 @@ def delete_image(db: Session, image_id: int):
     db.delete(db_image)
     db.commit()
     return False
+
+
+# Async reads
+async def get_images_by_object_async(
+    db: AsyncSession, object_id: int, object_type: ObjectType
+):
+    """Images of one object as response dicts, served from image_cache."""
+
+    async def load():
+        async with primary_async_session(db) as primary:
+            result = await primary.execute(
+                select(Image)
+                .where(Image.object_id == object_id)
+                .where(Image.object_type == object_type)
+            )
+            return [
+                ImageResponse.model_validate(image, from_attributes=True).model_dump(
+                    mode="json"
+                )
+                for image in result.scalars().all()
+            ]
+
+    tag = image_tag(object_type, object_id)
+    return await image_cache.get_or_load_async(tag, load, tags=[tag])
+
+
+async def get_images_by_id_async(db: AsyncSession, image_id: int):
+    result = await db.execute(select(Image).where(Image.id == image_id))
+    return result.scalars().first()
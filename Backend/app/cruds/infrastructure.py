@@ -2,18 +2,39 @@ from typing import List
 
 from sqlalchemy.orm import Session
 
+from app.cache import infrastructure_cache
+from app.database import primary_session
 from app.models import Infrastructure
-from app.schemas import InfrastructureCreate, InfrastructureUpdate
+from app.schemas import (
+    InfrastructureCreate,
+    InfrastructureResponse,
+    InfrastructureUpdate,
+)
 
 
 def get_infrastructures_by_complex(
     db: Session, residential_complex_id: int
-) -> List[Infrastructure]:
-    """Получить всю инфраструктуру для конкретного жилого комплекса"""
-    return (
-        db.query(Infrastructure)
-        .filter(Infrastructure.residential_complex_id == residential_complex_id)
-        .all()
+) -> List[dict]:
+    """Получить всю инфраструктуру для конкретного жилого комплекса (из кэша)"""
+
+    def load():
+        with primary_session(db) as primary:
+            infrastructures = (
+                primary.query(Infrastructure)
+                .filter(Infrastructure.residential_complex_id == residential_complex_id)
+                .all()
+            )
+            return [
+                InfrastructureResponse.model_validate(
+                    infrastructure, from_attributes=True
+                ).model_dump(mode="json")
+                for infrastructure in infrastructures
+            ]
+
+    return infrastructure_cache.get_or_load(
+        residential_complex_id,
+        load,
+        tags=[f"infrastructure:complex:{residential_complex_id}"],
     )
 
 
@@ -1,9 +1,11 @@
 from datetime import date
 from decimal import Decimal
+from typing import Optional
 
 from sqlalchemy.orm import Session
 
 from app.auth import get_current_user
+from app.cruds.pagination import CountMode, apply_keyset_sorting, count_total, paginate
 from app.models import (
     Apartment,
     CommercialUnit,
@@ -15,6 +17,14 @@ from app.models import (
 )
 from app.schemas import OrderCreate, OrderUpdate
 
+PROPERTY_MODELS = {
+    ObjectType.apartment: Apartment,
+    ObjectType.commercial: CommercialUnit,
+}
+
+# Orders still holding (or waiting for) their unit
+OPEN_ORDER_STATUSES = (OrderStatus.pending, OrderStatus.offering)
+
 
 # GET Orders
 def get_order_by_id(db: Session, order_id: int):
@@ -39,8 +49,24 @@ def get_orders_filtered(
     sort_by: str = "status",
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.exact,
 ):
 
+    filters = dict(
+        object_id=object_id,
+        user_id=user_id,
+        order_type=order_type,
+        object_type=object_type,
+        min_total_price=min_total_price,
+        max_total_price=max_total_price,
+        payment_type=payment_type,
+        min_booking_deposit=min_booking_deposit,
+        max_booking_deposit=max_booking_deposit,
+        from_booking_expiration=from_booking_expiration,
+        to_booking_expiration=to_booking_expiration,
+        order_status=order_status,
+    )
     query = db.query(Order)
 
     if object_id:
@@ -68,16 +94,20 @@ def get_orders_filtered(
     if order_status:
         query = query.filter(Order.status == order_status)
 
-    if hasattr(Order, sort_by):
-        if order_by == "desc":
-            query = query.order_by(getattr(Order, sort_by).desc())
-        else:
-            query = query.order_by(getattr(Order, sort_by).asc())
+    query = apply_keyset_sorting(query, Order, sort_by=sort_by, order=order_by)
 
-    total = query.count()
-    results = query.offset(offset).limit(limit)
+    total = count_total(query, count_mode, namespace="order", filters=filters)
+    results, next_cursor = paginate(
+        query, Order, sort_by, order_by, limit, offset=offset, cursor=cursor
+    )
 
-    return {"total": total, "results": results, "limit": limit, "offset": offset}
+    return {
+        "total": total,
+        "results": results,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+    }
 
 
 # POST Order
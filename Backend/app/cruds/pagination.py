@@ -0,0 +1,264 @@
+import base64
+import binascii
+import json
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Query
+
+from app.config import COUNT_CACHE_MAX_ENTRIES, COUNT_CACHE_TTL_SECONDS
+
+
+class CountMode(str, Enum):
+    exact = "exact"
+    estimate = "estimate"
+    none = "none"
+
+
+def _normalize_order(order: str) -> str:
+    return "desc" if order == "desc" else "asc"
+
+
+def _sort_column(model, sort_by: str):
+    if sort_by in model.__mapper__.columns and sort_by != "id":
+        return getattr(model, sort_by)
+    return None
+
+
+def _dump_value(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _load_value(column, raw):
+    if raw is None:
+        return None
+
+    python_type = column.type.python_type
+    if issubclass(python_type, Enum):
+        return python_type(raw)
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    if python_type is date:
+        return date.fromisoformat(raw)
+    if python_type is Decimal:
+        return Decimal(raw)
+    return raw
+
+
+def apply_keyset_sorting(query: Query, model, sort_by: str, order: str) -> Query:
+    """Order by the requested column with id as a tie-breaker.
+
+    NULLs always go last so the order is the same on Postgres and SQLite
+    and a cursor can describe any position in it.
+    """
+    descending = _normalize_order(order) == "desc"
+    column = _sort_column(model, sort_by)
+
+    criteria = []
+    if column is not None:
+        criteria.append(
+            column.desc().nulls_last() if descending else column.asc().nulls_last()
+        )
+    criteria.append(model.id.desc() if descending else model.id.asc())
+
+    return query.order_by(*criteria)
+
+
+def encode_cursor(row, model, sort_by: str, order: str) -> str:
+    payload = {"s": sort_by, "o": _normalize_order(order), "id": row.id}
+    if _sort_column(model, sort_by) is not None:
+        payload["v"] = _dump_value(getattr(row, sort_by))
+
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, model, sort_by: str, order: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+
+        if payload["s"] != sort_by or payload["o"] != _normalize_order(order):
+            raise ValueError("Cursor was issued for a different sort order")
+
+        column = _sort_column(model, sort_by)
+        value = _load_value(column, payload.get("v")) if column is not None else None
+        return value, int(payload["id"])
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def apply_cursor(query: Query, model, sort_by: str, order: str, cursor: str) -> Query:
+    """Keep only the rows that come after the cursor in apply_keyset_sorting order."""
+    value, last_id = _decode_cursor(cursor, model, sort_by, order)
+    descending = _normalize_order(order) == "desc"
+    column = _sort_column(model, sort_by)
+
+    id_after = model.id < last_id if descending else model.id > last_id
+    if column is None:
+        return query.filter(id_after)
+
+    if value is None:
+        return query.filter(column.is_(None), id_after)
+
+    value_after = column < value if descending else column > value
+    return query.filter(
+        or_(value_after, and_(column == value, id_after), column.is_(None))
+    )
+
+
+def paginate(
+    query: Query,
+    model,
+    sort_by: str,
+    order: str,
+    limit: int,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+):
+    """Fetch one page of an already sorted query.
+
+    With a cursor the page starts right after it (keyset pagination),
+    otherwise at offset. Returns the rows and the cursor of the next page,
+    or None when this is the last page.
+    """
+    if cursor:
+        query = apply_cursor(query, model, sort_by, order, cursor)
+    else:
+        query = query.offset(offset)
+
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if rows:
+            next_cursor = encode_cursor(rows[-1], model, sort_by, order)
+
+    return rows, next_cursor
+
+
+class _CountCache:
+    """Short-lived cache of exact totals keyed by the normalized filter set."""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get_or_count(self, key, count):
+        if self._ttl_seconds <= 0:
+            return count()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+        total = count()
+
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self._max_entries:
+                self._entries = {
+                    k: v for k, v in self._entries.items() if v[0] > now
+                }
+                if len(self._entries) >= self._max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (now + self._ttl_seconds, total)
+
+        return total
+
+    def clear(self, namespace: Optional[str] = None):
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+            else:
+                self._entries = {
+                    k: v for k, v in self._entries.items() if k[0] != namespace
+                }
+
+
+count_cache = _CountCache(COUNT_CACHE_TTL_SECONDS, COUNT_CACHE_MAX_ENTRIES)
+
+
+def _estimate_count(query: Query) -> Optional[int]:
+    """Row estimate from the Postgres planner, None when it is not available."""
+    bind = query.session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+
+    try:
+        statement = query.order_by(None).statement.compile(
+            dialect=bind.dialect, compile_kwargs={"literal_binds": True}
+        )
+        # In a savepoint, so a failed EXPLAIN does not abort the request's
+        # transaction
+        with query.session.begin_nested():
+            plan = (
+                query.session.connection()
+                .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}")
+                .scalar()
+            )
+    except (SQLAlchemyError, NotImplementedError):
+        return None
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_total(
+    query: Query,
+    count_mode: CountMode = CountMode.exact,
+    namespace: Optional[str] = None,
+    filters: Optional[dict] = None,
+) -> Optional[int]:
+    """Total for a filtered list according to count_mode.
+
+    exact counts are cached for COUNT_CACHE_TTL_SECONDS under
+    (namespace, filters); estimate falls back to exact outside Postgres;
+    none skips counting, clients page with next_cursor instead.
+    """
+    if count_mode == CountMode.none:
+        return None
+
+    if count_mode == CountMode.estimate:
+        estimate = _estimate_count(query)
+        if estimate is not None:
+            return estimate
+
+    count = query.order_by(None).count
+    if namespace is None:
+        return count()
+
+    # Keyed per engine too, so a count read on a lagging replica is never
+    # served to a client whose reads are pinned to the primary.
+    key = (
+        namespace,
+        query.session.get_bind(),
+        tuple(
+            sorted(
+                (name, _dump_value(value))
+                for name, value in (filters or {}).items()
+                if value is not None
+            )
+        ),
+    )
+    return count_cache.get_or_count(key, count)
@@ -0,0 +1,32 @@
+from decimal import Decimal
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+# A listed total price may deviate from area * price per m² only this much
+MIN_PRICE_RATIO = Decimal(0.6)
+MAX_PRICE_RATIO = Decimal(2)
+
+
+def allowed_price_range(price_per_sqr: Decimal, area: Decimal) -> Tuple[Decimal, Decimal]:
+    calculated_price = price_per_sqr * area
+    return calculated_price * MIN_PRICE_RATIO, calculated_price * MAX_PRICE_RATIO
+
+
+def resolve_total_price(
+    label: str,
+    price_per_sqr: Decimal,
+    area: Decimal,
+    total_price: Optional[Decimal] = None,
+) -> Decimal:
+    """Total price of a unit: computed when missing, range-checked otherwise."""
+    if total_price is None:
+        return price_per_sqr * area
+
+    min_price, max_price = allowed_price_range(price_per_sqr, area)
+    if total_price <= min_price or total_price >= max_price:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{label} price must in range {min_price} to {max_price}",
+        )
+    return total_price
@@ -1,8 +1,8 @@
-from datetime import date
 from typing import Optional
 from sqlalchemy.orm import Session
 from app.models import Promotion, ApartmentType
 from app.schemas import PromotionCreate, PromotionUpdate
+from app.services.promotion_index import active_promotion_index
 
 
 def get_promotion_by_id(db: Session, promotion_id: int):
@@ -39,18 +39,11 @@ def get_active_promotions_for_apartment(
     residential_complex_id: int,
     apartment_type: ApartmentType,
 ):
-    today = date.today()
-
-    return db.query(Promotion).filter(
-        Promotion.is_active == True,
-        Promotion.start_date <= today,
-        Promotion.end_date >= today,
-        Promotion.residential_complex_id == residential_complex_id,
-        (
-            (Promotion.apartment_type == apartment_type) |
-            (Promotion.apartment_type == None)
-        )
-    ).order_by(Promotion.discount_percentage.desc()).first()
+    return active_promotion_index.best_for(
+        db,
+        residential_complex_id=residential_complex_id,
+        apartment_type=apartment_type,
+    )
 
 
 def create_promotion(db: Session, promotion: PromotionCreate):
@@ -1,6 +1,15 @@
-from sqlalchemy import asc, desc, or_
-from sqlalchemy.orm import Query, Session
+import math
+import re
+from functools import reduce
+from typing import List, Optional
 
+from sqlalchemy import Float, cast, func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session, aliased
+
+from app.cache import complex_cache, tile_cache
+from app.cruds.pagination import CountMode, apply_keyset_sorting, count_total, paginate
+from app.database import primary_async_session
 from app.models import (
     Building,
     BuildingClass,
@@ -8,8 +17,90 @@ from app.models import (
     City,
     MaterialType,
     ResidentialComplex,
+    ResidentialComplexStats,
+    residential_complex_location,
+    residential_complex_search_document,
+)
+from app.services.geo import (
+    CLUSTER_CELLS_PER_TILE,
+    EARTH_RADIUS_KM,
+    build_clusters,
+    build_tile_clusters,
+    cluster_cell_degrees,
+    complex_geo_grid,
+    radius_bbox,
+    tile_bbox,
 )
-from app.schemas import ResidentialComplexCreate, ResidentialComplexUpdate
+from app.schemas import (
+    ComplexTile,
+    ResidentialComplexCreate,
+    ResidentialComplexResponse,
+    ResidentialComplexUpdate,
+)
+
+
+# Text search configurations the search document is built with
+SEARCH_CONFIGS = ("russian", "english", "simple")
+
+# Description column and configuration used for highlighting, per language
+SEARCH_LANGUAGES = {
+    "ru": (ResidentialComplex.ru_description, "russian"),
+    "en": (ResidentialComplex.en_description, "english"),
+    "kz": (ResidentialComplex.kz_description, "simple"),
+}
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+
+def _search_terms(search: str) -> List[str]:
+    return re.findall(r"\w+", search)
+
+
+def _search_tsquery(terms: List[str]):
+    """Prefix match of every term, in any of the document's configurations."""
+    pattern = " & ".join(f"{term}:*" for term in terms)
+    return reduce(
+        lambda left, right: left.op("||")(right),
+        [
+            func.to_tsquery(literal_column(f"'{config}'::regconfig"), pattern)
+            for config in SEARCH_CONFIGS
+        ],
+    )
+
+
+def _ilike_search(search: str):
+    return or_(
+        ResidentialComplex.name.ilike(f"%{search}%"),
+        ResidentialComplex.ru_description.ilike(f"%{search}%"),
+        ResidentialComplex.kz_description.ilike(f"%{search}%"),
+        ResidentialComplex.en_description.ilike(f"%{search}%"),
+    )
+
+
+def _uses_full_text(db: Session, terms: List[str]) -> bool:
+    # The GIN index only exists on Postgres; SQLite test databases scan with ILIKE
+    return bool(terms) and db.get_bind().dialect.name == "postgresql"
+
+
+def _search_condition(db: Session, search: str):
+    terms = _search_terms(search)
+    if _uses_full_text(db, terms):
+        return residential_complex_search_document.op("@@")(_search_tsquery(terms))
+    return _ilike_search(search)
+
+
+def _highlight(text: Optional[str], terms: List[str], width: int = 200):
+    """ts_headline stand-in for databases without full-text search."""
+    if not text:
+        return None
+    if not terms:
+        return text[:width]
+
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    match = pattern.search(text)
+    start = max(0, match.start() - width // 2) if match else 0
+    fragment = text[start : start + width]
+    return pattern.sub(lambda found: f"<mark>{found.group(0)}</mark>", fragment)
 
 
 def _apply_residential_complex_filters(
@@ -39,14 +130,7 @@ def _apply_residential_complex_filters(
         query = query.filter(ResidentialComplex.apartment_area <= max_apartment_area)
 
     if search:
-        query = query.filter(
-            or_(
-                ResidentialComplex.name.ilike(f"%{search}%"),
-                ResidentialComplex.ru_description.ilike(f"%{search}%"),
-                ResidentialComplex.kz_description.ilike(f"%{search}%"),
-                ResidentialComplex.en_description.ilike(f"%{search}%"),
-            )
-        )
+        query = query.filter(_search_condition(query.session, search))
 
     return query
 
@@ -56,13 +140,7 @@ def _apply_residential_complex_sorting(
     sort_by: str = "name",
     order: str = "asc",
 ) -> Query:
-    if hasattr(ResidentialComplex, sort_by):
-        if order == "desc":
-            query = query.order_by(desc(getattr(ResidentialComplex, sort_by)))
-        else:
-            query = query.order_by(asc(getattr(ResidentialComplex, sort_by)))
-
-    return query
+    return apply_keyset_sorting(query, ResidentialComplex, sort_by=sort_by, order=order)
 
 
 # GET Residential Complex
@@ -80,11 +158,12 @@ def get_residential_complexes_filtered(
     order: str = "asc",
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.exact,
 ):
     query = db.query(ResidentialComplex)
 
-    query = _apply_residential_complex_filters(
-        query,
+    filters = dict(
         city=city,
         building_class=building_class,
         building_status=building_status,
@@ -94,13 +173,94 @@ def get_residential_complexes_filtered(
         max_apartment_area=max_apartment_area,
         search=search,
     )
+    query = _apply_residential_complex_filters(query, **filters)
 
     query = _apply_residential_complex_sorting(query, sort_by=sort_by, order=order)
 
-    total = query.count()
-    results = query.offset(offset).limit(limit).all()
+    total = count_total(query, count_mode, namespace="residential_complex", filters=filters)
+    results, next_cursor = paginate(
+        query, ResidentialComplex, sort_by, order, limit, offset=offset, cursor=cursor
+    )
+
+    return {
+        "total": total,
+        "results": results,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+    }
 
-    return {"total": total, "results": results, "limit": limit, "offset": offset}
+
+def search_residential_complexes(
+    db: Session,
+    q: str,
+    lang: str = "ru",
+    limit: int = 20,
+    offset: int = 0,
+):
+    """Complexes matching q, best match first, with a highlighted description.
+
+    Ranked by ts_rank_cd on Postgres, where name matches weigh more than
+    description matches. Elsewhere it falls back to ILIKE ordered by name.
+    """
+    terms = _search_terms(q)
+    description, config = SEARCH_LANGUAGES[lang]
+
+    if _uses_full_text(db, terms):
+        tsquery = _search_tsquery(terms)
+        rank = func.ts_rank_cd(residential_complex_search_document, tsquery)
+
+        # Rank and cut the page first, so ts_headline only runs on its rows
+        ranked = (
+            select(ResidentialComplex, rank.label("rank"))
+            .where(residential_complex_search_document.op("@@")(tsquery))
+            .order_by(rank.desc(), ResidentialComplex.id)
+            .offset(offset)
+            .limit(limit)
+            .subquery("ranked")
+        )
+        found = aliased(ResidentialComplex, ranked)
+        headline = func.ts_headline(
+            literal_column(f"'{config}'::regconfig"),
+            func.coalesce(getattr(found, description.key), ""),
+            tsquery,
+            HEADLINE_OPTIONS,
+        )
+        rows = db.execute(
+            select(found, ranked.c.rank, headline).order_by(
+                ranked.c.rank.desc(), found.id
+            )
+        ).all()
+    else:
+        complexes = (
+            db.query(ResidentialComplex)
+            .filter(_ilike_search(q))
+            .order_by(ResidentialComplex.name, ResidentialComplex.id)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        rows = [
+            (
+                residential_complex,
+                None,
+                _highlight(getattr(residential_complex, description.key), terms),
+            )
+            for residential_complex in complexes
+        ]
+
+    results = [
+        {
+            **ResidentialComplexResponse.model_validate(
+                residential_complex, from_attributes=True
+            ).model_dump(),
+            "rank": rank_value,
+            "headline": headline_value,
+        }
+        for residential_complex, rank_value, headline_value in rows
+    ]
+
+    return {"results": results, "limit": limit, "offset": offset}
 
 
 def get_residential_complex_by_id(db: Session, rdc_id: int):
@@ -111,6 +271,238 @@ def get_residential_complex_by_name(db: Session, name: str):
     return db.query(ResidentialComplex).filter(ResidentialComplex.name == name).first()
 
 
+# Geo queries: GiST on Postgres, the in-process grid elsewhere
+def _uses_gist(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _in_box(west: float, south: float, east: float, north: float):
+    return residential_complex_location.op("<@")(
+        func.box(func.point(west, south), func.point(east, north))
+    )
+
+
+def _marker_query(db: Session, *columns):
+    return db.query(
+        ResidentialComplex.id,
+        ResidentialComplex.name,
+        ResidentialComplex.latitude,
+        ResidentialComplex.longitude,
+        ResidentialComplexStats.min_price,
+        ResidentialComplex.main_image,
+        *columns,
+    ).outerjoin(ResidentialComplexStats)
+
+
+def _marker(row) -> dict:
+    return {
+        "id": row.id,
+        "name": row.name,
+        "latitude": float(row.latitude),
+        "longitude": float(row.longitude),
+        "min_price": row.min_price,
+        "main_image": row.main_image,
+    }
+
+
+def _distance_km(latitude: float, longitude: float):
+    """Haversine distance from (latitude, longitude) to each complex."""
+    complex_latitude = func.radians(cast(ResidentialComplex.latitude, Float))
+    complex_longitude = func.radians(cast(ResidentialComplex.longitude, Float))
+    half_chord = func.power(
+        func.sin((complex_latitude - math.radians(latitude)) / 2), 2
+    ) + func.cos(complex_latitude) * math.cos(math.radians(latitude)) * func.power(
+        func.sin((complex_longitude - math.radians(longitude)) / 2), 2
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(func.least(half_chord, 1.0)))
+
+
+def get_complexes_in_bbox(
+    db: Session,
+    west: float,
+    south: float,
+    east: float,
+    north: float,
+    limit: int = 500,
+):
+    if not _uses_gist(db):
+        points = sorted(
+            complex_geo_grid.in_bbox(west, south, east, north),
+            key=lambda point: point.id,
+        )
+        return [point.marker() for point in points[:limit]]
+
+    rows = (
+        _marker_query(db)
+        .filter(_in_box(west, south, east, north))
+        .order_by(ResidentialComplex.id)
+        .limit(limit)
+        .all()
+    )
+    return [_marker(row) for row in rows]
+
+
+def get_complexes_within_radius(
+    db: Session,
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    limit: int = 100,
+):
+    """Complexes within radius_km, nearest first.
+
+    The enclosing box narrows the candidates through the index; the exact
+    great-circle distance is computed only for those.
+    """
+    if not _uses_gist(db):
+        found = complex_geo_grid.within_radius(latitude, longitude, radius_km)
+        return [
+            {**point.marker(), "distance_km": distance}
+            for point, distance in found[:limit]
+        ]
+
+    distance = _distance_km(latitude, longitude)
+    rows = (
+        _marker_query(db, distance.label("distance_km"))
+        .filter(
+            _in_box(*radius_bbox(latitude, longitude, radius_km)),
+            distance <= radius_km,
+        )
+        .order_by(distance, ResidentialComplex.id)
+        .limit(limit)
+        .all()
+    )
+    return [{**_marker(row), "distance_km": row.distance_km} for row in rows]
+
+
+def get_complex_clusters(
+    db: Session,
+    west: float,
+    south: float,
+    east: float,
+    north: float,
+    zoom: int,
+):
+    """Complexes in the box grouped into grid cells sized for the zoom level."""
+    if not _uses_gist(db):
+        return build_clusters(complex_geo_grid.in_bbox(west, south, east, north), zoom)
+
+    cell = cluster_cell_degrees(zoom)
+    longitude = cast(ResidentialComplex.longitude, Float)
+    latitude = cast(ResidentialComplex.latitude, Float)
+    rows = (
+        db.query(
+            func.count().label("count"),
+            func.avg(latitude).label("latitude"),
+            func.avg(longitude).label("longitude"),
+            func.min(ResidentialComplexStats.min_price).label("min_price"),
+            func.min(ResidentialComplex.id).label("first_id"),
+            func.min(longitude).label("west"),
+            func.min(latitude).label("south"),
+            func.max(longitude).label("east"),
+            func.max(latitude).label("north"),
+        )
+        .select_from(ResidentialComplex)
+        .outerjoin(ResidentialComplexStats)
+        .filter(_in_box(west, south, east, north))
+        .group_by(func.floor(longitude / cell), func.floor(latitude / cell))
+        .all()
+    )
+    return [
+        {
+            "latitude": row.latitude,
+            "longitude": row.longitude,
+            "count": row.count,
+            "min_price": row.min_price,
+            "complex_id": row.first_id if row.count == 1 else None,
+            "west": row.west,
+            "south": row.south,
+            "east": row.east,
+            "north": row.north,
+        }
+        for row in rows
+    ]
+
+
+def _tile_cell(offset):
+    """Cluster cell index along one tile axis; points on the edge go last."""
+    return func.least(
+        func.greatest(func.floor(offset * CLUSTER_CELLS_PER_TILE), 0),
+        CLUSTER_CELLS_PER_TILE - 1,
+    )
+
+
+def get_tile_clusters(db: Session, z: int, x: int, y: int):
+    """Clusters of one Web Mercator tile, grouped on a grid of the tile itself.
+
+    Cells are CLUSTER_CELLS_PER_TILE per side whatever the zoom, so a tile
+    holds at most CLUSTER_CELLS_PER_TILE ** 2 clusters. complex_ids lists
+    the complexes in the tile, for cache invalidation.
+    """
+    west, south, east, north = tile_bbox(z, x, y)
+
+    if not _uses_gist(db):
+        points = complex_geo_grid.in_bbox(west, south, east, north)
+        return {
+            "z": z,
+            "x": x,
+            "y": y,
+            "clusters": build_tile_clusters(points, z, x, y),
+            "complex_ids": sorted(point.id for point in points),
+        }
+
+    tiles = 2**z
+    longitude = cast(ResidentialComplex.longitude, Float)
+    latitude = cast(ResidentialComplex.latitude, Float)
+    latitude_radians = func.radians(latitude)
+    tile_x = (longitude + 180) / 360 * tiles
+    tile_y = (
+        (1 - func.ln(func.tan(latitude_radians) + 1 / func.cos(latitude_radians)) / math.pi)
+        / 2
+        * tiles
+    )
+
+    rows = (
+        db.query(
+            func.count().label("count"),
+            func.avg(latitude).label("latitude"),
+            func.avg(longitude).label("longitude"),
+            func.min(ResidentialComplexStats.min_price).label("min_price"),
+            func.array_agg(ResidentialComplex.id).label("ids"),
+            func.min(longitude).label("west"),
+            func.min(latitude).label("south"),
+            func.max(longitude).label("east"),
+            func.max(latitude).label("north"),
+        )
+        .select_from(ResidentialComplex)
+        .outerjoin(ResidentialComplexStats)
+        .filter(_in_box(west, south, east, north))
+        .group_by(_tile_cell(tile_x - x), _tile_cell(tile_y - y))
+        .all()
+    )
+
+    return {
+        "z": z,
+        "x": x,
+        "y": y,
+        "clusters": [
+            {
+                "latitude": row.latitude,
+                "longitude": row.longitude,
+                "count": row.count,
+                "min_price": row.min_price,
+                "complex_id": row.ids[0] if row.count == 1 else None,
+                "west": row.west,
+                "south": row.south,
+                "east": row.east,
+                "north": row.north,
+            }
+            for row in rows
+        ],
+        "complex_ids": sorted(complex_id for row in rows for complex_id in row.ids),
+    }
+
+
 # POST Residential Complex
 def create_residential_complex(
     db: Session, residential_complex: ResidentialComplexCreate
@@ -181,3 +573,77 @@ def delete_residential_complex(db: Session, residential_id: int):
     db.delete(db_complex)
     db.commit()
     return True
+
+
+# Async reads
+async def get_residential_complexes_filtered_async(db: AsyncSession, **kwargs):
+    """get_residential_complexes_filtered on the async session, same arguments."""
+    return await db.run_sync(get_residential_complexes_filtered, **kwargs)
+
+
+async def search_residential_complexes_async(db: AsyncSession, **kwargs):
+    """search_residential_complexes on the async session, same arguments."""
+    return await db.run_sync(search_residential_complexes, **kwargs)
+
+
+async def get_complexes_in_bbox_async(db: AsyncSession, **kwargs):
+    return await db.run_sync(get_complexes_in_bbox, **kwargs)
+
+
+async def get_complexes_within_radius_async(db: AsyncSession, **kwargs):
+    return await db.run_sync(get_complexes_within_radius, **kwargs)
+
+
+async def get_complex_clusters_async(db: AsyncSession, **kwargs):
+    return await db.run_sync(get_complex_clusters, **kwargs)
+
+
+async def get_tile_clusters_async(db: AsyncSession, z: int, x: int, y: int):
+    """A clustered tile, served from tile_cache.
+
+    Tagged with every complex in it, so a change to one of them (or its
+    stats) drops the tile; "tiles" drops all, e.g. when a complex moves.
+    """
+
+    async def load():
+        async with primary_async_session(db) as primary:
+            tile = await primary.run_sync(get_tile_clusters, z=z, x=x, y=y)
+        return ComplexTile.model_validate(tile).model_dump(mode="json") | {
+            "complex_ids": tile["complex_ids"]
+        }
+
+    return await tile_cache.get_or_load_async(
+        f"{z}/{x}/{y}",
+        load,
+        tags=lambda tile: [
+            "tiles",
+            *(f"complex:{complex_id}" for complex_id in tile["complex_ids"]),
+        ],
+    )
+
+
+async def get_residential_complex_by_id_async(db: AsyncSession, rdc_id: int):
+    """Complex details as a response dict, served from complex_cache."""
+
+    async def load():
+        async with primary_async_session(db) as primary:
+            result = await primary.execute(
+                select(ResidentialComplex).where(ResidentialComplex.id == rdc_id)
+            )
+            residential_complex = result.scalars().first()
+            if residential_complex is None:
+                return None
+            return ResidentialComplexResponse.model_validate(
+                residential_complex, from_attributes=True
+            ).model_dump(mode="json")
+
+    return await complex_cache.get_or_load_async(
+        rdc_id, load, tags=[f"complex:{rdc_id}"]
+    )
+
+
+async def get_residential_complex_by_name_async(db: AsyncSession, name: str):
+    result = await db.execute(
+        select(ResidentialComplex).where(ResidentialComplex.name == name)
+    )
+    return result.scalars().first()
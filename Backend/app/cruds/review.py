@@ -1,8 +1,10 @@
 from typing import Optional
 
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Query, Session
 
+from app.cruds.pagination import CountMode, apply_keyset_sorting, count_total, paginate
 from app.models import Review
 from app.schemas import ReviewCreate, ReviewUpdate
 
@@ -32,13 +34,7 @@ def _apply_review_sorting(
     order_by: str = "desc",
     sort_by: str = "created_at",
 ) -> Query:
-    if hasattr(query, sort_by):
-        sort_column = getattr(Review, sort_by)
-        query = query.order_by(
-            sort_column.desc() if order_by == "desc" else sort_column.asc()
-        )
-
-    return query
+    return apply_keyset_sorting(query, Review, sort_by=sort_by, order=order_by)
 
 
 def get_review_filtered(
@@ -51,16 +47,18 @@ def get_review_filtered(
     sort_by: str = "created_at",
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.exact,
 ):
     query = db.query(Review)
 
-    query = _apply_review_filters(
-        query,
+    filters = dict(
         residential_complex_id=residential_complex_id,
         user_id=user_id,
         min_rating=min_rating,
         max_rating=max_rating,
     )
+    query = _apply_review_filters(query, **filters)
 
     query = _apply_review_sorting(
         query,
@@ -68,14 +66,17 @@ def get_review_filtered(
         sort_by=sort_by,
     )
 
-    total = query.count()
-    results = query.offset(offset).limit(limit).all()
+    total = count_total(query, count_mode, namespace="review", filters=filters)
+    results, next_cursor = paginate(
+        query, Review, sort_by, order_by, limit, offset=offset, cursor=cursor
+    )
 
     return {
         "total": total,
         "results": results,
         "limit": limit,
         "offset": offset,
+        "next_cursor": next_cursor,
     }
 
 
@@ -158,3 +159,23 @@ def delete_review(db: Session, review_id: int):
     db.delete(existing_review)
     db.commit()
     return True
+
+
+# Async reads
+async def get_review_filtered_async(db: AsyncSession, **kwargs):
+    """get_review_filtered on the async session, same arguments."""
+    return await db.run_sync(get_review_filtered, **kwargs)
+
+
+async def get_review_by_id_async(db: AsyncSession, review_id: int):
+    result = await db.execute(select(Review).where(Review.id == review_id))
+    return result.scalars().first()
+
+
+async def get_average_rating_async(db: AsyncSession, residential_complex_id: int):
+    result = await db.scalar(
+        select(func.avg(Review.rating)).where(
+            Review.residential_complex_id == residential_complex_id
+        )
+    )
+    return float(result) if result else 0
@@ -63,7 +63,8 @@ def make_me_reach(db: Session, user_id: int):
     if not db_wallet:
         return None
 
-    db_wallet.balance += Decimal("90000000000.0")
+    # Added in SQL, so a concurrent ledger write is not overwritten
+    db_wallet.balance = UserWallet.balance + Decimal("90000000000.0")
 
     db.commit()
     db.refresh(db_wallet)
@@ -1,6 +1,8 @@
 from datetime import datetime
-from typing import Optional
+from decimal import Decimal
+from typing import Optional, Tuple
 
+from sqlalchemy import cast, insert, literal, select, update
 from sqlalchemy.dialects.mysql import DECIMAL
 from sqlalchemy.orm import Session
 
@@ -28,93 +30,198 @@ def get_transaction_by_wallet(
     if transaction_type:
         query = query.filter(
             WalletTransaction.transaction_type == transaction_type
-        ).all()
-
-    query = query.order_by(WalletTransaction.created_at.desc())
+        )
 
     total = query.count()
-    res = query.offset(offset).limit(limit).all()
+    res = (
+        query.order_by(WalletTransaction.created_at.desc(), WalletTransaction.id.desc())
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
 
-    return {"total": total, "result": res, "limit": limit, "offset": offset}
+    return {"total": total, "results": res, "limit": limit, "offset": offset}
 
 
-def create_transaction(
-    db: Session,
-    wallet_id: int,
-    transaction_type: TransactionType,
-    amount: DECIMAL,
-    description: str,
-    order_id: Optional[int] = None,
-) -> WalletTransaction:
-    wallet: UserWallet = get_wallet_by_id(db, wallet_id)
+CREDIT_TYPES = {
+    TransactionType.deposit,
+    TransactionType.refund,
+    TransactionType.bonus,
+    TransactionType.transfer_in,
+}
 
-    if wallet is None:
-        raise ValueError("Wallet not found")
+DEBIT_TYPES = {
+    TransactionType.withdrawal,
+    TransactionType.penalty,
+    TransactionType.transfer_out,
+    TransactionType.purchase,
+}
 
-    if not wallet.isActive:
-        raise ValueError("Wallet is not active")
-
-    balance_before = wallet.balance
-
-    if transaction_type in [
-        TransactionType.deposit,
-        TransactionType.refund,
-        TransactionType.bonus,
-        TransactionType.transfer_in,
-    ]:
-        balance_after = wallet.balance + amount
-        description = f"You make transaction to {amount} tenge"
-
-    elif transaction_type in [
-        TransactionType.withdrawal,
-        TransactionType.penalty,
-        TransactionType.transfer_out,
-        TransactionType.purchase,
-    ]:
-        balance_after = wallet.balance - amount
-
-        if balance_after < 0:
-            raise ValueError(
-                f"Not enough balance to finish Transaction. Now your balance is {balance_before}. Required: {amount}"
-            )
-        description = f"You make transaction to {amount} tenge"
 
-    elif transaction_type == TransactionType.loyalty_earned:
-        wallet.loyalty_points += amount
-        balance_after = balance_before
-        description = f"You earn {amount} tenge loyalty points"
+def _deltas(transaction_type: TransactionType, amount: Decimal) -> Tuple[Decimal, Decimal]:
+    """(balance delta, loyalty points delta) of a transaction."""
+    if transaction_type in CREDIT_TYPES:
+        return amount, Decimal(0)
+    if transaction_type in DEBIT_TYPES:
+        return -amount, Decimal(0)
+    if transaction_type == TransactionType.loyalty_earned:
+        return Decimal(0), amount
+    if transaction_type == TransactionType.loyalty_spent:
+        return Decimal(0), -amount
+    return Decimal(0), Decimal(0)
+
+
+def _default_description(transaction_type: TransactionType, amount: Decimal) -> str:
+    if transaction_type == TransactionType.loyalty_earned:
+        return f"You earn {amount} tenge loyalty points"
+    if transaction_type == TransactionType.loyalty_spent:
+        return f"You spent {amount} tenge loyalty points"
+    return f"You make transaction to {amount} tenge"
 
-    elif transaction_type == TransactionType.loyalty_spent:
-        if wallet.loyalty_points < amount:
-            raise ValueError(
-                f"Not enough loyalty points to finish Transaction. Now your loyalty points is {wallet.loyalty_points}. Required: {amount}"
-            )
 
-        wallet.loyalty_points -= amount
-        description = f"You spent {amount} tenge loyalty points"
-        balance_after = balance_before
+def _rejection(db: Session, wallet_id: int, balance_delta: Decimal, points_delta: Decimal) -> str:
+    """Why the conditional wallet UPDATE matched nothing."""
+    wallet = get_wallet_by_id(db, wallet_id)
+    if wallet is None:
+        return "Wallet not found"
+    if not wallet.isActive:
+        return "Wallet is not active"
+    if wallet.balance + balance_delta < 0:
+        return (
+            f"Not enough balance to finish Transaction. Now your balance is "
+            f"{wallet.balance}. Required: {-balance_delta}"
+        )
+    return (
+        f"Not enough loyalty points to finish Transaction. Now your loyalty points is "
+        f"{wallet.loyalty_points}. Required: {-points_delta}"
+    )
 
-    else:
-        balance_after = balance_before
 
-    new_transaction = WalletTransaction(
+def _post(
+    db: Session,
+    wallet_id: int,
+    transaction_type: TransactionType,
+    amount: Decimal,
+    description: Optional[str] = None,
+    order_id: Optional[int] = None,
+) -> WalletTransaction:
+    """Move the wallet and record the transaction, without committing.
+
+    The balance is changed by one conditional UPDATE that also checks the
+    wallet is active and stays non-negative, so concurrent writers never
+    lose an update and never read the balance into Python. On Postgres the
+    WalletTransaction INSERT is part of the same statement (a data-modifying
+    CTE); elsewhere it follows in the same transaction.
+    """
+    if amount is None or amount <= 0:
+        raise ValueError("Amount must be positive")
+
+    balance_delta, points_delta = _deltas(transaction_type, amount)
+    now = datetime.now()
+
+    moved = (
+        update(UserWallet)
+        .where(
+            UserWallet.id == wallet_id,
+            UserWallet.isActive.is_(True),
+            UserWallet.balance + balance_delta >= 0,
+            UserWallet.loyalty_points + points_delta >= 0,
+        )
+        .values(
+            balance=UserWallet.balance + balance_delta,
+            loyalty_points=UserWallet.loyalty_points + points_delta,
+            updated_at=now,
+        )
+        .returning(UserWallet.id, UserWallet.balance)
+    )
+    values = {
+        "transaction_type": transaction_type,
+        "amount": amount,
+        "description": description or _default_description(transaction_type, amount),
+        "order_id": order_id,
+        "created_at": now,
+    }
+
+    if db.get_bind().dialect.name == "postgresql":
+        moved = moved.cte("moved")
+        columns = WalletTransaction.__table__.c
+        transaction = db.scalars(
+            insert(WalletTransaction)
+            .from_select(
+                ["wallet_id", "balance_before", "balance_after", *values],
+                select(
+                    moved.c.id,
+                    moved.c.balance - balance_delta,
+                    moved.c.balance,
+                    *(cast(literal(value, columns[name].type), columns[name].type) for name, value in values.items()),
+                ),
+            )
+            .returning(WalletTransaction)
+        ).first()
+        if transaction is None:
+            raise ValueError(_rejection(db, wallet_id, balance_delta, points_delta))
+        return transaction
+
+    row = db.execute(moved).first()
+    if row is None:
+        raise ValueError(_rejection(db, wallet_id, balance_delta, points_delta))
+    transaction = WalletTransaction(
         wallet_id=wallet_id,
-        transaction_type=transaction_type,
-        amount=amount,
-        balance_before=balance_before,
-        balance_after=balance_after,
-        description=description,
-        order_id=order_id,
-        created_at=datetime.now(),
+        balance_before=row.balance - balance_delta,
+        balance_after=row.balance,
+        **values,
     )
+    db.add(transaction)
+    db.flush()
+    return transaction
 
-    wallet.balance = balance_after
-    wallet.updated_at = datetime.now()
 
-    db.add(new_transaction)
-    db.commit()
-    db.refresh(new_transaction)
-    return new_transaction
+def create_transaction(
+    db: Session,
+    wallet_id: int,
+    transaction_type: TransactionType,
+    amount: DECIMAL,
+    description: str,
+    order_id: Optional[int] = None,
+) -> WalletTransaction:
+    try:
+        transaction = _post(db, wallet_id, transaction_type, amount, description, order_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return transaction
+
+
+def transfer(
+    db: Session,
+    from_wallet_id: int,
+    to_wallet_id: int,
+    amount: Decimal,
+    description: Optional[str] = None,
+) -> Tuple[WalletTransaction, WalletTransaction]:
+    """Move amount between two wallets in one transaction.
+
+    Both wallets are locked in id order first, so two opposite transfers
+    between the same wallets queue up instead of deadlocking.
+    """
+    if from_wallet_id == to_wallet_id:
+        raise ValueError("Can not transfer to the same wallet")
+
+    try:
+        db.execute(
+            select(UserWallet.id)
+            .where(UserWallet.id.in_([from_wallet_id, to_wallet_id]))
+            .order_by(UserWallet.id)
+            .with_for_update()
+        ).all()
+        outgoing = _post(db, from_wallet_id, TransactionType.transfer_out, amount, description)
+        incoming = _post(db, to_wallet_id, TransactionType.transfer_in, amount, description)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return outgoing, incoming
 
 
 def get_wallet_balance(db: Session, wallet_id):
@@ -126,5 +233,5 @@ def get_wallet_balance(db: Session, wallet_id):
         "wallet_id": wallet_id,
         "balance": wallet.balance,
         "loyalty_points": wallet.loyalty_points,
-        "is_active": wallet.is_active,
+        "is_active": wallet.isActive,
     }
@@ -1,15 +1,124 @@
+from contextlib import asynccontextmanager, contextmanager
+from decimal import Decimal
 from typing import Annotated
 
-from fastapi import Depends
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
-from .config import DATABASE_URL
+from .config import (
+    ASYNC_DATABASE_URL,
+    ASYNC_REPLICA_DATABASE_URL,
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_TIMEOUT_MS,
+    REPLICA_DATABASE_URL,
+)
+from .read_routing import wants_primary
+from .pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument
 
-engine = create_engine(DATABASE_URL)
+
+POOL_OPTIONS = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
+
+
+def _connect_args(url: str) -> dict:
+    if DB_STATEMENT_TIMEOUT_MS <= 0:
+        return {}
+    if url.startswith("postgresql+asyncpg"):
+        return {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+    if url.startswith("postgresql"):
+        return {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return {}
+
+
+def _decode_numeric_as_text(dbapi_connection, connection_record):
+    # asyncpg decodes binary NUMERIC into exponent form (Decimal("4E+4"),
+    # rendered as "4E+4" in responses); the text form decodes like psycopg2.
+    dbapi_connection.run_async(
+        lambda connection: connection.set_type_codec(
+            "numeric",
+            encoder=str,
+            decoder=Decimal,
+            schema="pg_catalog",
+            format="text",
+        )
+    )
+
+
+def _create_async_engine(url: str):
+    async_engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        connect_args=_connect_args(url),
+        **POOL_OPTIONS,
+    )
+    if url.startswith("postgresql+asyncpg"):
+        event.listen(async_engine.sync_engine, "connect", _decode_numeric_as_text)
+    return async_engine
+
+
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    connect_args=_connect_args(DATABASE_URL),
+    **POOL_OPTIONS,
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read endpoints run on the event loop through asyncpg instead of taking a
+# threadpool worker per request; scripts and write paths keep SessionLocal.
+async_engine = _create_async_engine(ASYNC_DATABASE_URL)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+# Catalog reads go to the replica; without one configured the primary
+# engines are reused instead of opening a second set of pools.
+if REPLICA_DATABASE_URL == DATABASE_URL:
+    replica_engine = engine
+else:
+    replica_engine = create_engine(
+        REPLICA_DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        connect_args=_connect_args(REPLICA_DATABASE_URL),
+        **POOL_OPTIONS,
+    )
+
+if ASYNC_REPLICA_DATABASE_URL == ASYNC_DATABASE_URL:
+    async_replica_engine = async_engine
+else:
+    async_replica_engine = _create_async_engine(ASYNC_REPLICA_DATABASE_URL)
+
+ReplicaSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=replica_engine
+)
+
+AsyncReplicaSessionLocal = async_sessionmaker(
+    bind=async_replica_engine, autoflush=False, expire_on_commit=False
+)
+
+# Every engine of this process, reported by GET /api/internal/pool
+engines = {"primary": engine, "primary_async": async_engine}
+if replica_engine is not engine:
+    engines["replica"] = replica_engine
+if async_replica_engine is not async_engine:
+    engines["replica_async"] = async_replica_engine
+for name, pooled_engine in engines.items():
+    instrument(pooled_engine, name)
+
 Base = declarative_base()
 
 
@@ -19,3 +128,53 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Read-only catalog endpoints: replica, or the primary right after the client wrote
+def get_read_db(request: Request):
+    db = SessionLocal() if wants_primary(request) else ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    session_factory = (
+        AsyncSessionLocal if wants_primary(request) else AsyncReplicaSessionLocal
+    )
+    async with session_factory() as db:
+        yield db
+
+
+@contextmanager
+def primary_session(db: Session):
+    """db when it is on the primary, else a short-lived primary session.
+
+    Application cache entries are loaded through it: a value read on a
+    lagging replica right after a write would refill the entry the write
+    just invalidated, and serve it to everyone for the whole TTL.
+    """
+    if db.get_bind() is engine:
+        yield db
+        return
+    primary = SessionLocal()
+    try:
+        yield primary
+    finally:
+        primary.close()
+
+
+@asynccontextmanager
+async def primary_async_session(db: AsyncSession):
+    """primary_session() for the async engines."""
+    if db.bind is async_engine:
+        yield db
+        return
+    async with AsyncSessionLocal() as primary:
+        yield primary
@@ -0,0 +1,193 @@
+import logging
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from .models import Building, ObjectType, ResidentialComplex
+
+logger = logging.getLogger(__name__)
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+_PENDING_KEY = "pending_entity_changes"
+_COMMITTED_KEY = "committed_entity_changes"
+
+
+@dataclass(frozen=True)
+class EntityChange:
+    """One committed row change.
+
+    entity is the table name. complex_id/building_id name the parents the row
+    belongs to, so subscribers can drop exactly the affected entries; images
+    also carry the object they are attached to.
+    """
+
+    entity: str
+    id: Optional[int]
+    action: str
+    complex_id: Optional[int] = None
+    building_id: Optional[int] = None
+    object_type: Optional[ObjectType] = None
+    object_id: Optional[int] = None
+
+
+Subscriber = Callable[[List[EntityChange]], None]
+
+_subscribers: List[Subscriber] = []
+
+
+def subscribe(subscriber: Subscriber) -> Subscriber:
+    """Register a callable receiving the changes of each committed transaction."""
+    _subscribers.append(subscriber)
+    return subscriber
+
+
+def publish(changes: List[EntityChange]):
+    for subscriber in list(_subscribers):
+        try:
+            subscriber(changes)
+        except Exception:
+            # The transaction is already committed; a failing subscriber must
+            # not turn a successful request into an error.
+            logger.exception("Mutation subscriber %r failed", subscriber)
+
+
+def record_change(session: Session, change: EntityChange):
+    """Queue a change the flush cannot see (bulk UPDATE/DELETE, raw SQL).
+
+    It is published together with the flushed changes after commit.
+    """
+    session.info.setdefault(_PENDING_KEY, []).extend(
+        _resolve_complexes(session, [change])
+    )
+
+
+def _values(state, name: str) -> List[int]:
+    """Current and, for an update that moved the row, previous values of a column."""
+    if name not in state.mapper.columns:
+        return []
+
+    history = state.attrs[name].history
+    values = list(history.added) + list(history.unchanged) + list(history.deleted)
+    if not values:
+        values = [state.attrs[name].value]
+    return list(dict.fromkeys(value for value in values if value is not None))
+
+
+def _changes_for(state, action: str) -> List[EntityChange]:
+    obj = state.obj()
+    object_type = getattr(obj, "object_type", None)
+    object_id = getattr(obj, "object_id", None)
+
+    if isinstance(obj, ResidentialComplex):
+        parents = [(obj.id, None)]
+    elif isinstance(obj, Building):
+        complex_ids = _values(state, "residential_complex_id") or [None]
+        parents = [(complex_id, obj.id) for complex_id in complex_ids]
+    else:
+        complex_ids = _values(state, "residential_complex_id")
+        building_ids = _values(state, "building_id")
+        if object_type == ObjectType.residential_complex:
+            complex_ids.append(object_id)
+        elif object_type == ObjectType.building:
+            building_ids.append(object_id)
+        parents = [(complex_id, None) for complex_id in complex_ids]
+        parents += [(None, building_id) for building_id in building_ids]
+
+    return [
+        EntityChange(
+            entity=state.mapper.local_table.name,
+            id=getattr(obj, "id", None),
+            action=action,
+            complex_id=complex_id,
+            building_id=building_id,
+            object_type=object_type,
+            object_id=object_id,
+        )
+        for complex_id, building_id in parents or [(None, None)]
+    ]
+
+
+def _resolve_complexes(session: Session, changes: List[EntityChange]):
+    """Fill complex_id for changes that only know their building."""
+    building_ids = {
+        change.building_id
+        for change in changes
+        if change.complex_id is None and change.building_id is not None
+    }
+    if not building_ids:
+        return changes
+
+    rows = session.connection().execute(
+        select(Building.id, Building.residential_complex_id).where(
+            Building.id.in_(building_ids)
+        )
+    )
+    complex_by_building = dict(rows.all())
+
+    return [
+        EntityChange(
+            entity=change.entity,
+            id=change.id,
+            action=change.action,
+            complex_id=complex_by_building.get(change.building_id),
+            building_id=change.building_id,
+            object_type=change.object_type,
+            object_id=change.object_id,
+        )
+        if change.complex_id is None and change.building_id is not None
+        else change
+        for change in changes
+    ]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_changes(session: Session, flush_context):
+    changes = []
+    for obj in session.new:
+        changes += _changes_for(inspect(obj), CREATED)
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            changes += _changes_for(inspect(obj), UPDATED)
+    for obj in session.deleted:
+        changes += _changes_for(inspect(obj), DELETED)
+
+    if changes:
+        session.info.setdefault(_PENDING_KEY, []).extend(
+            _resolve_complexes(session, changes)
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_committed_changes(session: Session):
+    if session.in_nested_transaction():
+        # A released savepoint; the outer transaction may still roll back
+        return
+    changes = session.info.pop(_PENDING_KEY, None)
+    if changes:
+        session.info.setdefault(_COMMITTED_KEY, []).extend(changes)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _publish_committed_changes(session: Session, transaction):
+    # after_commit still holds the connection; subscribers opening their own
+    # session would need a second one per request and can drain the pool
+    if transaction.parent is not None:
+        return
+    changes = session.info.pop(_COMMITTED_KEY, None)
+    if changes:
+        publish(list(dict.fromkeys(changes)))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_changes(session: Session):
+    if session.in_nested_transaction():
+        # A rolled back savepoint; the pending changes of the outer
+        # transaction are mixed in, so keep them all. Publishing a change
+        # that did not happen only costs a spurious refresh
+        return
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,59 @@
+import hashlib
+from typing import Callable, Type
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+
+def _etag(body: bytes) -> str:
+    return 'W/"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or _opaque(etag) in {_opaque(tag) for tag in tags}
+
+
+def cached_route(max_age: int) -> Type[APIRoute]:
+    """Route class adding ETag and Cache-Control to successful GET responses.
+
+    The ETag is a hash of the response body, so it changes with any change in
+    the rows behind it; a request whose If-None-Match still matches gets an
+    empty 304. max_age is how long clients may reuse a response without
+    revalidating and should follow how often the resource changes.
+    """
+    cache_control = f"public, max-age={max_age}"
+
+    class CachedRoute(APIRoute):
+        def get_route_handler(self) -> Callable:
+            handler = super().get_route_handler()
+
+            async def cached_handler(request: Request) -> Response:
+                response = await handler(request)
+
+                body = getattr(response, "body", None)
+                if (
+                    request.method != "GET"
+                    or response.status_code != 200
+                    or body is None
+                ):
+                    return response
+
+                etag = _etag(body)
+                headers = {"ETag": etag, "Cache-Control": cache_control}
+
+                if_none_match = request.headers.get("if-none-match")
+                if if_none_match and _matches(if_none_match, etag):
+                    return Response(status_code=304, headers=headers)
+
+                response.headers.update(headers)
+                return response
+
+            return cached_handler
+
+    return CachedRoute
@@ -0,0 +1,41 @@
+from typing import List
+
+from .cache import app_cache
+from .cruds.image import image_tag
+from .cruds.pagination import count_cache
+from .events import EntityChange, subscribe
+from .services.promotion_index import active_promotion_index
+
+
+@subscribe
+def invalidate_on_commit(changes: List[EntityChange]):
+    """Drop exactly the cached data a committed transaction made stale."""
+    tags = set()
+    entities = set()
+
+    for change in changes:
+        entities.add(change.entity)
+
+        if change.entity == "residential_complex":
+            tags.add(f"complex:{change.id}")
+            # A new or moved complex lands in tiles it was not tagged on
+            tags.add("tiles")
+        elif change.entity == "residential_complex_stats":
+            # Cached complex details embed their stats
+            tags.add(f"complex:{change.complex_id}")
+        elif change.entity == "building":
+            tags.add(f"building:{change.id}")
+        elif change.entity == "infrastructure" and change.complex_id is not None:
+            tags.add(f"infrastructure:complex:{change.complex_id}")
+        elif change.entity == "image" and change.object_type is not None:
+            tags.add(image_tag(change.object_type, change.object_id))
+
+    if tags:
+        app_cache.invalidate_tags(*tags)
+
+    # Filtered list totals are cached per table (see count_total)
+    for entity in entities:
+        count_cache.clear(entity)
+
+    if "promotions" in entities:
+        active_promotion_index.invalidate()
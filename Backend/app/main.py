@@ -1,10 +1,18 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.concurrency import run_in_threadpool
 
-from . import config
+from . import config, invalidation  # noqa: F401 (registers mutation subscribers)
+from .read_routing import ReadYourWritesMiddleware
+from .services import complex_stats  # noqa: F401 (registers mutation subscribers)
+from .services.autocomplete import complex_autocomplete
+from .services.booking_scheduler import booking_expiry_scheduler
+from .services.booking_sweeper import booking_sweeper
 from .routers import (
     ai_assistant,
     apartment,
@@ -14,6 +22,7 @@ from .routers import (
     favorites,
     image,
     infrastructure,
+    internal,
     order,
     panorama,
     promotion,
@@ -23,7 +32,19 @@ from .routers import (
     wallet,
 )
 
-app = FastAPI (title = "Baspana Group Backend API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fill in-memory indexes before the first request
+    await run_in_threadpool(complex_autocomplete.warm_up)
+    await run_in_threadpool(booking_expiry_scheduler.warm_up)
+    booking_sweeper.start()
+    yield
+    await run_in_threadpool(booking_sweeper.stop)
+    await run_in_threadpool(booking_expiry_scheduler.stop)
+
+
+app = FastAPI (title = "Baspana Group Backend API", lifespan = lifespan)
 
 
 @app.exception_handler(RequestValidationError)
@@ -46,6 +67,8 @@ class EmptyStringToNoneMiddleware(BaseHTTPMiddleware):
 
 app.add_middleware(EmptyStringToNoneMiddleware)
 
+app.add_middleware(ReadYourWritesMiddleware)
+
 app.add_middleware (
 	CORSMiddleware,
 	allow_origins = [
@@ -77,6 +100,7 @@ app.include_router (wallet.router, prefix = "/api/wallet", tags = ["Wallet"])
 app.include_router (promotion.router, prefix = "/api/promotions", tags = ["Promotions"])
 app.include_router (panorama.router, prefix = "/api/panoramas", tags = ["Panoramas"])
 app.include_router (ai_assistant.router, prefix = "/api", tags = ["AI Assistant"])
+app.include_router (internal.router, prefix = "/api/internal", tags = ["Internal"])
 
 
 @app.get ("/")
@@ -8,11 +8,18 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    JSON,
     String,
     Enum as SqlEnum,
+    Float,
+    cast,
     func,
+    literal_column,
+    text,
 )
+from sqlalchemy.dialects import postgresql  # noqa: F401 (registers the to_tsvector family)
 from sqlalchemy.orm import Session, relationship
 
 from .database import Base
@@ -207,6 +214,13 @@ class ResidentialComplex(Base):
     infrastructures = relationship("Infrastructure", back_populates="residential_complex")
     promotions = relationship("Promotion", back_populates="residential_complex")
     panoramas = relationship("Panorama", back_populates="residential_complex")
+    stats = relationship(
+        "ResidentialComplexStats",
+        back_populates="residential_complex",
+        uselist=False,
+        lazy="selectin",
+        cascade="all, delete-orphan",
+    )
 
     @property
     def images(self):
@@ -221,8 +235,90 @@ class ResidentialComplex(Base):
         )
 
 
+def _weighted_tsvector(column, config: str, weight: str):
+    # Inline literals rather than bind parameters: with server-side
+    # parameters the expression would no longer match the index definition.
+    return func.setweight(
+        func.to_tsvector(
+            literal_column(f"'{config}'::regconfig"),
+            func.coalesce(column, literal_column("''")),
+        ),
+        literal_column(f"'{weight}'"),
+    )
+
+
+# Full-text document of a complex: the name ranks above the descriptions.
+# Postgres ships no Kazakh configuration, so name and kz text use 'simple'.
+residential_complex_search_document = (
+    _weighted_tsvector(ResidentialComplex.name, "simple", "A")
+    .op("||")(_weighted_tsvector(ResidentialComplex.ru_description, "russian", "B"))
+    .op("||")(_weighted_tsvector(ResidentialComplex.en_description, "english", "B"))
+    .op("||")(_weighted_tsvector(ResidentialComplex.kz_description, "simple", "B"))
+)
+
+Index(
+    "ix_residential_complex_search",
+    residential_complex_search_document,
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
+
+
+# Location as a geometric point (x = longitude, y = latitude). A GiST index
+# on it serves bounding-box lookups (point <@ box) without PostGIS.
+residential_complex_location = func.point(
+    cast(ResidentialComplex.longitude, Float),
+    cast(ResidentialComplex.latitude, Float),
+)
+
+Index(
+    "ix_residential_complex_location",
+    residential_complex_location,
+    postgresql_using="gist",
+).ddl_if(dialect="postgresql")
+
+
+class ResidentialComplexStats(Base):
+    """Aggregates of a complex's units and reviews, kept by services.complex_stats.
+
+    Prices, areas and status counts cover apartments and commercial units;
+    type counts cover apartments only.
+    """
+
+    __tablename__ = "residential_complex_stats"
+
+    residential_complex_id = Column(
+        Integer,
+        ForeignKey("residential_complex.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    min_price = Column(DECIMAL)
+    max_price = Column(DECIMAL)
+    min_area = Column(DECIMAL)
+    max_area = Column(DECIMAL)
+    free_count = Column(Integer, nullable=False, default=0)
+    booked_count = Column(Integer, nullable=False, default=0)
+    sold_count = Column(Integer, nullable=False, default=0)
+    studio_count = Column(Integer, nullable=False, default=0)
+    one_bedroom_count = Column(Integer, nullable=False, default=0)
+    two_bedroom_count = Column(Integer, nullable=False, default=0)
+    three_bedroom_count = Column(Integer, nullable=False, default=0)
+    penthouse_count = Column(Integer, nullable=False, default=0)
+    avg_rating = Column(DECIMAL(3, 2))
+    review_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    residential_complex = relationship("ResidentialComplex", back_populates="stats")
+
+
 class Building(Base):
     __tablename__ = "building"
+    __table_args__ = (
+        Index(
+            "ix_building_residential_complex_id_status",
+            "residential_complex_id",
+            "status",
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     residential_complex_id = Column(Integer, ForeignKey("residential_complex.id"))
@@ -262,6 +358,20 @@ class Building(Base):
 
 class Apartment(Base):
     __tablename__ = "apartment"
+    __table_args__ = (
+        Index(
+            "ix_apartment_building_id_status_total_price",
+            "building_id",
+            "status",
+            "total_price",
+        ),
+        Index(
+            "ix_apartment_free_building_id_total_price",
+            "building_id",
+            "total_price",
+            postgresql_where=text("status = 'free'"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     building_id = Column(Integer, ForeignKey("building.id"))
@@ -304,6 +414,14 @@ class Apartment(Base):
 
 class CommercialUnit(Base):
     __tablename__ = "commercial_unit"
+    __table_args__ = (
+        Index(
+            "ix_commercial_unit_building_id_status_total_price",
+            "building_id",
+            "status",
+            "total_price",
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     building_id = Column(Integer, ForeignKey("building.id"))
@@ -341,6 +459,13 @@ class CommercialUnit(Base):
 
 class Review(Base):
     __tablename__ = "review"
+    __table_args__ = (
+        Index(
+            "ix_review_residential_complex_id_created_at",
+            "residential_complex_id",
+            "created_at",
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     residential_complex_id = Column(Integer, ForeignKey("residential_complex.id"))
@@ -357,6 +482,9 @@ class Review(Base):
 
 class Image(Base):
     __tablename__ = "image"
+    __table_args__ = (
+        Index("ix_image_object_type_object_id", "object_type", "object_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     object_id = Column(Integer)
@@ -393,6 +521,17 @@ class Image(Base):
 
 class Order(Base):
     __tablename__ = "order"
+    __table_args__ = (
+        Index("ix_order_user_id_status", "user_id", "status"),
+        Index("ix_order_booking_expiration_date", "booking_expiration_date"),
+        # Open bookings only: the expiry sweep stays fast as order history grows
+        Index(
+            "ix_order_open_booking_expiration_date",
+            "booking_expiration_date",
+            "id",
+            postgresql_where=text("status IN ('pending', 'offering')"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -412,6 +551,9 @@ class Order(Base):
 
 class Favorites(Base):
     __tablename__ = "favorites"
+    __table_args__ = (
+        Index("ix_favorites_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -454,6 +596,31 @@ class WalletTransaction(Base):
     order = relationship("Order", back_populates="wallet_transactions")
 
 
+class IdempotencyKey(Base):
+    """Outcome of a request sent with an Idempotency-Key header.
+
+    completed is False while the first request runs; expires_at is then the
+    end of its lock, which that request keeps extending, afterwards the end
+    of the replay window. token identifies the request holding the key.
+    """
+
+    __tablename__ = "idempotency_key"
+    __table_args__ = (
+        Index("ix_idempotency_key_user_id_key", "user_id", "key", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    key = Column(String(255), nullable=False)
+    fingerprint = Column(String(64), nullable=False)
+    token = Column(String(32))
+    completed = Column(Boolean, nullable=False, default=False)
+    response_status = Column(Integer)
+    response_body = Column(JSON)
+    created_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+
 class InfrastructureCategory(str, Enum):
     education = "Education"  # Образование
     shopping = "Shopping"  # Покупки и развлечения
@@ -483,6 +650,14 @@ class Infrastructure(Base):
 
 class Promotion(Base):
     __tablename__ = "promotions"
+    __table_args__ = (
+        Index(
+            "ix_promotions_complex_id_apartment_type_is_active",
+            "residential_complex_id",
+            "apartment_type",
+            "is_active",
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String, nullable=False)
@@ -0,0 +1,100 @@
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Checkout wait times and failures of one connection pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._checkouts = 0
+            self._wait_total = 0.0
+            self._wait_max = 0.0
+            self._timeouts = 0
+            self._failures = 0
+
+    def record_checkout(self, waited: float):
+        with self._lock:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+    def record_failure(self, timed_out: bool):
+        with self._lock:
+            if timed_out:
+                self._timeouts += 1
+            else:
+                self._failures += 1
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            checkouts = self._checkouts
+            wait_total = self._wait_total
+            wait_max = self._wait_max
+            timeouts = self._timeouts
+            failures = self._failures
+
+        return {
+            "name": self.name,
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "checkouts": checkouts,
+            "avg_wait_ms": round(wait_total / checkouts * 1000, 3) if checkouts else 0,
+            "max_wait_ms": round(wait_max * 1000, 3),
+            "checkout_timeouts": timeouts,
+            "checkout_failures": failures,
+        }
+
+
+class _InstrumentedPoolMixin:
+    metrics: PoolMetrics = None
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_failure(timed_out=True)
+            raise
+        except Exception:
+            self.metrics.record_failure(timed_out=False)
+            raise
+
+        self.metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument(engine, name: str) -> PoolMetrics:
+    """Attach a PoolMetrics to an engine created with an Instrumented*Pool."""
+    metrics = PoolMetrics(name)
+    engine.pool.metrics = metrics
+    return metrics
+
+
+def pool_status(engine) -> dict:
+    pool = engine.pool
+    return pool.metrics.snapshot(pool)
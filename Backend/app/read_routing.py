@@ -0,0 +1,78 @@
+import os
+import time
+from typing import Optional
+
+from fastapi import Request
+from jose import JWTError
+from jose.jwt import decode
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from .cache import MISS, app_cache
+from .config import READ_YOUR_WRITES_MAX_USERS, READ_YOUR_WRITES_SECONDS
+
+PRIMARY_UNTIL_COOKIE = "baspana_primary_until"
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Users who wrote within READ_YOUR_WRITES_SECONDS; shared by the workers
+# with CACHE_BACKEND=redis
+recent_writers = app_cache.namespace(
+    "read_your_writes",
+    ttl_seconds=READ_YOUR_WRITES_SECONDS,
+    max_entries=READ_YOUR_WRITES_MAX_USERS,
+)
+
+
+def _user_id(request: Request) -> Optional[str]:
+    """Subject of the request's bearer token, None when there is no valid one."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = decode(
+            token, os.getenv("SECRET_KEY"), algorithms=[os.getenv("JWT_ALGORITHM")]
+        )
+    except JWTError:
+        return None
+    user_id = payload.get("sub")
+    return None if user_id is None else str(user_id)
+
+
+def wants_primary(request: Request) -> bool:
+    """True while the client is inside the read-your-writes window."""
+    user_id = _user_id(request)
+    if user_id is not None and recent_writers.get(user_id) is not MISS:
+        return True
+    try:
+        return float(request.cookies.get(PRIMARY_UNTIL_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """Pins a client's reads to the primary for a while after it wrote.
+
+    Successful non-GET requests mark their authenticated user as a recent
+    writer for READ_YOUR_WRITES_SECONDS; get_read_db and get_async_read_db
+    route that user's reads to the primary meanwhile, so the client never
+    sees the replica before it has caught up with its own change. The
+    short-lived cookie covers anonymous same-origin browsers; cross-origin
+    and non-browser clients do not send it back.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            user_id = _user_id(request)
+            if user_id is not None:
+                recent_writers.set(user_id, True)
+            response.set_cookie(
+                PRIMARY_UNTIL_COOKIE,
+                str(time.time() + READ_YOUR_WRITES_SECONDS),
+                max_age=READ_YOUR_WRITES_SECONDS,
+                httponly=True,
+                samesite="lax",
+            )
+
+        return response
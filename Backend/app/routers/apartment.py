@@ -1,7 +1,8 @@
 from decimal import Decimal
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.auth import require_role
@@ -9,11 +10,16 @@ from app.cruds.apartment import (
     create_apartment,
     delete_apartment,
     get_apartment_by_id,
+    get_apartment_by_id_async,
+    get_apartment_facets_async,
     get_apartment_by_number,
-    get_apartments_filtered,
+    get_apartments_filtered_async,
+    reprice_apartments,
     update_apartment,
 )
-from app.database import get_db
+from app.cruds.pagination import CountMode
+from app.database import get_async_read_db, get_db
+from app.http_cache import cached_route
 from app.models import (
     ApartmentType,
     Direction,
@@ -24,16 +30,22 @@ from app.models import (
 )
 from app.schemas import (
     ApartmentCreate,
+    ApartmentFacetsResponse,
+    ApartmentRepriceRequest,
+    ApartmentRepriceResponse,
     ApartmentResponse,
     ApartmentUpdate,
+    BulkImportReport,
     PaginatedApartmentResponse,
 )
+from app.services.bulk_import import IMPORT_TARGETS, ImportFormat, import_upload
 
-router = APIRouter()
+# Status and promotion prices change with bookings, keep it short
+router = APIRouter(route_class=cached_route(max_age=15))
 
 
 @router.get("/", response_model=PaginatedApartmentResponse)
-def get_apartments_endpoint(
+async def get_apartments_endpoint(
     building_id: Optional[int] = None,
     min_floor: Optional[int] = None,
     max_floor: Optional[int] = None,
@@ -58,9 +70,11 @@ def get_apartments_endpoint(
     sort_by: str = "floor",
     limit: int = 100,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.exact,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    return get_apartments_filtered(
+    return await get_apartments_filtered_async(
         db=db,
         building_id=building_id,
         min_floor=min_floor,
@@ -86,12 +100,68 @@ def get_apartments_endpoint(
         sort_by=sort_by,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        count_mode=count_mode,
+    )
+
+
+# Declared before /{id} so "facets" is not parsed as an id
+@router.get("/facets", response_model=ApartmentFacetsResponse)
+async def get_apartment_facets_endpoint(
+    building_id: Optional[int] = None,
+    min_floor: Optional[int] = None,
+    max_floor: Optional[int] = None,
+    min_apartment_area: Optional[Decimal] = None,
+    max_apartment_area: Optional[Decimal] = None,
+    apartment_type: Optional[ApartmentType] = None,
+    has_balcony: Optional[bool] = None,
+    bathroom_count: Optional[int] = None,
+    min_kitchen_area: Optional[Decimal] = None,
+    max_kitchen_area: Optional[Decimal] = None,
+    min_ceiling_height: Optional[Decimal] = None,
+    max_ceiling_height: Optional[Decimal] = None,
+    finishing_type: Optional[FinishingType] = None,
+    min_per_sqr: Optional[Decimal] = None,
+    max_per_sqr: Optional[Decimal] = None,
+    min_total_price: Optional[Decimal] = None,
+    max_total_price: Optional[Decimal] = None,
+    status: Optional[PropertyStatus] = None,
+    orientation: Optional[Direction] = None,
+    isCorner: Optional[bool] = None,
+    buckets: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await get_apartment_facets_async(
+        db=db,
+        buckets=buckets,
+        building_id=building_id,
+        min_floor=min_floor,
+        max_floor=max_floor,
+        min_apartment_area=min_apartment_area,
+        max_apartment_area=max_apartment_area,
+        apartment_type=apartment_type,
+        has_balcony=has_balcony,
+        bathroom_count=bathroom_count,
+        min_kitchen_area=min_kitchen_area,
+        max_kitchen_area=max_kitchen_area,
+        min_ceiling_height=min_ceiling_height,
+        max_ceiling_height=max_ceiling_height,
+        finishing_type=finishing_type,
+        min_per_sqr=min_per_sqr,
+        max_per_sqr=max_per_sqr,
+        min_total_price=min_total_price,
+        max_total_price=max_total_price,
+        status=status,
+        orientation=orientation,
+        isCorner=isCorner,
     )
 
 
 @router.get("/{id}", response_model=ApartmentResponse)
-def get_apartment_by_id_endpoint(id: int, db: Session = Depends(get_db)):
-    existing_apartment = get_apartment_by_id(db, id)
+async def get_apartment_by_id_endpoint(
+    id: int, db: AsyncSession = Depends(get_async_read_db)
+):
+    existing_apartment = await get_apartment_by_id_async(db, id)
     if existing_apartment is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Apartment not found"
@@ -116,6 +186,30 @@ def create_apartment_endpoint(
     return create_apartment(db, apartment)
 
 
+# POST Apartments from a CSV / JSON Lines file
+@router.post("/import", response_model=BulkImportReport)
+def import_apartments_endpoint(
+    file: UploadFile = File(...),
+    format: Optional[ImportFormat] = None,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_role([Role.admin, Role.manager])),
+):
+    return import_upload(
+        db, IMPORT_TARGETS["apartments"], file.file, file.filename, format
+    )
+
+
+# POST reprice a building or complex
+@router.post("/reprice", response_model=ApartmentRepriceResponse)
+def reprice_apartments_endpoint(
+    request: ApartmentRepriceRequest,
+    dry_run: bool = False,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_role([Role.admin, Role.manager])),
+):
+    return reprice_apartments(db, request.filter, request.rule, dry_run=dry_run)
+
+
 # PUT Apartmentblackd
 @router.patch("/{id}", response_model=ApartmentResponse)
 def update_apartment_endpoint(
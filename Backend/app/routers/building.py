@@ -2,6 +2,7 @@ from datetime import date
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.auth import require_role
@@ -9,10 +10,13 @@ from app.cruds.building import (
     create_building,
     delete_building,
     get_building_by_id,
-    get_buildings_filtered,
+    get_building_by_id_async,
+    get_buildings_filtered_async,
     update_building,
 )
-from app.database import get_db
+from app.cruds.pagination import CountMode
+from app.database import get_async_read_db, get_db
+from app.http_cache import cached_route
 from app.models import Building, BuildingStatus, Role, User
 from app.schemas import (
     BuildingCreate,
@@ -21,12 +25,12 @@ from app.schemas import (
     PaginatedBuildingResponse,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=cached_route(max_age=60))
 
 
 # GET Building
 @router.get("/", response_model=PaginatedBuildingResponse)
-def get_buildings_endpoint(
+async def get_buildings_endpoint(
     complex_id: Optional[int] = None,
     min_floor: Optional[int] = None,
     max_floor: Optional[int] = None,
@@ -48,9 +52,11 @@ def get_buildings_endpoint(
     sort_by: str = "construction_end",
     limit: int = 100,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.exact,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    return get_buildings_filtered(
+    return await get_buildings_filtered_async(
         db=db,
         complex_id=complex_id,
         min_floor=min_floor,
@@ -73,12 +79,16 @@ def get_buildings_endpoint(
         sort_by=sort_by,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        count_mode=count_mode,
     )
 
 
 @router.get("/{id}", response_model=BuildingResponse)
-def get_building_by_id_endpoint(id: int, db: Session = Depends(get_db)):
-    building = db.query(Building).filter(Building.id == id).first()
+async def get_building_by_id_endpoint(
+    id: int, db: AsyncSession = Depends(get_async_read_db)
+):
+    building = await get_building_by_id_async(db, id)
     if not building:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Building not found"
@@ -1,7 +1,7 @@
 from decimal import Decimal
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status as http_status
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status as http_status
 from sqlalchemy.orm import Session
 
 from app.auth import require_role
@@ -19,14 +19,17 @@ from app.cruds.commercial_unit import (
     get_commercial_by_id,
     get_commercial_by_number,
 )
-from app.database import get_db
+from app.cruds.pagination import CountMode
+from app.database import get_db, get_read_db
 from app.models import Direction, FinishingType, PropertyStatus, Role, User
 from app.schemas import (
+    BulkImportReport,
     CommercialUnitResponse,
     CommercialUnitUpdate,
     CommercialUnitCreate,
     PaginatedCommercialUnitResponse,
 )
+from app.services.bulk_import import IMPORT_TARGETS, ImportFormat, import_upload
 
 router = APIRouter()
 
@@ -52,7 +55,9 @@ def get_commercials_endpoint(
     sort_by: str = "floor",
     limit: int = 100,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.exact,
+    db: Session = Depends(get_read_db),
 ):
     return get_commercials_filtered(
         db=db,
@@ -75,11 +80,15 @@ def get_commercials_endpoint(
         sort_by=sort_by,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        count_mode=count_mode,
     )
 
 
 @router.get("/{id}", response_model=CommercialUnitResponse)
-def get_commercial_by_id_endpoint(commercial_id: int, db: Session = Depends(get_db)):
+def get_commercial_by_id_endpoint(
+    commercial_id: int, db: Session = Depends(get_read_db)
+):
     existing_commercial = get_commercial_by_id(db, commercial_id)
     if existing_commercial is None:
         raise HTTPException(
@@ -106,6 +115,19 @@ def create_commercial_endpoint(
     return create_commercial(db, commercial)
 
 
+# POST commercials from a CSV / JSON Lines file
+@router.post("/import", response_model=BulkImportReport)
+def import_commercials_endpoint(
+    file: UploadFile = File(...),
+    format: Optional[ImportFormat] = None,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_role([Role.admin, Role.manager])),
+):
+    return import_upload(
+        db, IMPORT_TARGETS["commercial_units"], file.file, file.filename, format
+    )
+
+
 # PUT commercial
 @router.patch("/{id}", response_model=CommercialUnitUpdate)
 def update_commercial_endpoint(
@@ -10,6 +10,7 @@ from fastapi import (
     UploadFile,
     status as http_status,
 )
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.auth import require_role
@@ -17,10 +18,11 @@ from app.cruds.image import (
     create_image,
     delete_image,
     get_images_by_id,
-    get_images_by_object,
+    get_images_by_id_async,
+    get_images_by_object_async,
     update_image,
 )
-from app.database import get_db
+from app.database import get_async_read_db, get_db
 from app.models import ObjectType, Role, User
 from app.schemas import ImageCreate, ImageResponse, ImageUpdate
 
@@ -29,15 +31,19 @@ router = APIRouter()
 
 # GET Images
 @router.get("/", response_model=List[ImageResponse])
-def get_images_by_object_endpoint(
-    object_id: int, object_type: ObjectType, db: Session = Depends(get_db)
+async def get_images_by_object_endpoint(
+    object_id: int,
+    object_type: ObjectType,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    return get_images_by_object(db, object_id, object_type)
+    return await get_images_by_object_async(db, object_id, object_type)
 
 
 @router.get("/{image_id}", response_model=ImageResponse)
-def get_image_by_id_endpoint(image_id: int, db: Session = Depends(get_db)):
-    db_image = get_images_by_id(db, image_id)
+async def get_image_by_id_endpoint(
+    image_id: int, db: AsyncSession = Depends(get_async_read_db)
+):
+    db_image = await get_images_by_id_async(db, image_id)
     if db_image is None:
         raise HTTPException(
             status_code=http_status.HTTP_404_NOT_FOUND, detail="Image not found"
@@ -11,7 +11,8 @@ from app.cruds.infrastructure import (
     get_infrastructures_by_complex,
     update_infrastructure,
 )
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.http_cache import cached_route
 from app.models import Role, User
 from app.schemas import (
     InfrastructureCreate,
@@ -19,13 +20,13 @@ from app.schemas import (
     InfrastructureUpdate,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=cached_route(max_age=300))
 
 
 # GET Infrastructure by Complex
 @router.get("/complex/{complex_id}", response_model=List[InfrastructureResponse])
 def get_infrastructures_by_complex_endpoint(
-    complex_id: int, db: Session = Depends(get_db)
+    complex_id: int, db: Session = Depends(get_read_db)
 ):
     """Получить всю инфраструктуру для конкретного жилого комплекса"""
     return get_infrastructures_by_complex(db, complex_id)
@@ -34,7 +35,7 @@ def get_infrastructures_by_complex_endpoint(
 # GET Infrastructure by ID
 @router.get("/{infrastructure_id}", response_model=InfrastructureResponse)
 def get_infrastructure_by_id_endpoint(
-    infrastructure_id: int, db: Session = Depends(get_db)
+    infrastructure_id: int, db: Session = Depends(get_read_db)
 ):
     """Получить конкретный объект инфраструктуры по ID"""
     infrastructure = get_infrastructure_by_id(db, infrastructure_id)
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+
+from app.auth import require_role
+from app.database import engines
+from app.models import Role, User
+from app.pool_metrics import pool_status
+
+router = APIRouter()
+
+
+# GET Connection pools of this worker
+@router.get("/pool")
+def get_pool_status_endpoint(
+    reset: bool = False,
+    _: User = Depends(require_role([Role.admin])),
+):
+    status = {name: pool_status(engine) for name, engine in engines.items()}
+    if reset:
+        for engine in engines.values():
+            engine.pool.metrics.reset()
+    return status
@@ -12,9 +12,11 @@ from app.cruds.order import (
     get_orders_filtered,
     update_order,
 )
+from app.cruds.pagination import CountMode
 from app.database import get_db
 from app.models import ObjectType, OrderStatus, OrderType, PaymentType, Role, User
 from app.schemas import OrderCreate, OrderResponse, OrderUpdate, PaginatedOrderResponse
+from app.services.idempotency import IdempotentRequest, idempotency_key, run_idempotent
 from app.services.order_service import OrderService
 
 router = APIRouter()
@@ -39,10 +41,10 @@ def get_orders_endpoint(
     sort_by: str = "status",
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.exact,
     db: Session = Depends(get_db),
 ):
-    OrderService.check_expired_bookings(db)
-
     return get_orders_filtered(
         db=db,
         object_id=object_id,
@@ -61,12 +63,13 @@ def get_orders_endpoint(
         sort_by=sort_by,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        count_mode=count_mode,
     )
 
 
 @router.get("/{id}", response_model=OrderResponse)
 def get_order_by_id_endpoint(order_id: int, db: Session = Depends(get_db)):
-    OrderService.check_expired_bookings(db)
     existing_order = get_order_by_id(db, order_id)
 
     if existing_order is None:
@@ -84,10 +87,16 @@ def create_order_endpoint(
     db: Session = Depends(get_db),
     _: User = Depends(require_role([Role.consumer])),
     current_user: User = Depends(get_current_user),
+    idempotency: Optional[IdempotentRequest] = Depends(idempotency_key),
 ):
-    OrderService.check_expired_bookings(db)
-
-    return OrderService.create_order_with_logic(db, order, current_user.id)
+    return run_idempotent(
+        db,
+        idempotency,
+        current_user.id,
+        order,
+        lambda: OrderService.create_order_with_logic(db, order, current_user.id),
+        OrderResponse,
+    )
 
 
 # PUT Order
@@ -98,7 +107,6 @@ def update_order_endpoint(
     db: Session = Depends(get_db),
     _: User = Depends(require_role([Role.admin, Role.manager])),
 ):
-    OrderService.check_expired_bookings(db)
     existing_order = get_order_by_id(db, order_id)
     if existing_order is None:
         raise HTTPException(
@@ -116,7 +124,6 @@ def delete_order_endpoint(
     db: Session = Depends(get_db),
     _: User = Depends(require_role([Role.admin, Role.manager])),
 ):
-    OrderService.check_expired_bookings(db)
     existing_order = get_order_by_id(db, order_id)
     if existing_order is None:
         raise HTTPException(
@@ -7,11 +7,12 @@ import cloudinary.uploader
 
 from app.auth import get_current_user, require_role
 from app.cruds.panorama import panorama as crud_panorama
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.http_cache import cached_route
 from app.schemas import PanoramaResponse, PanoramaCreate
 from app.models import PanoramaType, Role
 
-router = APIRouter()
+router = APIRouter(route_class=cached_route(max_age=300))
 
 @router.post("/", response_model=PanoramaResponse)
 async def create_panorama(
@@ -40,11 +41,11 @@ async def create_panorama(
     return crud_panorama.create(db=db, obj_in=panorama_data)
 
 @router.get("/complex/{complex_id}", response_model=List[PanoramaResponse])
-def get_complex_panoramas(complex_id: int, db: Session = Depends(get_db)):
+def get_complex_panoramas(complex_id: int, db: Session = Depends(get_read_db)):
     return crud_panorama.get_by_complex(db=db, complex_id=complex_id)
 
 @router.get("/apartment/{apartment_id}", response_model=List[PanoramaResponse])
-def get_apartment_panoramas(apartment_id: int, db: Session = Depends(get_db)):
+def get_apartment_panoramas(apartment_id: int, db: Session = Depends(get_read_db)):
     return crud_panorama.get_by_apartment(db=db, apartment_id=apartment_id)
 
 @router.delete("/{panorama_id}")
@@ -1,33 +1,60 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from cloudinary import uploader
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Path,
+    Query,
+    UploadFile,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.auth import require_role
+from app.cruds.pagination import CountMode
 from app.cruds.residential_complex import (
     create_residential_complex,
     delete_residential_complex,
+    get_complex_clusters_async,
+    get_complexes_in_bbox_async,
+    get_complexes_within_radius_async,
+    get_tile_clusters_async,
     get_residential_complex_by_id,
+    get_residential_complex_by_id_async,
     get_residential_complex_by_name,
-    get_residential_complexes_filtered,
+    get_residential_complex_by_name_async,
+    get_residential_complexes_filtered_async,
+    search_residential_complexes_async,
     update_residential_complex,
 )
-from app.database import get_db
+from app.database import get_async_read_db, get_db
+from app.http_cache import cached_route
 from app.models import BuildingClass, BuildingStatus, City, MaterialType, Role, User
 from app.schemas import (
+    ComplexCluster,
+    ComplexMarker,
+    ComplexMarkerWithDistance,
+    ComplexTile,
     PaginatedResidentialComplexResponse,
     ResidentialComplexCreate,
     ResidentialComplexResponse,
+    ResidentialComplexSearchResponse,
+    ResidentialComplexSuggestion,
     ResidentialComplexUpdate,
 )
+from app.services.autocomplete import complex_autocomplete
 
-router = APIRouter()
+# Complex pages change rarely; clients revalidate with the ETag
+router = APIRouter(route_class=cached_route(max_age=60))
 
 
 # GET Routers
 @router.get("/", response_model=PaginatedResidentialComplexResponse)
-def get_residential_complexes_endpoint(
+async def get_residential_complexes_endpoint(
     city: Optional[City] = Query(None),
     building_class: Optional[BuildingClass] = Query(None),
     building_status: Optional[BuildingStatus] = Query(None),
@@ -40,9 +67,11 @@ def get_residential_complexes_endpoint(
     order: str = Query("asc"),
     limit: int = Query(100),
     offset: int = Query(0),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    count_mode: CountMode = Query(CountMode.exact),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    return get_residential_complexes_filtered(
+    return await get_residential_complexes_filtered_async(
         db=db,
         city=city,
         building_class=building_class,
@@ -56,12 +85,96 @@ def get_residential_complexes_endpoint(
         order=order,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        count_mode=count_mode,
+    )
+
+
+@router.get("/search", response_model=ResidentialComplexSearchResponse)
+async def search_residential_complexes_endpoint(
+    q: str = Query(..., min_length=1),
+    lang: Literal["ru", "kz", "en"] = Query("ru"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await search_residential_complexes_async(
+        db=db, q=q, lang=lang, limit=limit, offset=offset
+    )
+
+
+@router.get("/autocomplete", response_model=List[ResidentialComplexSuggestion])
+def autocomplete_residential_complexes_endpoint(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+):
+    # Served from memory; the index follows complex changes via events
+    return complex_autocomplete.suggest(q, limit=limit)
+
+
+@router.get("/geo/bbox", response_model=List[ComplexMarker])
+async def get_complexes_in_bbox_endpoint(
+    west: float = Query(..., ge=-180, le=180),
+    south: float = Query(..., ge=-90, le=90),
+    east: float = Query(..., ge=-180, le=180),
+    north: float = Query(..., ge=-90, le=90),
+    limit: int = Query(500, ge=1, le=2000),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await get_complexes_in_bbox_async(
+        db=db, west=west, south=south, east=east, north=north, limit=limit
     )
 
 
+@router.get("/geo/radius", response_model=List[ComplexMarkerWithDistance])
+async def get_complexes_within_radius_endpoint(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(..., gt=0, le=500),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await get_complexes_within_radius_async(
+        db=db,
+        latitude=latitude,
+        longitude=longitude,
+        radius_km=radius_km,
+        limit=limit,
+    )
+
+
+@router.get("/geo/clusters", response_model=List[ComplexCluster])
+async def get_complex_clusters_endpoint(
+    west: float = Query(..., ge=-180, le=180),
+    south: float = Query(..., ge=-90, le=90),
+    east: float = Query(..., ge=-180, le=180),
+    north: float = Query(..., ge=-90, le=90),
+    zoom: int = Query(..., ge=0, le=22),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await get_complex_clusters_async(
+        db=db, west=west, south=south, east=east, north=north, zoom=zoom
+    )
+
+
+@router.get("/tiles/{z}/{x}/{y}", response_model=ComplexTile)
+async def get_complex_tile_endpoint(
+    z: int = Path(..., ge=0, le=22),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    if x >= 2**z or y >= 2**z:
+        raise HTTPException(status_code=404, detail="Tile not found")
+
+    return await get_tile_clusters_async(db, z, x, y)
+
+
 @router.get("/by-id/{id}", response_model=ResidentialComplexResponse)
-def get_residential_complex(id: int, db: Session = Depends(get_db)):
-    residential_complex = get_residential_complex_by_id(db, id)
+async def get_residential_complex(
+    id: int, db: AsyncSession = Depends(get_async_read_db)
+):
+    residential_complex = await get_residential_complex_by_id_async(db, id)
     if residential_complex is None:
         raise HTTPException(status_code=404, detail="Residential Complex not found")
 
@@ -69,8 +182,10 @@ def get_residential_complex(id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/by-name/{name}", response_model=ResidentialComplexResponse)
-def get_residential_complex_by_name_endpoint(name: str, db: Session = Depends(get_db)):
-    residential_complex = get_residential_complex_by_name(db, name)
+async def get_residential_complex_by_name_endpoint(
+    name: str, db: AsyncSession = Depends(get_async_read_db)
+):
+    residential_complex = await get_residential_complex_by_name_async(db, name)
     if residential_complex is None:
         raise HTTPException(status_code=404, detail="Residential Complex not found")
 
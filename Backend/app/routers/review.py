@@ -1,18 +1,21 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status as http_status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.auth import get_current_user, get_current_user_optional
+from app.cruds.pagination import CountMode
 from app.cruds.review import (
     create_review,
     delete_review,
-    get_average_rating,
+    get_average_rating_async,
     get_review_by_id,
-    get_review_filtered,
+    get_review_by_id_async,
+    get_review_filtered_async,
     update_review,
 )
-from app.database import get_db
+from app.database import get_async_read_db, get_db
 from app.models import Review, Role, User
 from app.schemas import (
     PaginatedReviewResponse,
@@ -25,7 +28,7 @@ router = APIRouter()
 
 
 @router.get("/", response_model=PaginatedReviewResponse)
-def get_reviews_endpoint(
+async def get_reviews_endpoint(
     residential_complex_id: Optional[int] = None,
     user_id: Optional[int] = None,
     min_rating: Optional[int] = None,
@@ -34,9 +37,11 @@ def get_reviews_endpoint(
     order_by: str = "desc",
     limit: int = 100,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.exact,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    return get_review_filtered(
+    return await get_review_filtered_async(
         db=db,
         residential_complex_id=residential_complex_id,
         user_id=user_id,
@@ -46,12 +51,16 @@ def get_reviews_endpoint(
         order_by=order_by,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        count_mode=count_mode,
     )
 
 
 @router.get("/{review_id}", response_model=ReviewResponse)
-def get_review_endpoint(review_id: int, db: Session = Depends(get_db)):
-    review = get_review_by_id(db, review_id)
+async def get_review_endpoint(
+    review_id: int, db: AsyncSession = Depends(get_async_read_db)
+):
+    review = await get_review_by_id_async(db, review_id)
     if review is None:
         raise HTTPException(
             status_code=http_status.HTTP_404_NOT_FOUND, detail="Not existing review"
@@ -60,8 +69,10 @@ def get_review_endpoint(review_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/complex/{review_id}/average-rating")
-def get_complex_average_rating_endpoint(complex_id: int, db: Session = Depends(get_db)):
-    avg_rating = get_average_rating(db, complex_id)
+async def get_complex_average_rating_endpoint(
+    complex_id: int, db: AsyncSession = Depends(get_async_read_db)
+):
+    avg_rating = await get_average_rating_async(db, complex_id)
 
     return {
         "residential_complex_id": complex_id,
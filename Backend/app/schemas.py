@@ -1,7 +1,7 @@
 import re
 from datetime import date, datetime
 from decimal import Decimal
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
 from .models import (
     ApartmentType,
@@ -149,23 +149,99 @@ class ResidentialComplexCreate(ResidentialComplexBase):
 class ResidentialComplexUpdate(ResidentialComplexBase):
     pass
 
+class ResidentialComplexStatsResponse(BaseModel):
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_area: Optional[float] = None
+    max_area: Optional[float] = None
+
+    free_count: int = 0
+    booked_count: int = 0
+    sold_count: int = 0
+
+    studio_count: int = 0
+    one_bedroom_count: int = 0
+    two_bedroom_count: int = 0
+    three_bedroom_count: int = 0
+    penthouse_count: int = 0
+
+    avg_rating: Optional[float] = None
+    review_count: int = 0
+
+    class Config:
+        orm_mode = True
+
+
 class ResidentialComplexResponse(ResidentialComplexBase):
     id: int
+    stats: Optional[ResidentialComplexStatsResponse] = None
 
     class Config:
         orm_mode = True
 
 
 class PaginatedResidentialComplexResponse(BaseModel):
-    total: int
+    total: Optional[int] = None
     results: List[ResidentialComplexResponse]
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
     class Config:
         orm_mode = True
 
 
+class ResidentialComplexSearchResult(ResidentialComplexResponse):
+    rank: Optional[float] = None
+    headline: Optional[str] = None
+
+
+class ResidentialComplexSearchResponse(BaseModel):
+    results: List[ResidentialComplexSearchResult]
+    limit: int
+    offset: int
+
+
+class ResidentialComplexSuggestion(BaseModel):
+    id: int
+    name: Optional[str] = None
+    address: Optional[str] = None
+    city: Optional[City] = None
+
+
+class ComplexMarker(BaseModel):
+    id: int
+    name: Optional[str] = None
+    latitude: float
+    longitude: float
+    min_price: Optional[Decimal] = None
+    main_image: Optional[str] = None
+
+
+class ComplexMarkerWithDistance(ComplexMarker):
+    distance_km: float
+
+
+class ComplexCluster(BaseModel):
+    latitude: float
+    longitude: float
+    count: int
+    min_price: Optional[Decimal] = None
+    # Set when the cluster is a single complex
+    complex_id: Optional[int] = None
+    west: float
+    south: float
+    east: float
+    north: float
+
+
+class ComplexTile(BaseModel):
+    z: int
+    x: int
+    y: int
+    clusters: List[ComplexCluster]
+
+
 # Building
 class BuildingBase(BaseModel):
     residential_complex_id: int
@@ -224,10 +300,11 @@ class BuildingResponse(BuildingBase):
 
 
 class PaginatedBuildingResponse(BaseModel):
-    total: int
+    total: Optional[int] = None
     results: List[BuildingResponse]
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
     class Config:
         orm_mode = True
@@ -304,15 +381,96 @@ class ApartmentResponse(ApartmentBase):
 
 
 class PaginatedApartmentResponse(BaseModel):
-    total: int
+    total: Optional[int] = None
     results: List[ApartmentResponse]
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
     class Config:
         orm_mode = True
 
 
+class HistogramBucket(BaseModel):
+    min: Decimal
+    max: Decimal
+    count: int
+
+
+class ApartmentFacetsResponse(BaseModel):
+    total: int
+    apartment_type: Dict[ApartmentType, int]
+    finishing_type: Dict[FinishingType, int]
+    orientation: Dict[Direction, int]
+    status: Dict[PropertyStatus, int]
+    floor: Dict[int, int]
+    price: List[HistogramBucket]
+    area: List[HistogramBucket]
+
+
+class ApartmentRepriceFilter(BaseModel):
+    """Which apartments to reprice: a building or a complex, narrowed like the list filters."""
+
+    residential_complex_id: Optional[int] = None
+    building_id: Optional[int] = None
+    min_floor: Optional[int] = None
+    max_floor: Optional[int] = None
+    min_apartment_area: Optional[Decimal] = None
+    max_apartment_area: Optional[Decimal] = None
+    apartment_type: Optional[ApartmentType] = None
+    has_balcony: Optional[bool] = None
+    bathroom_count: Optional[int] = None
+    min_kitchen_area: Optional[Decimal] = None
+    max_kitchen_area: Optional[Decimal] = None
+    min_ceiling_height: Optional[Decimal] = None
+    max_ceiling_height: Optional[Decimal] = None
+    finishing_type: Optional[FinishingType] = None
+    min_per_sqr: Optional[Decimal] = None
+    max_per_sqr: Optional[Decimal] = None
+    min_total_price: Optional[Decimal] = None
+    max_total_price: Optional[Decimal] = None
+    # Sold apartments are skipped unless a status is given
+    status: Optional[PropertyStatus] = None
+    orientation: Optional[Direction] = None
+    isCorner: Optional[bool] = None
+
+
+class ApartmentRepriceRule(BaseModel):
+    """New price per m²: the base (current or price_per_sqr), changed by
+    percent, plus floor_premium percent for every floor above base_floor.
+    total_price becomes price per m² * apartment area."""
+
+    price_per_sqr: Optional[Decimal] = None
+    percent: Optional[Decimal] = None
+    floor_premium: Optional[Decimal] = None
+    base_floor: int = 1
+
+
+class ApartmentRepriceRequest(BaseModel):
+    filter: ApartmentRepriceFilter
+    rule: ApartmentRepriceRule
+
+
+class ApartmentPriceChange(BaseModel):
+    id: int
+    building_id: int
+    number: Optional[int] = None
+    floor: Optional[int] = None
+    old_price_per_sqr: Optional[Decimal] = None
+    new_price_per_sqr: Decimal
+    old_total_price: Optional[Decimal] = None
+    new_total_price: Decimal
+
+
+class ApartmentRepriceResponse(BaseModel):
+    dry_run: bool
+    count: int
+    old_total: Optional[Decimal] = None
+    new_total: Optional[Decimal] = None
+    # Only filled for a dry run
+    changes: List[ApartmentPriceChange] = []
+
+
 # Commercial Unit
 class CommercialUnitBase(BaseModel):
     building_id: int
@@ -372,15 +530,29 @@ class CommercialUnitResponse(CommercialUnitBase):
 
 
 class PaginatedCommercialUnitResponse(BaseModel):
-    total: int
+    total: Optional[int] = None
     results: List[CommercialUnitResponse]
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
     class Config:
         orm_mode = True
 
 
+class BulkImportRowError(BaseModel):
+    line: int
+    errors: List[str]
+
+
+class BulkImportReport(BaseModel):
+    total: int
+    imported: int
+    failed: int
+    # Capped at MAX_REPORTED_ERRORS, failed still counts every rejected row
+    errors: List[BulkImportRowError]
+
+
 # Review
 class ReviewBase(BaseModel):
     residential_complex_id: int
@@ -415,10 +587,11 @@ class ReviewResponse(ReviewBase):
 
 
 class PaginatedReviewResponse(BaseModel):
-    total: int
+    total: Optional[int] = None
     results: List[ReviewResponse]
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
     class Config:
         orm_mode = True
@@ -477,10 +650,11 @@ class OrderResponse(OrderBase):
 
 
 class PaginatedOrderResponse(BaseModel):
-    total: int
+    total: Optional[int] = None
     results: List[OrderResponse]
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
     class Config:
         orm_mode = True
@@ -531,7 +705,7 @@ class WalletTransactionBase(BaseModel):
     balance_before: Decimal
     balance_after: Decimal
     description: str
-    order_id: int
+    order_id: Optional[int] = None
 
 
 class WalletTransactionCreate(WalletTransactionBase):
@@ -0,0 +1,285 @@
+import heapq
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.config import AUTOCOMPLETE_INDEX_TTL_SECONDS
+from app.database import SessionLocal
+from app.events import EntityChange, subscribe
+from app.models import City, ResidentialComplex
+
+logger = logging.getLogger(__name__)
+
+# How much a hit in each field counts towards a complex's score
+FIELD_WEIGHTS = {"name": 1.0, "address": 0.6, "city": 0.5}
+
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.8
+# Typo matches score their trigram similarity scaled by this
+FUZZY_SCORE = 0.6
+MIN_SIMILARITY = 0.3
+
+
+def normalize(text: str) -> str:
+    return text.casefold().replace("ё", "е")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return re.findall(r"\w+", normalize(text)) if text else []
+
+
+def trigrams(token: str) -> Set[str]:
+    # Padded like pg_trgm, so short words and word starts get trigrams too
+    padded = f"  {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class ComplexSuggestion:
+    id: int
+    name: Optional[str]
+    address: Optional[str]
+    city: Optional[City]
+
+
+@dataclass
+class _Snapshot:
+    """Immutable once published; a refresh builds and swaps in a new one."""
+
+    entries: Dict[int, ComplexSuggestion] = field(default_factory=dict)
+    vocabulary: List[str] = field(default_factory=list)
+    postings: Dict[str, Dict[int, float]] = field(default_factory=dict)
+    token_trigrams: Dict[str, Set[str]] = field(default_factory=dict)
+    trigram_tokens: Dict[str, Set[str]] = field(default_factory=dict)
+
+
+def _build(entries: Dict[int, ComplexSuggestion]) -> _Snapshot:
+    postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+    for entry in entries.values():
+        fields = {
+            "name": entry.name,
+            "address": entry.address,
+            "city": entry.city.value if entry.city else None,
+        }
+        for field_name, value in fields.items():
+            weight = FIELD_WEIGHTS[field_name]
+            for token in tokenize(value):
+                postings[token][entry.id] = max(postings[token].get(entry.id, 0), weight)
+
+    token_trigrams = {token: trigrams(token) for token in postings}
+    trigram_tokens: Dict[str, Set[str]] = defaultdict(set)
+    for token, token_grams in token_trigrams.items():
+        for gram in token_grams:
+            trigram_tokens[gram].add(token)
+
+    return _Snapshot(
+        entries=entries,
+        vocabulary=sorted(postings),
+        postings=dict(postings),
+        token_trigrams=token_trigrams,
+        trigram_tokens=dict(trigram_tokens),
+    )
+
+
+class ComplexAutocompleteIndex:
+    """In-process suggest index over complex names, addresses and cities.
+
+    Every query token must match: by word prefix (binary search over the
+    sorted vocabulary) or, when no word starts with it, by trigram
+    similarity, which tolerates typos. Lookups never touch the database;
+    load() reads all complexes and refresh() re-reads the changed ones.
+    Change events only reach the worker that made the change, so a lookup
+    on an index older than ttl_seconds starts a reload in the background
+    and is answered from the current snapshot meanwhile.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # Held by the one load in progress
+        self._load_lock = threading.Lock()
+        self._snapshot = _Snapshot()
+        self._loaded = False
+        self._built_at = 0.0
+        # Entries refresh() re-read while a load is in progress, None for a
+        # deleted complex; the load may have read older rows for them
+        self._refreshed: Optional[Dict[int, Optional[ComplexSuggestion]]] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self):
+        with self._load_lock:
+            self._load()
+
+    def _load(self):
+        with self._lock:
+            self._refreshed = {}
+        try:
+            db = SessionLocal()
+            try:
+                rows = db.query(
+                    ResidentialComplex.id,
+                    ResidentialComplex.name,
+                    ResidentialComplex.address,
+                    ResidentialComplex.city,
+                ).all()
+            finally:
+                db.close()
+
+            entries = {row.id: ComplexSuggestion(*row) for row in rows}
+            with self._lock:
+                for complex_id, entry in self._refreshed.items():
+                    if entry is None:
+                        entries.pop(complex_id, None)
+                    else:
+                        entries[complex_id] = entry
+                self._snapshot = _build(entries)
+                self._loaded = True
+                self._built_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._refreshed = None
+
+    def _reload_in_background(self):
+        if not self._load_lock.acquire(blocking=False):
+            return
+
+        def reload():
+            try:
+                self._load()
+            except Exception:
+                logger.exception("Could not reload the complex autocomplete index")
+                # Keep serving the current snapshot; try again after a TTL
+                self._built_at = time.monotonic()
+            finally:
+                self._load_lock.release()
+
+        threading.Thread(target=reload, name="complex-autocomplete-reload", daemon=True).start()
+
+    def warm_up(self):
+        """load() at startup; on failure the first lookup loads instead."""
+        try:
+            self.load()
+        except Exception:
+            logger.exception("Could not load the complex autocomplete index")
+
+    def refresh(self, complex_ids: Iterable[int]):
+        complex_ids = set(complex_ids)
+        if not complex_ids or not (self._loaded or self._load_lock.locked()):
+            return
+
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(
+                    ResidentialComplex.id,
+                    ResidentialComplex.name,
+                    ResidentialComplex.address,
+                    ResidentialComplex.city,
+                )
+                .filter(ResidentialComplex.id.in_(complex_ids))
+                .all()
+            )
+        finally:
+            db.close()
+
+        refreshed: Dict[int, Optional[ComplexSuggestion]] = dict.fromkeys(complex_ids)
+        for row in rows:
+            refreshed[row.id] = ComplexSuggestion(*row)
+
+        with self._lock:
+            if self._refreshed is not None:
+                self._refreshed.update(refreshed)
+            if not self._loaded:
+                return
+            entries = dict(self._snapshot.entries)
+            for complex_id, entry in refreshed.items():
+                if entry is None:
+                    entries.pop(complex_id, None)
+                else:
+                    entries[complex_id] = entry
+            self._snapshot = _build(entries)
+
+    def _token_scores(self, snapshot: _Snapshot, token: str) -> Dict[int, float]:
+        matches: Dict[str, float] = {}
+
+        vocabulary = snapshot.vocabulary
+        position = bisect_left(vocabulary, token)
+        while position < len(vocabulary) and vocabulary[position].startswith(token):
+            word = vocabulary[position]
+            matches[word] = EXACT_SCORE if word == token else PREFIX_SCORE
+            position += 1
+
+        if not matches:
+            query_grams = trigrams(token)
+            candidates = set()
+            for gram in query_grams:
+                candidates |= snapshot.trigram_tokens.get(gram, set())
+            for word in candidates:
+                word_grams = snapshot.token_trigrams[word]
+                shared = len(query_grams & word_grams)
+                similarity = shared / (len(query_grams) + len(word_grams) - shared)
+                if similarity >= MIN_SIMILARITY:
+                    matches[word] = FUZZY_SCORE * similarity
+
+        scores: Dict[int, float] = {}
+        for word, score in matches.items():
+            for complex_id, weight in snapshot.postings[word].items():
+                scores[complex_id] = max(scores.get(complex_id, 0), score * weight)
+        return scores
+
+    def suggest(self, query: str, limit: int = 10) -> List[ComplexSuggestion]:
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self._load()
+        elif time.monotonic() - self._built_at >= self._ttl_seconds:
+            self._reload_in_background()
+
+        snapshot = self._snapshot
+        scores: Optional[Dict[int, float]] = None
+        for token in tokenize(query):
+            token_scores = self._token_scores(snapshot, token)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    complex_id: score + token_scores[complex_id]
+                    for complex_id, score in scores.items()
+                    if complex_id in token_scores
+                }
+            if not scores:
+                return []
+
+        if not scores:
+            return []
+
+        entries = snapshot.entries
+        ranked = heapq.nsmallest(
+            limit,
+            scores,
+            key=lambda complex_id: (
+                -scores[complex_id],
+                len(entries[complex_id].name or ""),
+                entries[complex_id].name or "",
+            ),
+        )
+        return [entries[complex_id] for complex_id in ranked]
+
+
+complex_autocomplete = ComplexAutocompleteIndex(AUTOCOMPLETE_INDEX_TTL_SECONDS)
+
+
+@subscribe
+def refresh_complex_autocomplete(changes: List[EntityChange]):
+    complex_ids = {
+        change.id for change in changes if change.entity == "residential_complex"
+    }
+    complex_autocomplete.refresh(complex_ids)
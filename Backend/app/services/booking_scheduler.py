@@ -0,0 +1,157 @@
+import heapq
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.config import BOOKING_SWEEP_BATCH_SIZE
+from app.cruds.order import OPEN_ORDER_STATUSES
+from app.database import SessionLocal
+from app.models import Order
+from app.services.booking_sweeper import expire_bookings
+
+logger = logging.getLogger(__name__)
+
+# Upper bound of one sleep, so a changed wall clock is noticed
+MAX_WAIT_SECONDS = 60
+
+
+def expiry_moment(booking_expiration_date: date) -> float:
+    """Timestamp from which a booking counts as expired: the next local midnight."""
+    next_day = booking_expiration_date + timedelta(days=1)
+    return datetime.combine(next_day, datetime.min.time()).timestamp()
+
+
+class BookingExpiryScheduler:
+    """In-process min-heap of open bookings keyed by their expiry moment.
+
+    A daemon thread sleeps until the earliest entry is due and expires the
+    due orders by id (see expire_bookings), so units are released right
+    after midnight without scanning the order table. Rescheduled and
+    cancelled orders leave stale heap entries behind; _due holds the live
+    moment of every order and stale entries are dropped when popped.
+
+    Each worker only knows the bookings it loaded at startup or created
+    itself; the periodic sweep covers the rest.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._heap: List[Tuple[float, int]] = []
+        self._due: Dict[int, float] = {}
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def load(self):
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(Order.id, Order.booking_expiration_date)
+                .filter(
+                    Order.status.in_(OPEN_ORDER_STATUSES),
+                    Order.booking_expiration_date.isnot(None),
+                )
+                .all()
+            )
+        finally:
+            db.close()
+
+        due = {row.id: expiry_moment(row.booking_expiration_date) for row in rows}
+        with self._condition:
+            # Orders scheduled while loading are newer than the rows read
+            due.update(self._due)
+            self._due = due
+            self._heap = [(moment, order_id) for order_id, moment in due.items()]
+            heapq.heapify(self._heap)
+            self._condition.notify()
+
+    def schedule(self, order_id: int, booking_expiration_date: Optional[date]):
+        if booking_expiration_date is None:
+            self.cancel(order_id)
+            return
+
+        moment = expiry_moment(booking_expiration_date)
+        with self._condition:
+            if self._due.get(order_id) == moment:
+                return
+            self._due[order_id] = moment
+            heapq.heappush(self._heap, (moment, order_id))
+            if self._heap[0] == (moment, order_id):
+                self._condition.notify()
+
+    def cancel(self, order_id: int):
+        with self._condition:
+            self._due.pop(order_id, None)
+
+    def _pop_due(self) -> List[int]:
+        """Wait until something is due (or stop) and take the due order ids."""
+        with self._condition:
+            while not self._stopped:
+                now = time.time()
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    moment, order_id = heapq.heappop(self._heap)
+                    if self._due.get(order_id) == moment:
+                        del self._due[order_id]
+                        due.append(order_id)
+                if due:
+                    return due
+
+                timeout = MAX_WAIT_SECONDS
+                if self._heap:
+                    timeout = min(timeout, self._heap[0][0] - now)
+                self._condition.wait(timeout)
+            return []
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._condition:
+            self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name="booking-expiry", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def warm_up(self):
+        """load() and start() at startup; on failure only the periodic sweep expires bookings."""
+        try:
+            self.load()
+        except Exception:
+            logger.exception("Could not load open bookings into the expiry scheduler")
+        self.start()
+
+    def _run(self):
+        while True:
+            order_ids = self._pop_due()
+            if not order_ids:
+                return
+
+            db = SessionLocal()
+            try:
+                for start in range(0, len(order_ids), BOOKING_SWEEP_BATCH_SIZE):
+                    batch = order_ids[start : start + BOOKING_SWEEP_BATCH_SIZE]
+                    cancelled = expire_bookings(db, date.today(), len(batch), batch)
+                    if cancelled:
+                        logger.info("Cancelled %d expired bookings", cancelled)
+            except Exception:
+                # Left to the periodic sweep
+                db.rollback()
+                logger.exception("Expiring bookings failed")
+            finally:
+                db.close()
+
+
+booking_expiry_scheduler = BookingExpiryScheduler()
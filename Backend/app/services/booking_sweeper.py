@@ -0,0 +1,162 @@
+import logging
+import threading
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.config import BOOKING_SWEEP_BATCH_SIZE, BOOKING_SWEEP_INTERVAL_SECONDS
+from app.cruds.order import OPEN_ORDER_STATUSES, PROPERTY_MODELS
+from app.database import SessionLocal
+from app.events import UPDATED, EntityChange, record_change
+from app.models import Order, OrderStatus, PropertyStatus
+
+logger = logging.getLogger(__name__)
+
+# Application-wide key of the sweep's Postgres advisory lock
+SWEEP_LOCK_KEY = 720_210_001
+
+
+def _try_lock(db: Session) -> bool:
+    """Take the sweep lock for this transaction; False if another worker has it."""
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    return db.execute(select(func.pg_try_advisory_xact_lock(SWEEP_LOCK_KEY))).scalar()
+
+
+def expire_bookings(
+    db: Session, today: date, limit: int, order_ids: Optional[Iterable[int]] = None
+) -> int:
+    """Cancel up to limit overdue open orders and free the units they booked.
+
+    The overdue orders are locked and read first, then cancelled with one
+    UPDATE, and the units with one UPDATE per unit type, in one transaction.
+    Only Offering orders booked their unit (a Pending one leaves it Free, so
+    another order may hold it), so only their units are released. Rows
+    locked by another transaction are skipped, so concurrent callers never
+    block each other or expire an order twice. Returns how many orders were
+    cancelled.
+    """
+    overdue = (
+        select(Order.id, Order.status, Order.object_type, Order.object_id)
+        .where(
+            Order.status.in_(OPEN_ORDER_STATUSES),
+            Order.booking_expiration_date < today,
+        )
+        .order_by(Order.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    if order_ids is not None:
+        overdue = overdue.where(Order.id.in_(order_ids))
+
+    cancelled = db.execute(overdue).all()
+    if not cancelled:
+        db.commit()
+        return 0
+
+    db.execute(
+        update(Order)
+        .where(Order.id.in_([order.id for order in cancelled]))
+        .values(status=OrderStatus.cancelled)
+    )
+    record_change(db, EntityChange(entity=Order.__tablename__, id=None, action=UPDATED))
+
+    for object_type, model in PROPERTY_MODELS.items():
+        unit_ids = {
+            order.object_id
+            for order in cancelled
+            if order.object_type == object_type and order.status == OrderStatus.offering
+        }
+        if not unit_ids:
+            continue
+        released = db.execute(
+            update(model)
+            .where(model.id.in_(unit_ids), model.status == PropertyStatus.booked)
+            .values(status=PropertyStatus.free)
+            .returning(model.building_id)
+        ).scalars()
+        for building_id in set(released):
+            record_change(
+                db,
+                EntityChange(
+                    entity=model.__tablename__,
+                    id=None,
+                    action=UPDATED,
+                    building_id=building_id,
+                ),
+            )
+
+    db.commit()
+    return len(cancelled)
+
+
+def expire_bookings_batch(db: Session, today: date, batch_size: int) -> Optional[int]:
+    """expire_bookings() under the sweep lock; None when another worker is sweeping."""
+    if not _try_lock(db):
+        db.rollback()
+        return None
+    return expire_bookings(db, today, batch_size)
+
+
+def sweep_expired_bookings(batch_size: int = BOOKING_SWEEP_BATCH_SIZE) -> int:
+    """Expire every overdue booking, batch by batch; returns the number cancelled."""
+    today = date.today()
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            cancelled = expire_bookings_batch(db, today, batch_size)
+            if cancelled is None:
+                break
+            total += cancelled
+            if cancelled < batch_size:
+                break
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return total
+
+
+class BookingSweeper:
+    """Runs sweep_expired_bookings() every interval_seconds on a daemon thread.
+
+    Every uvicorn worker runs one; the advisory lock lets only one of them
+    sweep at a time and the others skip that round.
+    """
+
+    def __init__(self, interval_seconds: int):
+        self._interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._interval_seconds <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="booking-sweeper", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                cancelled = sweep_expired_bookings()
+                if cancelled:
+                    logger.info("Cancelled %d expired bookings", cancelled)
+            except Exception:
+                logger.exception("Expired booking sweep failed")
+            self._stop.wait(self._interval_seconds)
+
+
+booking_sweeper = BookingSweeper(BOOKING_SWEEP_INTERVAL_SECONDS)
@@ -0,0 +1,307 @@
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Set, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.cruds.pricing import resolve_total_price
+from app.events import CREATED, EntityChange, record_change
+from app.models import Apartment, Building, CommercialUnit
+from app.schemas import ApartmentCreate, CommercialUnitCreate
+
+DEFAULT_BATCH_SIZE = 500
+
+# Keep the report of a completely wrong file small
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportFormat(str, Enum):
+    csv = "csv"
+    jsonl = "jsonl"
+
+
+@dataclass(frozen=True)
+class ImportTarget:
+    model: type
+    schema: Type[BaseModel]
+    area_field: str
+    label: str
+
+
+IMPORT_TARGETS = {
+    "apartments": ImportTarget(Apartment, ApartmentCreate, "apartment_area", "Apartment"),
+    "commercial_units": ImportTarget(
+        CommercialUnit, CommercialUnitCreate, "space_area", "CommercialUnit"
+    ),
+}
+
+
+@dataclass
+class RowError:
+    line: int
+    errors: List[str]
+
+
+@dataclass
+class ImportReport:
+    total: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[RowError] = field(default_factory=list)
+
+    def reject(self, line: int, errors: List[str]):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(RowError(line=line, errors=errors))
+
+
+def detect_format(filename: Optional[str]) -> Optional[ImportFormat]:
+    if filename:
+        extension = filename.rsplit(".", 1)[-1].lower()
+        if extension == "csv":
+            return ImportFormat.csv
+        if extension in ("jsonl", "ndjson"):
+            return ImportFormat.jsonl
+    return None
+
+
+def read_rows(
+    lines: Iterable[str], fmt: ImportFormat
+) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """(line number, row, parse error) for every record, one at a time.
+
+    Empty CSV cells are left out, so optional fields get their defaults and
+    required ones are reported as missing.
+    """
+    if fmt == ImportFormat.csv:
+        reader = csv.DictReader(lines)
+        for row in reader:
+            values = {
+                key.strip(): value
+                for key, value in row.items()
+                if key is not None and value not in (None, "")
+            }
+            yield reader.line_num, values, None
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, row, None
+
+
+def _validation_messages(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    ]
+
+
+def _validate(target: ImportTarget, row: dict) -> Tuple[Optional[dict], List[str]]:
+    """Column values of a valid row, checked like the single-unit POST."""
+    try:
+        unit = target.schema.model_validate(row)
+    except ValidationError as e:
+        return None, _validation_messages(e)
+
+    try:
+        total_price = resolve_total_price(
+            target.label,
+            unit.price_per_sqr,
+            getattr(unit, target.area_field),
+            unit.total_price,
+        )
+    except HTTPException as e:
+        return None, [f"total_price: {e.detail}"]
+
+    values = unit.model_dump()
+    values["total_price"] = total_price
+    return values, []
+
+
+class _BatchWriter:
+    """Inserts validated rows in batches, one transaction per batch.
+
+    Rows pointing at a missing building or repeating a unit number (already
+    stored or earlier in the file) are rejected before the insert, so a
+    batch normally goes in with a single executemany.
+    """
+
+    def __init__(self, db: Session, target: ImportTarget, report: ImportReport):
+        self.db = db
+        self.target = target
+        self.report = report
+        self.buildings: Set[int] = set()
+        self.missing_buildings: Set[int] = set()
+        self.seen: Set[Tuple[int, int]] = set()
+
+    def _check_buildings(self, building_ids: Set[int]):
+        unknown = building_ids - self.buildings - self.missing_buildings
+        if not unknown:
+            return
+        found = set(
+            self.db.execute(select(Building.id).where(Building.id.in_(unknown))).scalars()
+        )
+        self.buildings |= found
+        self.missing_buildings |= unknown - found
+
+    def _stored_numbers(self, keys: Set[Tuple[int, int]]) -> Set[Tuple[int, int]]:
+        if not keys:
+            return set()
+        model = self.target.model
+        rows = self.db.execute(
+            select(model.building_id, model.number).where(
+                tuple_(model.building_id, model.number).in_(list(keys))
+            )
+        )
+        return {tuple(row) for row in rows}
+
+    def write(self, batch: List[Tuple[int, dict]]):
+        self._check_buildings({values["building_id"] for _, values in batch})
+
+        accepted: List[Tuple[int, dict]] = []
+        for line, values in batch:
+            key = (values["building_id"], values["number"])
+            if key[0] in self.missing_buildings:
+                self.report.reject(line, [f"building_id: Building {key[0]} not found"])
+            elif key in self.seen:
+                self.report.reject(
+                    line, [f"number: {self._duplicate(key)} repeats an earlier row"]
+                )
+            else:
+                self.seen.add(key)
+                accepted.append((line, values))
+
+        stored = self._stored_numbers({(v["building_id"], v["number"]) for _, v in accepted})
+        rows = []
+        for line, values in accepted:
+            key = (values["building_id"], values["number"])
+            if key in stored:
+                self.report.reject(line, [f"number: {self._duplicate(key)} already exists"])
+            else:
+                rows.append((line, values))
+
+        if rows:
+            self._insert(rows)
+
+    def _duplicate(self, key: Tuple[int, int]) -> str:
+        return f"{self.target.label} {key[1]} in building {key[0]}"
+
+    def _insert(self, rows: List[Tuple[int, dict]]):
+        try:
+            self.db.execute(insert(self.target.model), [values for _, values in rows])
+            self._record(rows)
+            self.db.commit()
+            self.report.imported += len(rows)
+            return
+        except IntegrityError:
+            # A concurrent write or a constraint we do not pre-check; find the
+            # offending rows one by one
+            self.db.rollback()
+
+        for line, values in rows:
+            try:
+                self.db.execute(insert(self.target.model), [values])
+                self._record([(line, values)])
+                self.db.commit()
+                self.report.imported += 1
+            except IntegrityError as e:
+                self.db.rollback()
+                self.report.reject(line, [str(e.orig).strip().splitlines()[0]])
+
+    def _record(self, rows: List[Tuple[int, dict]]):
+        # Core inserts skip the flush; tell subscribers which buildings changed
+        for building_id in {values["building_id"] for _, values in rows}:
+            record_change(
+                self.db,
+                EntityChange(
+                    entity=self.target.model.__tablename__,
+                    id=None,
+                    action=CREATED,
+                    building_id=building_id,
+                ),
+            )
+
+
+def import_units(
+    db: Session,
+    target: ImportTarget,
+    lines: Iterable[str],
+    fmt: ImportFormat,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportReport:
+    """Validate and insert units from CSV or JSON Lines.
+
+    The input is read as a stream; at most one batch is held in memory.
+    Invalid rows are reported with their line number and skipped, valid
+    rows are committed batch by batch.
+    """
+    report = ImportReport()
+    writer = _BatchWriter(db, target, report)
+    batch: List[Tuple[int, dict]] = []
+
+    for line, row, parse_error in read_rows(lines, fmt):
+        report.total += 1
+        if parse_error:
+            report.reject(line, [parse_error])
+            continue
+
+        values, errors = _validate(target, row)
+        if errors:
+            report.reject(line, errors)
+            continue
+
+        batch.append((line, values))
+        if len(batch) >= batch_size:
+            writer.write(batch)
+            batch = []
+
+    if batch:
+        writer.write(batch)
+    report.errors.sort(key=lambda error: error.line)
+    return report
+
+
+def import_upload(
+    db: Session,
+    target: ImportTarget,
+    file: BinaryIO,
+    filename: Optional[str] = None,
+    fmt: Optional[ImportFormat] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportReport:
+    """import_units() over an uploaded UTF-8 file, format taken from its name if not given."""
+    fmt = fmt or detect_format(filename)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown file format, pass format=csv or format=jsonl",
+        )
+
+    lines = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        return import_units(db, target, lines, fmt, batch_size)
+    except UnicodeDecodeError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be UTF-8 encoded; batches before the broken line were imported",
+        )
+    finally:
+        # Leave the upload's own file open for FastAPI to close
+        lines.detach()
@@ -0,0 +1,262 @@
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.events import CREATED, EntityChange, record_change, subscribe
+from app.models import (
+    Apartment,
+    ApartmentType,
+    Building,
+    CommercialUnit,
+    PropertyStatus,
+    ResidentialComplex,
+    ResidentialComplexStats,
+    Review,
+)
+
+# Tables whose rows feed the aggregates. A moved building or a new complex
+# changes them too.
+STATS_SOURCES = {"apartment", "commercial_unit", "review", "building", "residential_complex"}
+
+REBUILD_BATCH_SIZE = 500
+
+# First key of the per-complex Postgres advisory locks (the second is the complex id)
+STATS_LOCK_SPACE = 720_210_013
+
+
+def _count_where(condition):
+    return func.count(case((condition, 1)))
+
+
+def _unit_aggregates(db: Session, model, area_column, complex_ids, extra_columns=()):
+    """min/max price and area and status counts per complex for one unit table."""
+    return (
+        db.query(
+            Building.residential_complex_id,
+            func.min(model.total_price),
+            func.max(model.total_price),
+            func.min(area_column),
+            func.max(area_column),
+            *[_count_where(model.status == status) for status in PropertyStatus],
+            *extra_columns,
+        )
+        .join(Building, model.building_id == Building.id)
+        .filter(Building.residential_complex_id.in_(complex_ids))
+        .group_by(Building.residential_complex_id)
+        .all()
+    )
+
+
+def _min(*values):
+    values = [value for value in values if value is not None]
+    return min(values) if values else None
+
+
+def _max(*values):
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+def _as_decimal(value) -> Optional[Decimal]:
+    return None if value is None else Decimal(str(value))
+
+
+def compute_complex_stats(db: Session, complex_ids: Iterable[int]) -> Dict[int, dict]:
+    """Aggregates of the given complexes, three grouped queries in total."""
+    complex_ids = list(complex_ids)
+    statuses = list(PropertyStatus)
+    types = list(ApartmentType)
+
+    stats = {
+        complex_id: dict(
+            min_price=None,
+            max_price=None,
+            min_area=None,
+            max_area=None,
+            **{f"{status.name}_count": 0 for status in statuses},
+            **{f"{apartment_type.name}_count": 0 for apartment_type in types},
+            avg_rating=None,
+            review_count=0,
+        )
+        for (complex_id,) in db.query(ResidentialComplex.id).filter(
+            ResidentialComplex.id.in_(complex_ids)
+        )
+    }
+
+    apartment_rows = _unit_aggregates(
+        db,
+        Apartment,
+        Apartment.apartment_area,
+        complex_ids,
+        extra_columns=[
+            _count_where(Apartment.apartment_type == apartment_type)
+            for apartment_type in types
+        ],
+    )
+    commercial_rows = _unit_aggregates(
+        db, CommercialUnit, CommercialUnit.space_area, complex_ids
+    )
+
+    for row in apartment_rows + commercial_rows:
+        entry = stats.get(row[0])
+        if entry is None:
+            continue
+
+        min_price, max_price, min_area, max_area = row[1:5]
+        entry["min_price"] = _as_decimal(_min(entry["min_price"], min_price))
+        entry["max_price"] = _as_decimal(_max(entry["max_price"], max_price))
+        entry["min_area"] = _as_decimal(_min(entry["min_area"], min_area))
+        entry["max_area"] = _as_decimal(_max(entry["max_area"], max_area))
+
+        status_counts = row[5 : 5 + len(statuses)]
+        for status, count in zip(statuses, status_counts):
+            entry[f"{status.name}_count"] += count
+
+        type_counts = row[5 + len(statuses) :]
+        for apartment_type, count in zip(types, type_counts):
+            entry[f"{apartment_type.name}_count"] += count
+
+    review_rows = (
+        db.query(
+            Review.residential_complex_id,
+            func.avg(Review.rating),
+            func.count(Review.id),
+        )
+        .filter(Review.residential_complex_id.in_(complex_ids))
+        .group_by(Review.residential_complex_id)
+        .all()
+    )
+    for complex_id, avg_rating, review_count in review_rows:
+        entry = stats.get(complex_id)
+        if entry is None:
+            continue
+        if avg_rating is not None:
+            entry["avg_rating"] = _as_decimal(avg_rating).quantize(Decimal("0.01"))
+        entry["review_count"] = review_count
+
+    return stats
+
+
+def _lock_complexes(db: Session, complex_ids: Iterable[int]):
+    """Serialize recomputes of the same complexes until the caller commits.
+
+    Two commits on a complex may finish their recomputes out of order; with
+    the lock, the later recompute reads after the earlier one committed, so
+    the newest aggregates win. Taken in id order to avoid deadlocks.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for complex_id in sorted(complex_ids):
+        db.execute(select(func.pg_advisory_xact_lock(STATS_LOCK_SPACE, complex_id)))
+
+
+def recompute_complex_stats(db: Session, complex_ids: Iterable[int]) -> int:
+    """Write the aggregates of the given complexes; the caller commits.
+
+    The complexes are locked first (see _lock_complexes). Unchanged rows are
+    left alone, so they publish no change. Returns the number of complexes
+    processed.
+    """
+    complex_ids = set(complex_ids)
+    _lock_complexes(db, complex_ids)
+    stats = compute_complex_stats(db, complex_ids)
+    if not stats:
+        return 0
+
+    existing = {
+        row.residential_complex_id: row
+        for row in db.query(ResidentialComplexStats).filter(
+            ResidentialComplexStats.residential_complex_id.in_(stats)
+        )
+    }
+
+    missing = []
+    for complex_id, values in stats.items():
+        row = existing.get(complex_id)
+        if row is None:
+            missing.append({"residential_complex_id": complex_id, **values})
+            continue
+        for field, value in values.items():
+            setattr(row, field, value)
+
+    db.flush()
+    if missing:
+        _insert_stats(db, missing)
+    return len(stats)
+
+
+def _insert_stats(db: Session, rows: List[dict]):
+    """Insert missing stats rows.
+
+    Two commits touching the same new complex both find its row missing;
+    on Postgres the later INSERT updates the row instead of failing on the
+    primary key.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        db.add_all(ResidentialComplexStats(**row) for row in rows)
+        db.flush()
+        return
+
+    statement = pg_insert(ResidentialComplexStats).values(rows)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[ResidentialComplexStats.residential_complex_id],
+            set_={
+                column: statement.excluded[column]
+                for column in rows[0]
+                if column != "residential_complex_id"
+            },
+        )
+    )
+    # Core inserts skip the flush
+    for row in rows:
+        record_change(
+            db,
+            EntityChange(
+                entity=ResidentialComplexStats.__tablename__,
+                id=None,
+                action=CREATED,
+                complex_id=row["residential_complex_id"],
+            ),
+        )
+
+
+def rebuild_all_complex_stats(db: Session, batch_size: int = REBUILD_BATCH_SIZE) -> int:
+    """Recompute every complex, committing after each batch."""
+    complex_ids: List[int] = [
+        complex_id
+        for (complex_id,) in db.query(ResidentialComplex.id).order_by(ResidentialComplex.id)
+    ]
+
+    processed = 0
+    for start in range(0, len(complex_ids), batch_size):
+        processed += recompute_complex_stats(db, complex_ids[start : start + batch_size])
+        db.commit()
+    return processed
+
+
+@subscribe
+def refresh_complex_stats(changes: List[EntityChange]):
+    """Recompute the complexes touched by a committed transaction.
+
+    Only the affected complexes are aggregated, each from its own units and
+    reviews, so the cost does not grow with the size of the catalog.
+    """
+    complex_ids = {
+        change.complex_id
+        for change in changes
+        if change.entity in STATS_SOURCES and change.complex_id is not None
+    }
+    if not complex_ids:
+        return
+
+    db = SessionLocal()
+    try:
+        recompute_complex_stats(db, complex_ids)
+        db.commit()
+    finally:
+        db.close()
@@ -0,0 +1,258 @@
+import math
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.database import SessionLocal
+from app.events import EntityChange, subscribe
+from app.models import ResidentialComplex, ResidentialComplexStats
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+# Clusters are cells of a lon/lat grid, this many per 256px map tile side
+CLUSTER_CELLS_PER_TILE = 4
+
+# Cell side of the in-process grid, in degrees
+GRID_CELL_DEGREES = 0.25
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+
+
+def radius_bbox(latitude: float, longitude: float, radius_km: float):
+    """(west, south, east, north) enclosing the circle, used as an index prefilter."""
+    dlat = radius_km / KM_PER_DEGREE
+    dlon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+    return longitude - dlon, latitude - dlat, longitude + dlon, latitude + dlat
+
+
+def cluster_cell_degrees(zoom: int) -> float:
+    return 360.0 / (2 ** zoom) / CLUSTER_CELLS_PER_TILE
+
+
+@dataclass(frozen=True)
+class ComplexPoint:
+    id: int
+    name: Optional[str]
+    latitude: float
+    longitude: float
+    min_price: Optional[Decimal]
+    main_image: Optional[str]
+
+    def marker(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "min_price": self.min_price,
+            "main_image": self.main_image,
+        }
+
+
+def tile_bbox(z: int, x: int, y: int):
+    """(west, south, east, north) of a Web Mercator (slippy map) tile."""
+    tiles = 2 ** z
+
+    def latitude(tile_y: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / tiles))))
+
+    return x / tiles * 360 - 180, latitude(y + 1), (x + 1) / tiles * 360 - 180, latitude(y)
+
+
+def tile_position(latitude: float, longitude: float, z: int) -> Tuple[float, float]:
+    """Fractional tile coordinates of a point at zoom z."""
+    tiles = 2 ** z
+    latitude = math.radians(latitude)
+    tile_x = (longitude + 180) / 360 * tiles
+    tile_y = (1 - math.log(math.tan(latitude) + 1 / math.cos(latitude)) / math.pi) / 2 * tiles
+    return tile_x, tile_y
+
+
+def _summarize(members: List[ComplexPoint]) -> dict:
+    prices = [member.min_price for member in members if member.min_price is not None]
+    return {
+        "latitude": sum(member.latitude for member in members) / len(members),
+        "longitude": sum(member.longitude for member in members) / len(members),
+        "count": len(members),
+        "min_price": min(prices) if prices else None,
+        "complex_id": members[0].id if len(members) == 1 else None,
+        "west": min(member.longitude for member in members),
+        "south": min(member.latitude for member in members),
+        "east": max(member.longitude for member in members),
+        "north": max(member.latitude for member in members),
+    }
+
+
+def _group(points: Iterable[ComplexPoint], cell_of: Callable) -> List[dict]:
+    cells: Dict[tuple, List[ComplexPoint]] = defaultdict(list)
+    for point in points:
+        cells[cell_of(point)].append(point)
+    return [_summarize(members) for members in cells.values()]
+
+
+def build_clusters(points: Iterable[ComplexPoint], zoom: int) -> List[dict]:
+    """Group points by lon/lat grid cell: centroid, count, min price and extent."""
+    cell = cluster_cell_degrees(zoom)
+    return _group(
+        points,
+        lambda point: (math.floor(point.longitude / cell), math.floor(point.latitude / cell)),
+    )
+
+
+def build_tile_clusters(points: Iterable[ComplexPoint], z: int, x: int, y: int) -> List[dict]:
+    """Group points of one tile by CLUSTER_CELLS_PER_TILE cells of the tile itself."""
+
+    def cell(offset: float) -> int:
+        # Points on the tile edge belong to the last cell
+        return min(max(math.floor(offset * CLUSTER_CELLS_PER_TILE), 0), CLUSTER_CELLS_PER_TILE - 1)
+
+    def cell_of(point: ComplexPoint):
+        tile_x, tile_y = tile_position(point.latitude, point.longitude, z)
+        return cell(tile_x - x), cell(tile_y - y)
+
+    return _group(points, cell_of)
+
+
+class ComplexGeoGrid:
+    """In-process grid of complex coordinates, for databases without GiST.
+
+    Points are bucketed into GRID_CELL_DEGREES cells; a box lookup visits
+    only the cells it overlaps (or the occupied ones, when fewer). Loaded
+    on first use and refreshed from complex and stats change events.
+    """
+
+    def __init__(self, cell_degrees: float = GRID_CELL_DEGREES):
+        self._cell = cell_degrees
+        self._lock = threading.Lock()
+        self._points: Dict[int, ComplexPoint] = {}
+        self._cells: Dict[Tuple[int, int], List[ComplexPoint]] = {}
+        self._loaded = False
+
+    def _key(self, longitude: float, latitude: float) -> Tuple[int, int]:
+        return math.floor(longitude / self._cell), math.floor(latitude / self._cell)
+
+    def _read(self, complex_ids: Optional[Iterable[int]] = None) -> List[ComplexPoint]:
+        db = SessionLocal()
+        try:
+            query = (
+                db.query(
+                    ResidentialComplex.id,
+                    ResidentialComplex.name,
+                    ResidentialComplex.latitude,
+                    ResidentialComplex.longitude,
+                    ResidentialComplexStats.min_price,
+                    ResidentialComplex.main_image,
+                )
+                .outerjoin(ResidentialComplexStats)
+                .filter(
+                    ResidentialComplex.latitude.isnot(None),
+                    ResidentialComplex.longitude.isnot(None),
+                )
+            )
+            if complex_ids is not None:
+                query = query.filter(ResidentialComplex.id.in_(complex_ids))
+            rows = query.all()
+        finally:
+            db.close()
+
+        return [
+            ComplexPoint(
+                id=row.id,
+                name=row.name,
+                latitude=float(row.latitude),
+                longitude=float(row.longitude),
+                min_price=row.min_price,
+                main_image=row.main_image,
+            )
+            for row in rows
+        ]
+
+    def _publish(self, points: Dict[int, ComplexPoint]):
+        cells: Dict[Tuple[int, int], List[ComplexPoint]] = defaultdict(list)
+        for point in points.values():
+            cells[self._key(point.longitude, point.latitude)].append(point)
+        self._points = points
+        self._cells = dict(cells)
+
+    def load(self):
+        points = {point.id: point for point in self._read()}
+        with self._lock:
+            self._publish(points)
+            self._loaded = True
+
+    def refresh(self, complex_ids: Iterable[int]):
+        complex_ids = set(complex_ids)
+        if not self._loaded or not complex_ids:
+            return
+
+        fresh = self._read(complex_ids)
+        with self._lock:
+            points = dict(self._points)
+            for complex_id in complex_ids:
+                points.pop(complex_id, None)
+            for point in fresh:
+                points[point.id] = point
+            self._publish(points)
+
+    def in_bbox(self, west: float, south: float, east: float, north: float) -> List[ComplexPoint]:
+        if not self._loaded:
+            self.load()
+
+        cells = self._cells
+        min_x, min_y = self._key(west, south)
+        max_x, max_y = self._key(east, north)
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > len(cells):
+            keys = [
+                key
+                for key in cells
+                if min_x <= key[0] <= max_x and min_y <= key[1] <= max_y
+            ]
+        else:
+            keys = [
+                (x, y)
+                for x in range(min_x, max_x + 1)
+                for y in range(min_y, max_y + 1)
+            ]
+
+        return [
+            point
+            for key in keys
+            for point in cells.get(key, ())
+            if west <= point.longitude <= east and south <= point.latitude <= north
+        ]
+
+    def within_radius(
+        self, latitude: float, longitude: float, radius_km: float
+    ) -> List[Tuple[ComplexPoint, float]]:
+        found = []
+        for point in self.in_bbox(*radius_bbox(latitude, longitude, radius_km)):
+            distance = haversine_km(latitude, longitude, point.latitude, point.longitude)
+            if distance <= radius_km:
+                found.append((point, distance))
+        found.sort(key=lambda item: (item[1], item[0].id))
+        return found
+
+
+complex_geo_grid = ComplexGeoGrid()
+
+
+@subscribe
+def refresh_complex_geo_grid(changes: List[EntityChange]):
+    complex_ids = {
+        change.complex_id
+        for change in changes
+        if change.entity in ("residential_complex", "residential_complex_stats")
+        and change.complex_id is not None
+    }
+    complex_geo_grid.refresh(complex_ids)
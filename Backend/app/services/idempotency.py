@@ -0,0 +1,214 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional, Tuple, Type
+
+from fastapi import Header, HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import delete, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import (
+    IDEMPOTENCY_KEY_TTL_SECONDS,
+    IDEMPOTENCY_LOCK_SECONDS,
+    IDEMPOTENCY_WAIT_SECONDS,
+)
+from app.database import SessionLocal
+from app.models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+# How often a duplicate checks whether the first request has finished
+POLL_SECONDS = 0.1
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+@dataclass(frozen=True)
+class IdempotentRequest:
+    key: str
+    # Method and path; a key reused on another endpoint is a different request
+    scope: str
+
+
+def idempotency_key(
+    request: Request,
+    key: Optional[str] = Header(None, alias="Idempotency-Key", min_length=1, max_length=255),
+) -> Optional[IdempotentRequest]:
+    """Dependency reading the optional Idempotency-Key header."""
+    if key is None:
+        return None
+    return IdempotentRequest(key=key, scope=f"{request.method} {request.url.path}")
+
+
+def fingerprint(idempotency: IdempotentRequest, payload: BaseModel) -> str:
+    body = json.dumps(payload.model_dump(mode="json"), sort_keys=True)
+    return hashlib.sha256(f"{idempotency.scope}\n{body}".encode()).hexdigest()
+
+
+def _claim(
+    db: Session, user_id: int, key: str, request_fingerprint: str, token: str
+) -> Tuple[bool, Optional[IdempotencyKey]]:
+    """Take the key for this request: (claimed, row holding the key).
+
+    The holder's row is None when it vanished between the failed INSERT and
+    the SELECT (its request failed or the row expired); try again then.
+    Expired rows of the user are dropped first, which also keeps the table
+    from growing with keys nobody will retry. A running request keeps its
+    row from expiring (see _keep_claim), so only dead requests lose theirs.
+    """
+    now = datetime.now()
+    db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.user_id == user_id, IdempotencyKey.expires_at < now
+        )
+    )
+    try:
+        db.execute(
+            insert(IdempotencyKey).values(
+                user_id=user_id,
+                key=key,
+                fingerprint=request_fingerprint,
+                token=token,
+                completed=False,
+                created_at=now,
+                expires_at=now + timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS),
+            )
+        )
+        db.commit()
+        return True, None
+    except IntegrityError:
+        db.rollback()
+
+    return False, (
+        db.query(IdempotencyKey)
+        .filter(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        .first()
+    )
+
+
+def _keep_claim(user_id: int, key: str, token: str, stop: threading.Event):
+    """Extend the claim every third of its lock until stop is set."""
+    while not stop.wait(IDEMPOTENCY_LOCK_SECONDS / 3):
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.token == token,
+                    IdempotencyKey.completed.is_(False),
+                )
+                .values(expires_at=datetime.now() + timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS))
+            )
+            db.commit()
+        except Exception:
+            logger.exception("Could not extend the claim of Idempotency-Key %r", key)
+        finally:
+            db.close()
+
+
+def _replay(stored: IdempotencyKey) -> JSONResponse:
+    return JSONResponse(
+        status_code=stored.response_status,
+        content=stored.response_body,
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+def run_idempotent(
+    db: Session,
+    idempotency: Optional[IdempotentRequest],
+    user_id: int,
+    payload: BaseModel,
+    action: Callable[[], Any],
+    response_model: Type[BaseModel],
+    status_code: int = status.HTTP_200_OK,
+):
+    """Run action() once per Idempotency-Key and replay its response to retries.
+
+    The key is claimed with an INSERT into idempotency_key, so of concurrent
+    duplicates only one runs the action; the others wait for its response
+    (409 after IDEMPOTENCY_WAIT_SECONDS). A key reused with another body or
+    endpoint is rejected with 422. Failed requests release the key, so they
+    can be retried; only successful responses are stored.
+
+    While the action runs, a thread keeps extending the claim. The action
+    commits on its own, before the response is stored; if the process dies
+    in between, a retry after IDEMPOTENCY_LOCK_SECONDS runs the action
+    again. The claim carries a random token and the row is only updated or
+    released under it, so a request never touches a claim it lost.
+    """
+    if idempotency is None:
+        return action()
+
+    request_fingerprint = fingerprint(idempotency, payload)
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        claimed, stored = _claim(db, user_id, idempotency.key, request_fingerprint, token)
+        if claimed:
+            break
+        if stored is None:
+            continue
+        if stored.fingerprint != request_fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request",
+            )
+        if stored.completed:
+            return _replay(stored)
+        if time.monotonic() >= deadline:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress",
+            )
+        db.rollback()
+        time.sleep(POLL_SECONDS)
+
+    claim = (
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == idempotency.key,
+        IdempotencyKey.token == token,
+    )
+    stop = threading.Event()
+    threading.Thread(
+        target=_keep_claim,
+        args=(user_id, idempotency.key, token, stop),
+        name="idempotency-claim",
+        daemon=True,
+    ).start()
+    try:
+        result = action()
+    except BaseException:
+        db.rollback()
+        db.execute(delete(IdempotencyKey).where(*claim, IdempotencyKey.completed.is_(False)))
+        db.commit()
+        raise
+    finally:
+        stop.set()
+
+    body = jsonable_encoder(response_model.model_validate(result, from_attributes=True))
+    stored = db.execute(
+        update(IdempotencyKey)
+        .where(*claim)
+        .values(
+            completed=True,
+            response_status=status_code,
+            response_body=body,
+            expires_at=datetime.now() + timedelta(seconds=IDEMPOTENCY_KEY_TTL_SECONDS),
+        )
+    )
+    db.commit()
+    if not stored.rowcount:
+        logger.warning("Idempotency-Key %r expired while its request ran", idempotency.key)
+    return body
@@ -1,13 +1,21 @@
 from datetime import date
-from typing import Union
 
 from fastapi import HTTPException, status as http_status
+from sqlalchemy import update
 from sqlalchemy.dialects.mysql import DECIMAL
 from sqlalchemy.orm import Session
 
-from app.cruds.order import create_order, get_order_by_id, update_order
+from app.cruds.order import OPEN_ORDER_STATUSES, PROPERTY_MODELS
+from app.events import UPDATED, EntityChange, record_change
 from app.models import Apartment, CommercialUnit, ObjectType, Order, OrderStatus, PropertyStatus
 from app.schemas import OrderCreate, OrderUpdate
+from app.services.booking_scheduler import booking_expiry_scheduler
+
+# Unit status an order puts its unit into when created
+ORDER_PROPERTY_STATUS = {
+	OrderStatus.offering: PropertyStatus.booked,
+	OrderStatus.completed: PropertyStatus.sold,
+}
 
 
 class OrderService:
@@ -19,18 +27,6 @@ class OrderService:
 			return db.query(CommercialUnit).filter(CommercialUnit.id == object_id).first()
 		return None
 
-	@staticmethod
-	def _validate_property_availability(property_obj: Union[Apartment, CommercialUnit]):
-		if not property_obj:
-			raise HTTPException(
-				status_code=http_status.HTTP_404_NOT_FOUND, detail="Property does not exist"
-			)
-
-		if property_obj.status != PropertyStatus.free:
-			raise HTTPException(
-				status_code = http_status.HTTP_405_METHOD_NOT_ALLOWED, detail=f"Property is not available. Current status: {property_obj.status}"
-			)
-
 	@staticmethod
 	def _validate_booking_deposit(booking_deposit: DECIMAL, total_price: DECIMAL):
 		if booking_deposit > total_price:
@@ -42,74 +38,138 @@ class OrderService:
 
 
 	@staticmethod
-	def _update_property_status(property_obj: Union[Apartment, CommercialUnit], new_status: PropertyStatus, db: Session):
-		property_obj.status = new_status
-		db.commit()
-		db.refresh(property_obj)
-
-	@staticmethod
-	def create_order_with_logic(db:Session, order_data:OrderCreate, user_id: int) -> Order:
-		property_obj = OrderService._get_property_object(db, order_data.object_id, order_data.object_type)
-
-		OrderService._validate_property_availability(property_obj)
-
-		OrderService._validate_booking_deposit(property_obj.booking_deposit, property_obj.total_price)
-
-		new_order = create_order(db, order_data, user_id)
-
-		if new_order.status == OrderStatus.offering:
-			OrderService._update_property_status(property_obj, PropertyStatus.booked, db)
-		elif new_order.status == OrderStatus.completed:
-			OrderService._update_property_status(property_obj, PropertyStatus.sold, db)
-
-		return new_order
-
-	@staticmethod
-	def update_order_with_logic(db:Session, order_id: int, order_update:OrderUpdate) -> Order:
-		existing_order = get_order_by_id(db, order_id)
-		if not existing_order:
+	def _reserve_property(db: Session, object_type: ObjectType, object_id: int, new_status: PropertyStatus, expected_status: PropertyStatus = PropertyStatus.free):
+		"""Move a unit in expected_status (free) to new_status with one conditional UPDATE.
+
+		The row lock is held until the caller commits, so of two concurrent
+		checkouts on the same unit the second one sees it taken; bookings of
+		different units do not wait on each other.
+		"""
+		model = PROPERTY_MODELS.get(object_type)
+		if model is None:
 			raise HTTPException(
-				status_code=http_status.HTTP_404_NOT_FOUND, detail="Order does not exist"
+				status_code=http_status.HTTP_404_NOT_FOUND, detail="Property does not exist"
 			)
 
-		property_obj = OrderService._get_property_object(db, existing_order.object_id, existing_order.object_type)
-
-		if not property_obj:
+		reserved = db.execute(
+			update(model)
+			.where(model.id == object_id, model.status == expected_status)
+			.values(status=new_status)
+			.returning(model.total_price, model.building_id)
+		).first()
+
+		if reserved is None:
+			current = db.query(model.status).filter(model.id == object_id).first()
+			if current is None:
+				raise HTTPException(
+					status_code=http_status.HTTP_404_NOT_FOUND, detail="Property does not exist"
+				)
 			raise HTTPException(
-				status_code=http_status.HTTP_404_NOT_FOUND, detail="Property does not exist"
+				status_code = http_status.HTTP_405_METHOD_NOT_ALLOWED, detail=f"Property is not available. Current status: {current.status}"
 			)
 
-		old_status = property_obj.status
-
-		updated_order = update_order(db, order_id, order_update)
-
-		new_status = updated_order.status
-
-		if old_status != new_status:
-			if new_status == OrderStatus.completed:
-				OrderService._update_property_status(property_obj, PropertyStatus.sold, db)
-			elif new_status == OrderStatus.offering:
-				OrderService._update_property_status(property_obj, PropertyStatus.booked, db)
-			elif new_status == OrderStatus.cancelled:
-				OrderService._update_property_status(property_obj, PropertyStatus.free, db)
-
-		return updated_order
+		if new_status != expected_status:
+			record_change(db, EntityChange(
+				entity=model.__tablename__, id=object_id, action=UPDATED, building_id=reserved.building_id,
+			))
+		return reserved
 
 	@staticmethod
-	def check_expired_bookings(db:Session):
-		today = date.today()
-
-		expired_bookings = db.query(Order).filter(Order.booking_expiration_date<today).all()
-
-		for order in expired_bookings:
-			order.status = OrderStatus.cancelled
+	def _release_property(db: Session, object_type: ObjectType, object_id: int, held_status: PropertyStatus):
+		"""Free a unit only if it is still in the status its order put it in."""
+		model = PROPERTY_MODELS.get(object_type)
+		if model is None:
+			return
+		released = db.execute(
+			update(model)
+			.where(model.id == object_id, model.status == held_status)
+			.values(status=PropertyStatus.free)
+			.returning(model.building_id)
+		).first()
+		if released is not None:
+			record_change(db, EntityChange(
+				entity=model.__tablename__, id=object_id, action=UPDATED, building_id=released.building_id,
+			))
 
-			property_obj = OrderService._get_property_object(db, order.object_id, order.object_type)
-			if property_obj:
-				OrderService._update_property_status(property_obj, PropertyStatus.free, db)
-
-		db.commit()
-
-		return len(expired_bookings)
+	@staticmethod
+	def _schedule_expiry(order: Order):
+		if order.status in OPEN_ORDER_STATUSES:
+			booking_expiry_scheduler.schedule(order.id, order.booking_expiration_date)
+		else:
+			booking_expiry_scheduler.cancel(order.id)
 
+	@staticmethod
+	def create_order_with_logic(db:Session, order_data:OrderCreate, user_id: int) -> Order:
+		# Pending and cancelled orders only need the unit to be free right now
+		new_property_status = ORDER_PROPERTY_STATUS.get(order_data.status, PropertyStatus.free)
+
+		try:
+			reserved = OrderService._reserve_property(db, order_data.object_type, order_data.object_id, new_property_status)
+
+			total_price = order_data.total_price if order_data.total_price is not None else reserved.total_price
+			OrderService._validate_booking_deposit(order_data.booking_deposit, total_price)
+
+			new_order = Order(
+				user_id=order_data.user_id,
+				object_id=order_data.object_id,
+				order_type=order_data.order_type,
+				object_type=order_data.object_type,
+				total_price=total_price,
+				payment_type=order_data.payment_type,
+				order_date=date.today(),
+				booking_deposit=order_data.booking_deposit,
+				booking_expiration_date=order_data.booking_expiration_date,
+				status=order_data.status,
+			)
+			db.add(new_order)
+			# Unit status and order land in one transaction
+			db.commit()
+		except Exception:
+			db.rollback()
+			raise
+
+		db.refresh(new_order)
+		OrderService._schedule_expiry(new_order)
+		return new_order
 
+	@staticmethod
+	def update_order_with_logic(db:Session, order_id: int, order_update:OrderUpdate) -> Order:
+		"""Apply an order update and move its unit, in one transaction.
+
+		Only Offering and Completed orders hold their unit (Booked/Sold). An
+		order that starts holding it reserves it with a conditional UPDATE, so
+		two orders can never book or sell the same unit; one that stops
+		holding it frees it only if the unit is still in the status it set.
+		"""
+		try:
+			# Locked, so concurrent updates and the expiry sweep see one transition at a time
+			existing_order = db.query(Order).filter(Order.id == order_id).with_for_update().first()
+			if not existing_order:
+				raise HTTPException(
+					status_code=http_status.HTTP_404_NOT_FOUND, detail="Order does not exist"
+				)
+
+			old_status = existing_order.status
+			for key, value in order_update.model_dump(exclude_unset=True).items():
+				setattr(existing_order, key, value)
+			new_status = existing_order.status
+
+			held = ORDER_PROPERTY_STATUS.get(old_status)
+			wanted = ORDER_PROPERTY_STATUS.get(new_status)
+			if held != wanted:
+				if wanted is not None:
+					OrderService._reserve_property(
+						db, existing_order.object_type, existing_order.object_id,
+						wanted, held or PropertyStatus.free,
+					)
+				else:
+					OrderService._release_property(db, existing_order.object_type, existing_order.object_id, held)
+
+			db.commit()
+		except Exception:
+			db.rollback()
+			raise
+
+		db.refresh(existing_order)
+		OrderService._schedule_expiry(existing_order)
+		return existing_order
@@ -0,0 +1,125 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import PROMOTION_INDEX_TTL_SECONDS
+from app.models import ApartmentType, Promotion
+
+
+@dataclass(frozen=True)
+class ActivePromotion:
+    id: int
+    residential_complex_id: int
+    apartment_type: Optional[ApartmentType]
+    discount_percentage: Decimal
+    start_date: date
+    end_date: date
+
+
+class ActivePromotionIndex:
+    """In-process index of today's active promotions.
+
+    Keyed by (residential_complex_id, apartment_type), where apartment_type
+    None stands for promotions covering the whole complex. The index is
+    rebuilt on the first lookup after the next start_date/end_date boundary,
+    after invalidate() or once ttl_seconds have passed.
+
+    The lock is never held while querying: with the async engine the query
+    yields to the event loop, and another request on the same thread would
+    block on the lock forever.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._best: Dict[Tuple[int, Optional[ApartmentType]], ActivePromotion] = {}
+        self._valid_until: Optional[date] = None
+        self._built_at = 0.0
+        self._generation = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._valid_until = None
+
+    def _is_fresh(self, today: date) -> bool:
+        return (
+            self._valid_until is not None
+            and today < self._valid_until
+            and time.monotonic() - self._built_at < self._ttl_seconds
+        )
+
+    def _load(self, db: Session, today: date):
+        promotions = (
+            db.query(Promotion)
+            .filter(
+                Promotion.is_active == True,
+                Promotion.end_date >= today,
+                Promotion.residential_complex_id != None,
+            )
+            .all()
+        )
+
+        best = {}
+        valid_until = date.max
+        for promotion in promotions:
+            if promotion.start_date > today:
+                # Not started yet: the index goes stale on its start date
+                valid_until = min(valid_until, promotion.start_date)
+                continue
+
+            valid_until = min(valid_until, promotion.end_date + timedelta(days=1))
+
+            key = (promotion.residential_complex_id, promotion.apartment_type)
+            current = best.get(key)
+            if current is None or promotion.discount_percentage > current.discount_percentage:
+                best[key] = ActivePromotion(
+                    id=promotion.id,
+                    residential_complex_id=promotion.residential_complex_id,
+                    apartment_type=promotion.apartment_type,
+                    discount_percentage=promotion.discount_percentage,
+                    start_date=promotion.start_date,
+                    end_date=promotion.end_date,
+                )
+
+        return best, valid_until
+
+    def best_for(
+        self,
+        db: Session,
+        residential_complex_id: int,
+        apartment_type: Optional[ApartmentType],
+    ) -> Optional[ActivePromotion]:
+        today = date.today()
+        best = self._best
+        if not self._is_fresh(today):
+            with self._lock:
+                generation = self._generation
+
+            best, valid_until = self._load(db, today)
+
+            with self._lock:
+                # An invalidate() during the load means it may have missed the
+                # change; use it for this lookup only and reload on the next.
+                if self._generation == generation:
+                    self._best = best
+                    self._valid_until = valid_until
+                    self._built_at = time.monotonic()
+
+        candidates = [
+            best.get((residential_complex_id, apartment_type)),
+            best.get((residential_complex_id, None)),
+        ]
+        return max(
+            (candidate for candidate in candidates if candidate is not None),
+            key=lambda candidate: candidate.discount_percentage,
+            default=None,
+        )
+
+
+active_promotion_index = ActivePromotionIndex(PROMOTION_INDEX_TTL_SECONDS)
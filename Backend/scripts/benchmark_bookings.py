@@ -0,0 +1,156 @@
+"""
+Нагрузочный тест бронирования: сотни параллельных бронирований квартир
+одного дома. Проверяет, что ни одна квартира не забронирована дважды, и
+выводит пропускную способность и задержки. После теста созданные заказы
+удаляются, а квартиры снова становятся свободными
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, update
+
+from app.database import SessionLocal
+from app.models import (
+    Apartment,
+    ObjectType,
+    Order,
+    OrderStatus,
+    OrderType,
+    PaymentType,
+    PropertyStatus,
+)
+from app.schemas import OrderCreate
+from app.services.order_service import OrderService
+
+
+def book(apartment_id: int, user_id: int):
+    """
+    Одно бронирование в отдельной сессии: (результат, время в секундах, id заказа)
+    """
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        order = OrderService.create_order_with_logic(
+            db,
+            OrderCreate(
+                user_id=user_id,
+                object_id=apartment_id,
+                order_type=OrderType.booking,
+                object_type=ObjectType.apartment,
+                payment_type=PaymentType.cash,
+                booking_deposit=Decimal(0),
+                booking_expiration_date=date.today() + timedelta(days=3),
+                status=OrderStatus.offering,
+            ),
+            user_id,
+        )
+        return "booked", time.perf_counter() - started, order.id
+    except HTTPException:
+        return "conflict", time.perf_counter() - started, None
+    except Exception as e:
+        return f"error: {e.__class__.__name__}", time.perf_counter() - started, None
+    finally:
+        db.close()
+
+
+def benchmark(building_id: int, user_id: int, bookings: int, workers: int):
+    db = SessionLocal()
+    try:
+        apartment_ids = [
+            row.id
+            for row in db.query(Apartment.id).filter(
+                Apartment.building_id == building_id,
+                Apartment.status == PropertyStatus.free,
+            )
+        ]
+    finally:
+        db.close()
+
+    if not apartment_ids:
+        print("✗ В доме нет свободных квартир")
+        return
+
+    print(
+        f"Дом {building_id}: свободных квартир {len(apartment_ids)}, "
+        f"бронирований {bookings}, потоков {workers}"
+    )
+    targets = [random.choice(apartment_ids) for _ in range(bookings)]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda apartment_id: book(apartment_id, user_id), targets))
+    elapsed = time.perf_counter() - started
+
+    order_ids = [order_id for _, _, order_id in results if order_id is not None]
+    outcomes = {}
+    for outcome, _, _ in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    latencies = sorted(latency for _, latency, _ in results)
+
+    db = SessionLocal()
+    try:
+        double_booked = (
+            db.query(Order.object_id)
+            .filter(Order.id.in_(order_ids))
+            .group_by(Order.object_id)
+            .having(func.count() > 1)
+            .count()
+            if order_ids
+            else 0
+        )
+
+        print("=" * 60)
+        for outcome, count in sorted(outcomes.items()):
+            print(f"{outcome}: {count}")
+        print(f"Уникальных забронированных квартир: {len(set(targets))} запрошено, {len(order_ids)} заказов")
+        print(f"Двойных бронирований: {double_booked}")
+        print(f"Время: {elapsed:.2f} с, {bookings / elapsed:.0f} бронирований/с")
+        print(
+            f"Задержка: p50 {statistics.median(latencies) * 1000:.1f} мс, "
+            f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} мс, "
+            f"max {latencies[-1] * 1000:.1f} мс"
+        )
+        print("=" * 60)
+
+        # Возвращаем данные в исходное состояние
+        if order_ids:
+            booked_ids = [
+                row.object_id for row in db.query(Order.object_id).filter(Order.id.in_(order_ids))
+            ]
+            db.execute(delete(Order).where(Order.id.in_(order_ids)))
+            db.execute(
+                update(Apartment)
+                .where(Apartment.id.in_(booked_ids))
+                .values(status=PropertyStatus.free)
+            )
+            db.commit()
+            print(f"✓ Удалено тестовых заказов: {len(order_ids)}")
+    except Exception as e:
+        db.rollback()
+        print(f"✗ Ошибка при проверке: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--building-id", type=int, required=True)
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--bookings", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=50)
+    args = parser.parse_args()
+
+    benchmark(args.building_id, args.user_id, args.bookings, args.workers)
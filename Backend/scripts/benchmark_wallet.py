@@ -0,0 +1,140 @@
+"""
+Нагрузочный тест кошелька: тысячи параллельных пополнений и списаний одного
+кошелька. Проверяет, что итоговый баланс равен сумме проведённых операций, а
+balance_before/balance_after транзакций образуют непрерывную цепочку, и
+выводит пропускную способность и задержки. После теста созданные транзакции
+удаляются, а баланс возвращается к исходному
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from pathlib import Path
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, func, update
+
+from app.cruds.wallet import get_wallet_by_user_id
+from app.cruds.wallet_transaction import create_transaction
+from app.database import SessionLocal
+from app.models import TransactionType, UserWallet, WalletTransaction
+
+
+def post(wallet_id: int, transaction_type: TransactionType, amount: Decimal):
+    """
+    Одна операция в отдельной сессии: (результат, время в секундах, изменение баланса)
+    """
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        create_transaction(db, wallet_id, transaction_type, amount, "Benchmark")
+        delta = amount if transaction_type == TransactionType.deposit else -amount
+        return "posted", time.perf_counter() - started, delta
+    except ValueError:
+        return "rejected", time.perf_counter() - started, Decimal(0)
+    except Exception as e:
+        return f"error: {e.__class__.__name__}", time.perf_counter() - started, Decimal(0)
+    finally:
+        db.close()
+
+
+def benchmark(user_id: int, operations: int, workers: int):
+    db = SessionLocal()
+    try:
+        wallet = get_wallet_by_user_id(db, user_id)
+        if not wallet:
+            print("✗ У пользователя нет кошелька")
+            return
+        wallet_id = wallet.id
+        start_balance = wallet.balance
+        last_id = db.query(func.max(WalletTransaction.id)).scalar() or 0
+    finally:
+        db.close()
+
+    print(
+        f"Кошелёк {wallet_id}: баланс {start_balance}, "
+        f"операций {operations}, потоков {workers}"
+    )
+    plan = [
+        (
+            random.choice((TransactionType.deposit, TransactionType.withdrawal)),
+            Decimal(random.randint(1, 100)),
+        )
+        for _ in range(operations)
+    ]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda item: post(wallet_id, *item), plan))
+    elapsed = time.perf_counter() - started
+
+    outcomes = {}
+    for outcome, _, _ in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    latencies = sorted(latency for _, latency, _ in results)
+    expected = start_balance + sum(delta for _, _, delta in results)
+
+    db = SessionLocal()
+    try:
+        balance = db.query(UserWallet.balance).filter(UserWallet.id == wallet_id).scalar()
+        transactions = (
+            db.query(WalletTransaction.balance_before, WalletTransaction.balance_after)
+            .filter(WalletTransaction.wallet_id == wallet_id, WalletTransaction.id > last_id)
+            .order_by(WalletTransaction.id)
+            .all()
+        )
+        # Каждая транзакция начинается с баланса, которым закончилась предыдущая
+        broken = sum(
+            1
+            for previous, current in zip(transactions, transactions[1:])
+            if previous.balance_after != current.balance_before
+        )
+
+        print("=" * 60)
+        for outcome, count in sorted(outcomes.items()):
+            print(f"{outcome}: {count}")
+        print(f"Баланс: {balance}, ожидался {expected} {'✓' if balance == expected else '✗'}")
+        print(f"Транзакций: {len(transactions)}, разрывов цепочки: {broken}")
+        print(f"Время: {elapsed:.2f} с, {operations / elapsed:.0f} операций/с")
+        print(
+            f"Задержка: p50 {statistics.median(latencies) * 1000:.1f} мс, "
+            f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} мс, "
+            f"max {latencies[-1] * 1000:.1f} мс"
+        )
+        print("=" * 60)
+
+        # Возвращаем данные в исходное состояние
+        db.execute(
+            delete(WalletTransaction).where(
+                WalletTransaction.wallet_id == wallet_id, WalletTransaction.id > last_id
+            )
+        )
+        db.execute(
+            update(UserWallet)
+            .where(UserWallet.id == wallet_id)
+            .values(balance=UserWallet.balance - (expected - start_balance))
+        )
+        db.commit()
+        print(f"✓ Удалено тестовых транзакций: {len(transactions)}")
+    except Exception as e:
+        db.rollback()
+        print(f"✗ Ошибка при проверке: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=50)
+    args = parser.parse_args()
+
+    benchmark(args.user_id, args.operations, args.workers)
@@ -0,0 +1,70 @@
+"""
+Скрипт массовой загрузки квартир и коммерческих помещений из CSV или
+JSON Lines. Строки проверяются так же, как при создании через API, и
+вставляются пачками; ошибочные строки пропускаются и выводятся с номером
+строки файла
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.services.bulk_import import (
+    DEFAULT_BATCH_SIZE,
+    IMPORT_TARGETS,
+    ImportFormat,
+    detect_format,
+    import_units,
+)
+
+
+def bulk_import(kind: str, path: Path, fmt: ImportFormat, batch_size: int):
+    """
+    Загружает файл и печатает отчет по ошибочным строкам
+    """
+    db: Session = SessionLocal()
+
+    try:
+        print(f"Загружаем {path} ({fmt.value})...")
+        with path.open(encoding="utf-8-sig", newline="") as lines:
+            report = import_units(db, IMPORT_TARGETS[kind], lines, fmt, batch_size)
+    except Exception as e:
+        db.rollback()
+        print(f"✗ Ошибка при загрузке: {e}")
+        raise
+    finally:
+        db.close()
+
+    for error in report.errors:
+        print(f"⚠ Строка {error.line}: {'; '.join(error.errors)}")
+
+    print("=" * 60)
+    print(f"Всего строк: {report.total}")
+    print(f"Загружено: {report.imported}")
+    print(f"С ошибками: {report.failed}")
+    if report.failed > len(report.errors):
+        print(f"(показаны первые {len(report.errors)} ошибок)")
+    print("=" * 60)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("kind", choices=sorted(IMPORT_TARGETS))
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=[fmt.value for fmt in ImportFormat])
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    fmt = ImportFormat(args.format) if args.format else detect_format(args.path.name)
+    if fmt is None:
+        parser.error("не удалось определить формат по расширению, укажите --format")
+
+    report = bulk_import(args.kind, args.path, fmt, args.batch_size)
+    sys.exit(1 if report.failed else 0)
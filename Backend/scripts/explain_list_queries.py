@@ -0,0 +1,135 @@
+"""
+Скрипт выводит планы выполнения (EXPLAIN) основных списочных запросов
+каталога, чтобы сравнить их до и после применения миграции с индексами
+"""
+
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import BOOKING_SWEEP_BATCH_SIZE
+from app.cruds.apartment import _apply_apartment_filters
+from app.cruds.building import _apply_building_filters
+from app.cruds.order import OPEN_ORDER_STATUSES
+from app.cruds.pagination import apply_keyset_sorting
+from app.cruds.review import _apply_review_filters
+from app.database import SessionLocal
+from app.models import (
+    Apartment,
+    Building,
+    Favorites,
+    Image,
+    ObjectType,
+    Order,
+    Promotion,
+    PropertyStatus,
+    ResidentialComplex,
+    Review,
+    User,
+)
+
+
+def _first_id(db: Session, model) -> int:
+    return db.query(func.min(model.id)).scalar() or 1
+
+
+def build_queries(db: Session):
+    """
+    Собирает запросы теми же функциями фильтрации, что и эндпоинты
+    """
+    complex_id = _first_id(db, ResidentialComplex)
+    building_id = _first_id(db, Building)
+    apartment_id = _first_id(db, Apartment)
+    user_id = _first_id(db, User)
+
+    apartments = _apply_apartment_filters(
+        db.query(Apartment),
+        building_id=building_id,
+        status=PropertyStatus.free,
+        min_total_price=0,
+    )
+    buildings = _apply_building_filters(db.query(Building), complex_id=complex_id)
+    reviews = _apply_review_filters(
+        db.query(Review), residential_complex_id=complex_id
+    )
+
+    return {
+        "apartments: building + free + price": apply_keyset_sorting(
+            apartments, Apartment, sort_by="total_price", order="asc"
+        ),
+        "buildings: complex": apply_keyset_sorting(
+            buildings, Building, sort_by="block", order="asc"
+        ),
+        "images: object": db.query(Image).filter(
+            Image.object_id == apartment_id,
+            Image.object_type == ObjectType.apartment,
+        ),
+        "favorites: user by date": db.query(Favorites)
+        .filter(Favorites.user_id == user_id)
+        .order_by(Favorites.created_at.desc()),
+        "orders: user": apply_keyset_sorting(
+            db.query(Order).filter(Order.user_id == user_id),
+            Order,
+            sort_by="status",
+            order="asc",
+        ),
+        "orders: expired bookings": db.query(Order.id)
+        .filter(
+            Order.status.in_(OPEN_ORDER_STATUSES),
+            Order.booking_expiration_date < date.today(),
+        )
+        .order_by(Order.id)
+        .limit(BOOKING_SWEEP_BATCH_SIZE),
+        "reviews: complex": apply_keyset_sorting(
+            reviews, Review, sort_by="created_at", order="desc"
+        ),
+        "promotions: complex + type": db.query(Promotion).filter(
+            Promotion.residential_complex_id == complex_id,
+            Promotion.is_active.is_(True),
+        ),
+    }
+
+
+def explain_list_queries(analyze: bool = False):
+    """
+    Печатает план каждого запроса
+    """
+    db: Session = SessionLocal()
+    dialect = db.get_bind().dialect
+    options = "ANALYZE, BUFFERS" if analyze else "COSTS"
+
+    try:
+        for name, query in build_queries(db).items():
+            sql = query.statement.compile(
+                dialect=dialect, compile_kwargs={"literal_binds": True}
+            )
+            plan = db.connection().exec_driver_sql(f"EXPLAIN ({options}) {sql}")
+
+            print("=" * 60)
+            print(name)
+            print("=" * 60)
+            for (line,) in plan:
+                print(line)
+            print()
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--analyze",
+        action="store_true",
+        help="выполнить запросы (EXPLAIN ANALYZE) и показать реальное время",
+    )
+    args = parser.parse_args()
+
+    explain_list_queries(analyze=args.analyze)
@@ -0,0 +1,38 @@
+"""
+Скрипт пересчитывает агрегаты жилых комплексов (таблица
+residential_complex_stats): диапазоны цен и площадей, количество объектов
+по статусам и типам квартир, средний рейтинг и число отзывов
+"""
+
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию в путь для импорта модулей
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.services.complex_stats import rebuild_all_complex_stats
+
+
+def rebuild_complex_stats():
+    """
+    Пересчитывает агрегаты всех комплексов пачками
+    """
+    db: Session = SessionLocal()
+
+    try:
+        print("Пересчитываем агрегаты жилых комплексов...")
+        processed = rebuild_all_complex_stats(db)
+        print(f"Готово! Обработано комплексов: {processed}")
+    except Exception as e:
+        db.rollback()
+        print(f"✗ Ошибка при пересчете: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_complex_stats()
@@ -0,0 +1,61 @@
+"""Test settings, applied before the app creates its engines.
+
+The tests run on throwaway SQLite files: a primary and a separate replica,
+so read routing can tell them apart. Set TEST_DATABASE_URL to a psycopg2 URL
+of an empty Postgres database to run the primary on Postgres instead; its
+tables are created and dropped by the tests.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+
+_tmp = tempfile.mkdtemp(prefix="baspana-tests-")
+
+import app.config as config  # noqa: E402
+
+config.DATABASE_URL = os.getenv("TEST_DATABASE_URL", f"sqlite:///{_tmp}/primary.db")
+config.ASYNC_DATABASE_URL = (
+    config.DATABASE_URL.replace("postgresql+psycopg2", "postgresql+asyncpg")
+    if config.DATABASE_URL.startswith("postgresql")
+    else f"sqlite+aiosqlite:///{_tmp}/primary.db"
+)
+config.REPLICA_DATABASE_URL = f"sqlite:///{_tmp}/replica.db"
+config.ASYNC_REPLICA_DATABASE_URL = f"sqlite+aiosqlite:///{_tmp}/replica.db"
+
+from app import models  # noqa: E402,F401
+from app.cache import app_cache  # noqa: E402
+from app.database import Base, SessionLocal, engine, replica_engine  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def tables():
+    for bind in (engine, replica_engine):
+        Base.metadata.create_all(bind)
+    yield
+    for bind in (engine, replica_engine):
+        Base.metadata.drop_all(bind)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    app_cache.clear()
+    yield
+    app_cache.clear()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,92 @@
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import count
+
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Apartment,
+    ApartmentType,
+    Building,
+    BuildingStatus,
+    City,
+    Direction,
+    FinishingType,
+    PropertyStatus,
+    ResidentialComplex,
+    Role,
+    User,
+    UserWallet,
+)
+
+_numbers = count(1)
+
+
+def create_apartment(db: Session, total_price: Decimal = Decimal(40000)) -> Apartment:
+    number = next(_numbers)
+    complex_ = ResidentialComplex(
+        name=f"Complex {number}", city=City.almaty, address="Abay 1", latitude=43.2, longitude=76.9
+    )
+    db.add(complex_)
+    db.flush()
+    building = Building(
+        residential_complex_id=complex_.id,
+        block=1,
+        floor_count=10,
+        apartments_count=1,
+        commercials_count=0,
+        parking_count=0,
+        gross_area=1000,
+        elevators_count=1,
+        status=BuildingStatus.completed,
+        construction_start=date(2020, 1, 1),
+        construction_end=date(2022, 1, 1),
+    )
+    db.add(building)
+    db.flush()
+    apartment = Apartment(
+        building_id=building.id,
+        number=number,
+        floor=1,
+        apartment_area=Decimal(40),
+        apartment_type=ApartmentType.studio,
+        has_balcony=True,
+        bathroom_count=1,
+        kitchen_area=Decimal(10),
+        ceiling_height=Decimal("2.7"),
+        finishing_type=FinishingType.white_box,
+        price_per_sqr=total_price / 40,
+        total_price=total_price,
+        status=PropertyStatus.free,
+        orientation=Direction.north,
+        isCorner=False,
+    )
+    db.add(apartment)
+    db.commit()
+    return apartment
+
+
+def create_wallet(db: Session, balance: Decimal) -> UserWallet:
+    number = next(_numbers)
+    user = User(
+        email=f"user{number}@example.com",
+        role=Role.consumer,
+        first_name="Test",
+        last_name="User",
+        phone_number=f"+7700000{number:04d}",
+        password="x",
+    )
+    db.add(user)
+    db.flush()
+    now = datetime.now()
+    wallet = UserWallet(
+        user_id=user.id,
+        balance=balance,
+        loyalty_points=0,
+        isActive=True,
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(wallet)
+    db.commit()
+    return wallet
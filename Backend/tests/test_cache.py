@@ -0,0 +1,143 @@
+import asyncio
+import fnmatch
+import threading
+import time
+
+import pytest
+
+from app.cache import MISS, Cache, MemoryBackend, RedisBackend
+
+
+class FakeRedis:
+    """The part of redis.Redis the backend uses; keys never expire."""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.ttls[key] = ex
+
+    def sadd(self, key, member):
+        self.values.setdefault(key, set()).add(member)
+
+    def expire(self, key, seconds):
+        self.ttls[key] = seconds
+
+    def smembers(self, key):
+        return set(self.values.get(key, ()))
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.ttls.pop(key, None)
+
+    def scan_iter(self, pattern):
+        return [key for key in self.values if fnmatch.fnmatch(key, pattern)]
+
+    def pipeline(self):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+        return lambda *args, **kwargs: self._calls.append((method, args, kwargs))
+
+    def execute(self):
+        for method, args, kwargs in self._calls:
+            method(*args, **kwargs)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    if request.param == "memory":
+        return Cache(MemoryBackend())
+    return Cache(RedisBackend(FakeRedis()))
+
+
+def test_concurrent_misses_load_once(cache):
+    namespace = cache.namespace("complex")
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"name": "Alpha"}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(namespace.get_or_load(1, loader)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"name": "Alpha"}] * 8
+    assert namespace.get(1) == {"name": "Alpha"}
+
+
+def test_concurrent_async_misses_load_once(cache):
+    namespace = cache.namespace("complex")
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return {"name": "Alpha"}
+
+    async def main():
+        return await asyncio.gather(
+            *(namespace.get_or_load_async(1, loader) for _ in range(8))
+        )
+
+    assert asyncio.run(main()) == [{"name": "Alpha"}] * 8
+    assert len(calls) == 1
+
+
+def test_invalidating_a_tag_drops_its_entries_in_every_namespace(cache):
+    complexes = cache.namespace("complex")
+    tiles = cache.namespace("tile", ttl_seconds=600)
+    complexes.set(1, "complex 1", tags=["complex:1"])
+    tiles.set("0/0/0", "tile", tags=["complex:1", "complex:2"])
+    complexes.set(2, "complex 2", tags=["complex:2"])
+
+    cache.invalidate_tags("complex:1")
+
+    assert complexes.get(1) is MISS
+    assert tiles.get("0/0/0") is MISS
+    assert complexes.get(2) == "complex 2"
+
+
+def test_value_loaded_across_an_invalidation_is_not_stored(cache):
+    namespace = cache.namespace("complex")
+
+    def loader():
+        cache.invalidate_tags("complex:1")
+        return "read before the change"
+
+    assert namespace.get_or_load(1, loader, tags=["complex:1"]) == "read before the change"
+    assert namespace.get(1) is MISS
+
+
+def test_redis_tag_outlives_every_namespace_sharing_it():
+    client = FakeRedis()
+    cache = Cache(RedisBackend(client))
+    tiles = cache.namespace("tile", ttl_seconds=600)
+    complexes = cache.namespace("complex", ttl_seconds=60)
+
+    tiles.set("0/0/0", "tile", tags=["complex:1"])
+    complexes.set(1, "complex 1", tags=["complex:1"])
+
+    assert client.ttls["baspana:cache:tag:complex:1"] == 600
@@ -0,0 +1,56 @@
+import threading
+import time
+
+from fastapi import HTTPException
+
+from app.database import SessionLocal
+from app.models import Apartment, ObjectType, PropertyStatus
+from app.services.order_service import OrderService
+
+from factories import create_apartment
+
+
+def test_concurrent_reservations_of_a_unit_let_one_through(db):
+    apartment_id = create_apartment(db).id
+    outcomes = []
+    start = threading.Barrier(8)
+
+    def reserve():
+        session = SessionLocal()
+        try:
+            start.wait()
+            OrderService._reserve_property(
+                session, ObjectType.apartment, apartment_id, PropertyStatus.booked
+            )
+            # Hold the row for a while, like the rest of a checkout would
+            time.sleep(0.1)
+            session.commit()
+            outcomes.append("reserved")
+        except HTTPException as error:
+            session.rollback()
+            outcomes.append(error.status_code)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=reserve) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(outcomes, key=str) == [405] * 7 + ["reserved"]
+    db.expire_all()
+    assert db.get(Apartment, apartment_id).status == PropertyStatus.booked
+
+
+def test_reserving_a_taken_unit_is_rejected(db):
+    apartment_id = create_apartment(db).id
+    OrderService._reserve_property(db, ObjectType.apartment, apartment_id, PropertyStatus.sold)
+    db.commit()
+
+    try:
+        OrderService._reserve_property(db, ObjectType.apartment, apartment_id, PropertyStatus.booked)
+    except HTTPException as error:
+        assert error.status_code == 405
+    else:
+        raise AssertionError("a sold unit was reserved")
@@ -0,0 +1,62 @@
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy.orm import Session
+
+from app.database import engine, get_read_db
+from app.read_routing import ReadYourWritesMiddleware
+
+
+def _bearer(user_id: int) -> dict:
+    token = jwt.encode({"sub": str(user_id)}, "test-secret", algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.post("/write")
+    def write():
+        return {}
+
+    @app.post("/fail")
+    def fail():
+        return JSONResponse(status_code=400, content={})
+
+    @app.get("/read")
+    def read(db: Session = Depends(get_read_db)):
+        return {"primary": db.get_bind() is engine}
+
+    return TestClient(app)
+
+
+def test_reads_go_to_the_replica_by_default():
+    client = _client()
+    assert client.get("/read", headers=_bearer(1)).json() == {"primary": False}
+
+
+def test_writer_reads_from_the_primary_next():
+    client = _client()
+    client.post("/write", headers=_bearer(1))
+    # A cross-origin client does not send the cookie back
+    client.cookies.clear()
+
+    assert client.get("/read", headers=_bearer(1)).json() == {"primary": True}
+    assert client.get("/read", headers=_bearer(2)).json() == {"primary": False}
+    assert client.get("/read").json() == {"primary": False}
+
+
+def test_failed_write_keeps_reads_on_the_replica():
+    client = _client()
+    client.post("/fail", headers=_bearer(1))
+
+    assert client.get("/read", headers=_bearer(1)).json() == {"primary": False}
+
+
+def test_anonymous_writer_is_pinned_by_the_cookie():
+    client = _client()
+    client.post("/write")
+
+    assert client.get("/read").json() == {"primary": True}
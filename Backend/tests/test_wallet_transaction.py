@@ -0,0 +1,62 @@
+import threading
+from decimal import Decimal
+
+from app.cruds.wallet_transaction import _post
+from app.database import SessionLocal
+from app.models import TransactionType, UserWallet, WalletTransaction
+
+from factories import create_wallet
+
+
+def test_concurrent_withdrawals_never_overdraw(db):
+    wallet_id = create_wallet(db, balance=Decimal(100)).id
+    outcomes = []
+    start = threading.Barrier(16)
+
+    def withdraw():
+        session = SessionLocal()
+        try:
+            start.wait()
+            _post(session, wallet_id, TransactionType.withdrawal, Decimal(10))
+            session.commit()
+            outcomes.append("posted")
+        except ValueError:
+            session.rollback()
+            outcomes.append("rejected")
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=withdraw) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes.count("posted") == 10
+    assert outcomes.count("rejected") == 6
+
+    db.expire_all()
+    assert db.get(UserWallet, wallet_id).balance == 0
+    transactions = (
+        db.query(WalletTransaction)
+        .filter(WalletTransaction.wallet_id == wallet_id)
+        .order_by(WalletTransaction.id)
+        .all()
+    )
+    # Each transaction starts from the balance the previous one ended with
+    assert [t.balance_before for t in transactions] == [
+        Decimal(100 - 10 * i) for i in range(10)
+    ]
+    assert all(t.balance_after == t.balance_before - 10 for t in transactions)
+
+
+def test_non_positive_amount_is_rejected(db):
+    wallet_id = create_wallet(db, balance=Decimal(100)).id
+
+    for amount in (Decimal(0), Decimal(-5)):
+        try:
+            _post(db, wallet_id, TransactionType.deposit, amount)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"posted {amount}")